@@ -7,6 +7,17 @@ from qwen_vl.config import get_config, load_config
 from qwen_vl.utils.logger import get_logger, setup_logging
 
 
+def warm_up(config, logger) -> None:
+    """Load the model and start batch workers ahead of the first job."""
+    from qwen_vl.api.batch import get_batch_processor
+    from qwen_vl.core.model_loader import load_model
+
+    logger.info("Warming up model and batch workers")
+    load_model(config)
+    get_batch_processor().warm_up()
+    logger.info("Warm-up complete")
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Qwen3-VL Production Service")
@@ -20,6 +31,11 @@ def main():
         action="store_true",
         help="Check configuration and exit",
     )
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="Load the model and start batch workers at startup",
+    )
 
     args = parser.parse_args()
 
@@ -61,6 +77,10 @@ def main():
     logger.info("Starting Qwen3-VL service")
     logger.info(f"Model: {config.model.model_id}")
 
+    # Opt-in until main() launches a server; the API warms up in its lifespan
+    if args.warmup:
+        warm_up(config, logger)
+
     # TODO: Launch Gradio UI (Phase 1)
     print("Qwen3-VL service - Phase 0 complete")
     print("Run with --check-hardware or --check-config to verify setup")
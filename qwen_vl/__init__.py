@@ -1,18 +1,25 @@
 """Qwen3-VL Production Deployment Package."""
 
+import importlib
+
 __version__ = "0.1.0"
 
+_LAZY = {
+    "InferenceEngine": (".core.inference_engine", "InferenceEngine"),
+    "load_model": (".core.model_loader", "load_model"),
+    "Config": (".config", "Config"),
+}
+
+
 def __getattr__(name):
     """Lazy import for heavy modules."""
-    if name == "InferenceEngine":
-        from .core.inference_engine import InferenceEngine
-        return InferenceEngine
-    if name == "load_model":
-        from .core.model_loader import load_model
-        return load_model
-    if name == "Config":
-        from .config import Config
-        return Config
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    spec = _LAZY.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(spec[0], __name__)
+    value = getattr(module, spec[1])
+    globals()[name] = value
+    return value
 
 __all__ = ["InferenceEngine", "load_model", "Config", "__version__"]
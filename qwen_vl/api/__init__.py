@@ -1,30 +1,52 @@
 """API module for document processing service."""
 
+import importlib
+
 # Lazy imports to avoid heavy dependencies at import time
+_LAZY = {
+    # Endpoints
+    "app": (".endpoints", "app"),
+    "create_app": (".endpoints", "create_app"),
+    # Batch processing
+    "BatchProcessor": (".batch", "BatchProcessor"),
+    "get_batch_processor": (".batch", "get_batch_processor"),
+    "BatchJob": (".batch", "BatchJob"),
+    "JobStatus": (".batch", "JobStatus"),
+    "RequestBatcher": (".batcher", "RequestBatcher"),
+    # Webhooks
+    "WebhookManager": (".webhooks", "WebhookManager"),
+    "get_webhook_manager": (".webhooks", "get_webhook_manager"),
+    "EventType": (".webhooks", "EventType"),
+    # Storage
+    "StorageBackend": (".storage", "StorageBackend"),
+    "LocalStorage": (".storage", "LocalStorage"),
+    "S3Storage": (".storage", "S3Storage"),
+    "GCSStorage": (".storage", "GCSStorage"),
+    "create_storage": (".storage", "create_storage"),
+    # Export
+    "ExportManager": (".export", "ExportManager"),
+    "get_export_manager": (".export", "get_export_manager"),
+    "export_to_json": (".export", "export_to_json"),
+    "export_to_csv": (".export", "export_to_csv"),
+    "iter_csv": (".export", "iter_csv"),
+    "export_to_excel": (".export", "export_to_excel"),
+    "export_to_pdf": (".export", "export_to_pdf"),
+    # Schemas
+    "schema_to_pydantic": (".schemas", "schema_to_pydantic"),
+    "generate_extraction_models": (".schemas", "generate_extraction_models"),
+}
+
+
 def __getattr__(name):
-    if name == "app":
-        from .endpoints import app
-        return app
-    elif name == "create_app":
-        from .endpoints import create_app
-        return create_app
-    elif name in ("BatchProcessor", "get_batch_processor", "BatchJob", "JobStatus"):
-        from .batch import BatchProcessor, get_batch_processor, BatchJob, JobStatus
-        return locals()[name]
-    elif name in ("WebhookManager", "get_webhook_manager", "EventType"):
-        from .webhooks import WebhookManager, get_webhook_manager, EventType
-        return locals()[name]
-    elif name in ("StorageBackend", "LocalStorage", "S3Storage", "GCSStorage", "create_storage"):
-        from .storage import StorageBackend, LocalStorage, S3Storage, GCSStorage, create_storage
-        return locals()[name]
-    elif name in ("ExportManager", "get_export_manager", "export_to_json", "export_to_csv", "export_to_excel", "export_to_pdf"):
-        from .export import ExportManager, get_export_manager, export_to_json, export_to_csv, export_to_excel, export_to_pdf
-        return locals()[name]
-    elif name in ("schema_to_pydantic", "generate_extraction_models"):
-        from .schemas import schema_to_pydantic, generate_extraction_models
-        return locals()[name]
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    spec = _LAZY.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+    module = importlib.import_module(spec[0], __name__)
+    value = getattr(module, spec[1])
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
 
 __all__ = [
     # Endpoints
@@ -35,6 +57,7 @@ __all__ = [
     "get_batch_processor",
     "BatchJob",
     "JobStatus",
+    "RequestBatcher",
     # Webhooks
     "WebhookManager",
     "get_webhook_manager",
@@ -50,6 +73,7 @@ __all__ = [
     "get_export_manager",
     "export_to_json",
     "export_to_csv",
+    "iter_csv",
     "export_to_excel",
     "export_to_pdf",
     # Schemas
@@ -1,6 +1,12 @@
 """Batch processing system for document processing."""
 
 import asyncio
+import fnmatch
+import inspect
+import os
+import re
+import threading
+import time
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Callable
@@ -9,8 +15,6 @@ from enum import Enum
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
-from PIL import Image
-
 
 class JobStatus(str, Enum):
     """Batch job status."""
@@ -43,6 +47,32 @@ class BatchJob:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     options: Dict[str, Any] = field(default_factory=dict)
+    processed: int = field(default=0, init=False)
+    failed: int = field(default=0, init=False)
+    _items_by_id: Dict[str, BatchItem] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _results_cache: Optional[List[Dict[str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _results_cache_key: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._items_by_id = {item.item_id: item for item in self.items}
+
+        # Seed counters from items that are already finished; afterwards
+        # BatchProcessor keeps them up to date as items complete
+        for item in self.items:
+            if item.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                self.processed += 1
+            if item.status == JobStatus.FAILED:
+                self.failed += 1
+
+    def get_item(self, item_id: str) -> Optional[BatchItem]:
+        """Get an item by ID."""
+        return self._items_by_id.get(item_id)
 
     @property
     def total_items(self) -> int:
@@ -50,11 +80,11 @@ class BatchJob:
 
     @property
     def processed_items(self) -> int:
-        return sum(1 for item in self.items if item.status in [JobStatus.COMPLETED, JobStatus.FAILED])
+        return self.processed
 
     @property
     def failed_items(self) -> int:
-        return sum(1 for item in self.items if item.status == JobStatus.FAILED)
+        return self.failed
 
     @property
     def progress(self) -> float:
@@ -66,17 +96,28 @@ class BatchJob:
 class BatchProcessor:
     """Process batch document processing jobs."""
 
-    def __init__(self, max_workers: int = 4):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        batch_size: int = 8,
+        callback_timeout: float = 5.0,
+    ):
         """
         Initialize batch processor.
 
         Args:
             max_workers: Maximum concurrent workers
+            batch_size: Maximum items handed to a handler in one call
+            callback_timeout: Seconds each completion callback may run
         """
         self.max_workers = max_workers
+        self.batch_size = max(1, batch_size)
+        self.callback_timeout = callback_timeout
         self._jobs: Dict[str, BatchJob] = {}
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._callbacks: List[Callable] = []
+        self._tls = threading.local()
+        self._lock = threading.Lock()
 
     def create_job(
         self,
@@ -95,11 +136,11 @@ class BatchProcessor:
         Returns:
             Created batch job
         """
-        job_id = str(uuid.uuid4())
+        job_id = uuid.uuid4().hex
 
         items = [
             BatchItem(
-                item_id=str(uuid.uuid4()),
+                item_id=uuid.uuid4().hex,
                 file_path=path,
             )
             for path in file_paths
@@ -140,9 +181,14 @@ class BatchProcessor:
 
         patterns = patterns or ["*.png", "*.jpg", "*.jpeg", "*.pdf", "*.tiff"]
 
-        file_paths = []
-        for pattern in patterns:
-            file_paths.extend([str(p) for p in folder.glob(pattern)])
+        # Match every pattern in a single directory scan
+        regex = re.compile("|".join(fnmatch.translate(p) for p in patterns))
+        with os.scandir(folder) as entries:
+            file_paths = [
+                entry.path
+                for entry in entries
+                if entry.is_file() and regex.match(entry.name)
+            ]
 
         if not file_paths:
             raise ValueError(f"No files found matching patterns: {patterns}")
@@ -170,22 +216,30 @@ class BatchProcessor:
 
         job.status = JobStatus.PROCESSING
         job.started_at = datetime.utcnow()
+        # Every item is (re)processed below
+        job.processed = 0
+        job.failed = 0
+
+        handler = await self._async_handler(handler_factory)
+
+        if handler is not None:
+            # Async handlers run on the event loop; no threads are needed
+            semaphore = asyncio.Semaphore(self.max_workers)
+            await asyncio.gather(*(
+                self._process_item_async(job, item, handler, semaphore)
+                for item in job.items
+            ))
+        else:
+            # Feed items to workers that process them in micro-batches
+            queue: asyncio.Queue = asyncio.Queue()
+            for item in job.items:
+                queue.put_nowait(item)
 
-        # Process items in parallel
-        loop = asyncio.get_event_loop()
-        tasks = []
-
-        for item in job.items:
-            task = loop.run_in_executor(
-                self._executor,
-                self._process_item,
-                item,
-                handler_factory,
-                job.options,
-            )
-            tasks.append(task)
-
-        await asyncio.gather(*tasks)
+            workers = [
+                self._batch_worker(queue, job, handler_factory)
+                for _ in range(min(self.max_workers, len(job.items)))
+            ]
+            await asyncio.gather(*workers)
 
         # Update job status
         if all(item.status == JobStatus.COMPLETED for item in job.items):
@@ -197,40 +251,208 @@ class BatchProcessor:
 
         job.completed_at = datetime.utcnow()
 
-        # Trigger callbacks
-        for callback in self._callbacks:
-            try:
-                callback(job)
-            except Exception:
-                pass
+        await self._run_callbacks(job)
 
         return job
 
+    async def _async_handler(self, handler_factory: Callable) -> Optional[Any]:
+        """Get the handler to await on the event loop, or None if it is sync."""
+        if inspect.isclass(handler_factory):
+            # Check the class itself; building a sync handler may load a model
+            if not inspect.iscoroutinefunction(getattr(handler_factory, "process", None)):
+                return None
+            return self._get_handler(handler_factory)
+
+        # Build it off the loop, in a worker thread that keeps it for reuse
+        handler = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), self._get_handler, handler_factory
+        )
+        return handler if inspect.iscoroutinefunction(handler.process) else None
+
+    async def _run_callbacks(self, job: BatchJob) -> None:
+        """Run all completion callbacks concurrently, ignoring failures."""
+        if not self._callbacks:
+            return
+
+        loop = asyncio.get_event_loop()
+
+        async def run(callback: Callable) -> None:
+            if inspect.iscoroutinefunction(callback):
+                await callback(job)
+            else:
+                await loop.run_in_executor(self._get_executor(), callback, job)
+
+        await asyncio.gather(
+            *(
+                asyncio.wait_for(run(callback), timeout=self.callback_timeout)
+                for callback in self._callbacks
+            ),
+            return_exceptions=True,
+        )
+
+    async def _batch_worker(
+        self,
+        queue: asyncio.Queue,
+        job: BatchJob,
+        handler_factory: Callable,
+    ) -> None:
+        """Drain the queue in chunks of up to batch_size items."""
+        loop = asyncio.get_event_loop()
+        executor = self._get_executor()
+
+        while not queue.empty():
+            items = []
+            while len(items) < self.batch_size and not queue.empty():
+                items.append(queue.get_nowait())
+
+            if len(items) == 1:
+                await loop.run_in_executor(
+                    executor,
+                    self._process_item,
+                    job,
+                    items[0],
+                    handler_factory,
+                )
+            else:
+                await loop.run_in_executor(
+                    executor,
+                    self._process_batch,
+                    job,
+                    items,
+                    handler_factory,
+                )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def warm_up(self, timeout: float = 10.0) -> None:
+        """
+        Start every worker thread ahead of the first job.
+
+        Args:
+            timeout: Seconds to wait for all workers to start
+        """
+        executor = self._get_executor()
+        # Each task blocks until all have started, forcing one thread per task
+        barrier = threading.Barrier(self.max_workers, timeout=timeout)
+        futures = [executor.submit(barrier.wait) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def _get_handler(self, handler_factory: Callable) -> Any:
+        """Get the calling worker thread's handler, creating it once."""
+        handlers = getattr(self._tls, "handlers", None)
+        if handlers is None:
+            handlers = self._tls.handlers = {}
+
+        handler = handlers.get(handler_factory)
+        if handler is None:
+            handler = handlers[handler_factory] = handler_factory()
+        return handler
+
+    def _finish_items(self, job: BatchJob, items: List[BatchItem]) -> None:
+        """Record finished items in the job's counters."""
+        failed = sum(1 for item in items if item.status == JobStatus.FAILED)
+        with self._lock:
+            job.processed += len(items)
+            job.failed += failed
+
+    def _process_batch(
+        self,
+        job: BatchJob,
+        items: List[BatchItem],
+        handler_factory: Callable,
+    ) -> None:
+        """Process several batch items with a single handler call."""
+        start_ns = time.monotonic_ns()
+        loaded_items = []
+        images = []
+
+        for item in items:
+            item.status = JobStatus.PROCESSING
+            try:
+                images.append(_open_image(item.file_path, job.options.get("max_side")))
+                loaded_items.append(item)
+            except Exception as e:
+                item.error = str(e)
+                item.status = JobStatus.FAILED
+
+        try:
+            if images:
+                handler = self._get_handler(handler_factory)
+                results = list(handler.process_batch(images, **_handler_options(job.options)))
+
+                for item, result in zip(loaded_items, results):
+                    item.result = _result_to_dict(result)
+                    item.status = JobStatus.COMPLETED
+
+                # Items left over when the handler returns too few results
+                for item in loaded_items[len(results):]:
+                    item.error = f"Handler returned {len(results)} results for {len(images)} images"
+                    item.status = JobStatus.FAILED
+
+        except Exception as e:
+            for item in loaded_items:
+                item.error = str(e)
+                item.status = JobStatus.FAILED
+
+        finally:
+            elapsed_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+            for item in items:
+                item.processing_time_ms = elapsed_ms
+            self._finish_items(job, items)
+
+    async def _process_item_async(
+        self,
+        job: BatchJob,
+        item: BatchItem,
+        handler: Any,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Process a single batch item with an async handler."""
+        async with semaphore:
+            start_ns = time.monotonic_ns()
+            item.status = JobStatus.PROCESSING
+
+            try:
+                image = await asyncio.to_thread(
+                    _open_image, item.file_path, job.options.get("max_side")
+                )
+                result = await handler.process(image, **_handler_options(job.options))
+
+                item.result = _result_to_dict(result)
+                item.status = JobStatus.COMPLETED
+
+            except Exception as e:
+                item.error = str(e)
+                item.status = JobStatus.FAILED
+
+            finally:
+                item.processing_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+                self._finish_items(job, [item])
+
     def _process_item(
         self,
+        job: BatchJob,
         item: BatchItem,
         handler_factory: Callable,
-        options: Dict[str, Any],
     ) -> None:
         """Process a single batch item."""
-        import time
-
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         item.status = JobStatus.PROCESSING
 
         try:
             # Load image
-            image = Image.open(item.file_path).convert("RGB")
+            image = _open_image(item.file_path, job.options.get("max_side"))
 
             # Get handler and process
-            handler = handler_factory()
-            result = handler.process(image, **options)
-
-            item.result = {
-                "text": result.text,
-                "data": result.data,
-                "metadata": result.metadata,
-            }
+            handler = self._get_handler(handler_factory)
+            result = handler.process(image, **_handler_options(job.options))
+
+            item.result = _result_to_dict(result)
             item.status = JobStatus.COMPLETED
 
         except Exception as e:
@@ -238,7 +460,8 @@ class BatchProcessor:
             item.status = JobStatus.FAILED
 
         finally:
-            item.processing_time_ms = int((time.time() - start_time) * 1000)
+            item.processing_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+            self._finish_items(job, [item])
 
     def get_job(self, job_id: str) -> Optional[BatchJob]:
         """Get a job by ID."""
@@ -282,8 +505,8 @@ class BatchProcessor:
 
         return False
 
-    def add_callback(self, callback: Callable[[BatchJob], None]) -> None:
-        """Add a completion callback."""
+    def add_callback(self, callback: Callable[[BatchJob], Any]) -> None:
+        """Add a completion callback (sync function or coroutine function)."""
         self._callbacks.append(callback)
 
     def get_job_results(self, job_id: str) -> List[Dict[str, Any]]:
@@ -300,17 +523,66 @@ class BatchProcessor:
         if not job:
             return []
 
-        return [
-            {
-                "item_id": item.item_id,
-                "file_path": item.file_path,
-                "status": item.status.value,
-                "result": item.result,
-                "error": item.error,
-                "processing_time_ms": item.processing_time_ms,
-            }
-            for item in job.items
-        ]
+        # Results only change when an item finishes or the job changes state
+        cache_key = (job.processed, job.status)
+        if job._results_cache is None or job._results_cache_key != cache_key:
+            job._results_cache = [
+                {
+                    "item_id": item.item_id,
+                    "file_path": item.file_path,
+                    "status": item.status.value,
+                    "result": item.result,
+                    "error": item.error,
+                    "processing_time_ms": item.processing_time_ms,
+                }
+                for item in job.items
+            ]
+            job._results_cache_key = cache_key
+
+        # Copies, so callers editing the results cannot change later responses
+        return [dict(row) for row in job._results_cache]
+
+
+# Job options consumed while loading images rather than by handlers
+_LOADER_OPTIONS = frozenset({"max_side"})
+
+
+def _open_image(path: str, max_side: Optional[int] = None) -> Any:
+    """
+    Open an image as RGB.
+
+    Args:
+        path: Image file path
+        max_side: If set, lets the JPEG decoder downscale while decoding
+            so neither side is decoded much larger than this
+
+    Returns:
+        PIL Image in RGB mode
+    """
+    # Deferred so importing job types does not load Pillow
+    from PIL import Image
+
+    image = Image.open(path)
+    if max_side:
+        # Only JPEG supports draft mode; other formats ignore it
+        image.draft("RGB", (max_side, max_side))
+    return image.convert("RGB")
+
+
+def _handler_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip loader-only options before passing options to a handler."""
+    if _LOADER_OPTIONS.isdisjoint(options):
+        return options
+    return {k: v for k, v in options.items() if k not in _LOADER_OPTIONS}
+
+
+def _result_to_dict(result: Any) -> Dict[str, Any]:
+    """Convert a TaskResult into the stored item result."""
+    return {
+        "text": result.text,
+        "data": result.data,
+        "metadata": result.metadata,
+    }
 
 
 # Global processor instance
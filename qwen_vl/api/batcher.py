@@ -0,0 +1,190 @@
+"""Micro-batching of concurrent API requests."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..tasks.base import TaskResult, TaskType
+
+# Task type, image digest and options of a cached result
+_CacheKey = Tuple[TaskType, str, str]
+
+
+@dataclass
+class _PendingGroup:
+    """Requests waiting to be processed together."""
+    task_type: TaskType
+    kwargs: Dict[str, Any]
+    images: List[Any] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class RequestBatcher:
+    """Group concurrent requests for the same task into one handler call."""
+
+    def __init__(
+        self,
+        handler_getter: Callable[[TaskType], Any],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        result_cache_size: int = 1024,
+        result_ttl: float = 3600.0,
+    ):
+        """
+        Initialize request batcher.
+
+        Args:
+            handler_getter: Returns the task handler for a task type
+            max_batch_size: Maximum requests per handler call
+            max_wait_ms: How long the first request waits for others
+            result_cache_size: Results kept for repeated uploads (0 disables)
+            result_ttl: Seconds a cached result stays valid
+        """
+        self.handler_getter = handler_getter
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.result_cache_size = result_cache_size
+        self.result_ttl = result_ttl
+        self._pending: Dict[Tuple[TaskType, str], _PendingGroup] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Running batches; the loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+        # (task, image digest, options) -> (expiry, result), oldest first
+        self._results: "OrderedDict[_CacheKey, Tuple[float, TaskResult]]" = OrderedDict()
+
+    async def submit(self, task_type: TaskType, image: Any, **kwargs) -> TaskResult:
+        """
+        Process an image, batched with concurrent requests for the same task.
+
+        Only requests with identical task type and options share a batch.
+
+        Args:
+            task_type: Task to run
+            image: PIL Image
+            **kwargs: Task-specific options
+
+        Returns:
+            TaskResult for this image
+        """
+        loop = asyncio.get_running_loop()
+        key = (task_type, repr(sorted(kwargs.items())))
+
+        # Uploads tagged with a content digest can reuse an earlier result
+        digest = getattr(image, "info", {}).get("digest")
+        cache_key = (task_type, digest, key[1]) if digest and self.result_cache_size else None
+        if cache_key is not None:
+            cached = self._cached_result(cache_key)
+            if cached is not None:
+                return cached
+
+        group = self._pending.get(key)
+        if group is None:
+            group = self._pending[key] = _PendingGroup(task_type, kwargs)
+            group.timer = loop.call_later(self.max_wait_ms / 1000, self._flush, key)
+
+        future = loop.create_future()
+        group.images.append(image)
+        group.futures.append(future)
+
+        if len(group.images) >= self.max_batch_size:
+            group.timer.cancel()
+            self._flush(key)
+
+        result = await future
+        if cache_key is not None:
+            self._cache_result(cache_key, result)
+        return result
+
+    def _cached_result(self, key: _CacheKey) -> Optional[TaskResult]:
+        """Get an unexpired cached result, refreshing its recency."""
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return entry[1]
+
+    def _cache_result(self, key: _CacheKey, result: TaskResult) -> None:
+        """Store a result, evicting the least recently used beyond the limit."""
+        self._results[key] = (time.monotonic() + self.result_ttl, result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.result_cache_size:
+            self._results.popitem(last=False)
+
+    def _flush(self, key: Tuple[TaskType, str]) -> None:
+        """Dispatch a pending group."""
+        group = self._pending.pop(key, None)
+        if group is not None:
+            task = asyncio.ensure_future(self._run(group))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the inference thread, creating it on first use."""
+        # A single thread keeps one forward pass on the model at a time
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    async def _run(self, group: _PendingGroup) -> None:
+        """Process a group and resolve its futures."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        try:
+            handler = self.handler_getter(group.task_type)
+        except Exception as e:
+            for future in group.futures:
+                _set_exception(future, e)
+            return
+
+        try:
+            results = list(await loop.run_in_executor(
+                executor,
+                partial(handler.process_batch, group.images, **group.kwargs),
+            ))
+        except Exception as e:
+            if len(group.images) == 1:
+                _set_exception(group.futures[0], e)
+                return
+
+            # Retry one by one so a bad image does not fail its neighbours
+            for image, future in zip(group.images, group.futures):
+                try:
+                    result = await loop.run_in_executor(
+                        executor,
+                        partial(handler.process, image, **group.kwargs),
+                    )
+                except Exception as item_error:
+                    _set_exception(future, item_error)
+                else:
+                    _set_result(future, result)
+            return
+
+        for future, result in zip(group.futures, results):
+            _set_result(future, result)
+
+        # Callers left over when the handler returns too few results
+        if len(results) < len(group.images):
+            error = RuntimeError(
+                f"Handler returned {len(results)} results for {len(group.images)} images"
+            )
+            for future in group.futures[len(results):]:
+                _set_exception(future, error)
+
+
+def _set_result(future: asyncio.Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, error: Exception) -> None:
+    if not future.done():
+        future.set_exception(error)
@@ -1,10 +1,18 @@
 """Database integrations for storing extraction results."""
 
-import json
+import itertools
+import uuid
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
 from typing import Any, Dict, List, Optional
 
+from ..utils.serialization import dumps
+
+# JSONB parameters; escaping non-ASCII would only grow them
+_json_dumps = partial(dumps, ensure_ascii=False)
+
 
 class DatabaseBackend(ABC):
     """Abstract base class for database backends."""
@@ -30,6 +38,56 @@ class DatabaseBackend(ABC):
         """Save extraction result."""
         pass
 
+    def save_results_bulk(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Save several extraction results.
+
+        Backends that support set-oriented writes should override this;
+        the default saves rows one at a time.
+
+        Args:
+            rows: Dicts with document_id, task_type, result and
+                optional metadata keys
+
+        Returns:
+            Result IDs in the same order as rows
+        """
+        return [
+            self.save_result(
+                row["document_id"],
+                row["task_type"],
+                row["result"],
+                row.get("metadata"),
+            )
+            for row in rows
+        ]
+
+    def save_batch_job(self, job: Any) -> List[str]:
+        """
+        Save the completed items of a batch job in one bulk write.
+
+        Suitable for use as a BatchProcessor completion callback.
+
+        Args:
+            job: Finished BatchJob
+
+        Returns:
+            Result IDs of the saved items
+        """
+        rows = [
+            {
+                "document_id": item.file_path,
+                "task_type": job.task_type,
+                "result": item.result,
+                "metadata": {"job_id": job.job_id, "item_id": item.item_id},
+            }
+            for item in job.items
+            if item.result is not None
+        ]
+        if not rows:
+            return []
+        return self.save_results_bulk(rows)
+
     @abstractmethod
     def get_result(self, result_id: str) -> Optional[Dict[str, Any]]:
         """Get result by ID."""
@@ -47,9 +105,47 @@ class DatabaseBackend(ABC):
         pass
 
 
+_PG_COLUMNS = "result_id, document_id, task_type, result, metadata, created_at"
+
+
+def _pg_row_to_dict(row: tuple) -> Dict[str, Any]:
+    """Convert a row selected with _PG_COLUMNS into a result dict."""
+    return {
+        "result_id": row[0],
+        "document_id": row[1],
+        "task_type": row[2],
+        "result": row[3],
+        "metadata": row[4],
+        "created_at": row[5].isoformat() if row[5] else None,
+    }
+
+
+def _build_pg_queries() -> Dict[tuple, str]:
+    """Build query_results statements keyed by which filters are set."""
+    filters = ("task_type = %s", "created_at >= %s", "created_at <= %s")
+    queries = {}
+
+    for key in itertools.product((False, True), repeat=len(filters)):
+        clauses = [clause for clause, used in zip(filters, key) if used]
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        queries[key] = (
+            f"SELECT {_PG_COLUMNS} FROM extraction_results{where}"
+            " ORDER BY created_at DESC LIMIT %s"
+        )
+
+    return queries
+
+
+# Keyed by (task_type set, start_date set, end_date set)
+_PG_QUERIES = _build_pg_queries()
+
+
 class PostgreSQLBackend(DatabaseBackend):
     """PostgreSQL database backend."""
 
+    # (host, port, database) targets whose tables exist in this process
+    _tables_ready: set = set()
+
     def __init__(
         self,
         host: str = "localhost",
@@ -57,6 +153,7 @@ class PostgreSQLBackend(DatabaseBackend):
         database: str = "qwen_vl",
         user: str = "postgres",
         password: str = "",
+        max_connections: int = 10,
     ):
         """
         Initialize PostgreSQL backend.
@@ -67,19 +164,23 @@ class PostgreSQLBackend(DatabaseBackend):
             database: Database name
             user: Username
             password: Password
+            max_connections: Maximum pooled connections
         """
         self.host = host
         self.port = port
         self.database = database
         self.user = user
         self.password = password
-        self._conn = None
+        self.max_connections = max_connections
+        self._pool = None
 
     def connect(self) -> None:
         """Connect to PostgreSQL."""
         try:
-            import psycopg2
-            self._conn = psycopg2.connect(
+            from psycopg2.pool import ThreadedConnectionPool
+            self._pool = ThreadedConnectionPool(
+                1,
+                self.max_connections,
                 host=self.host,
                 port=self.port,
                 database=self.database,
@@ -94,17 +195,30 @@ class PostgreSQLBackend(DatabaseBackend):
 
     def disconnect(self) -> None:
         """Disconnect from PostgreSQL."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        if self._pool:
+            self._pool.closeall()
+            self._pool = None
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a connection from the pool."""
+        conn = self._pool.getconn()
+        try:
+            yield conn
+        finally:
+            self._pool.putconn(conn)
 
     def _ensure_tables(self) -> None:
         """Create tables if they don't exist."""
-        with self._conn.cursor() as cur:
+        target = (self.host, self.port, self.database)
+        if target in PostgreSQLBackend._tables_ready:
+            return
+
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS extraction_results (
                     id SERIAL PRIMARY KEY,
-                    result_id VARCHAR(36) UNIQUE NOT NULL,
+                    result_id CHAR(32) UNIQUE NOT NULL,
                     document_id VARCHAR(255) NOT NULL,
                     task_type VARCHAR(50) NOT NULL,
                     result JSONB NOT NULL,
@@ -113,8 +227,14 @@ class PostgreSQLBackend(DatabaseBackend):
                 );
                 CREATE INDEX IF NOT EXISTS idx_task_type ON extraction_results(task_type);
                 CREATE INDEX IF NOT EXISTS idx_created_at ON extraction_results(created_at);
+                CREATE INDEX IF NOT EXISTS idx_task_type_created_at
+                    ON extraction_results(task_type, created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_result_gin
+                    ON extraction_results USING GIN (result jsonb_path_ops);
             """)
-            self._conn.commit()
+            conn.commit()
+
+        PostgreSQLBackend._tables_ready.add(target)
 
     def save_result(
         self,
@@ -124,10 +244,11 @@ class PostgreSQLBackend(DatabaseBackend):
         metadata: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Save extraction result to PostgreSQL."""
-        import uuid
-        result_id = str(uuid.uuid4())
+        from psycopg2.extras import Json
+
+        result_id = uuid.uuid4().hex
 
-        with self._conn.cursor() as cur:
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute(
                 """
                 INSERT INTO extraction_results
@@ -138,32 +259,55 @@ class PostgreSQLBackend(DatabaseBackend):
                     result_id,
                     document_id,
                     task_type,
-                    json.dumps(result),
-                    json.dumps(metadata) if metadata else None,
+                    Json(result, dumps=_json_dumps),
+                    Json(metadata, dumps=_json_dumps) if metadata else None,
                 ),
             )
-            self._conn.commit()
+            conn.commit()
 
         return result_id
 
+    def save_results_bulk(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Save several extraction results in one round trip."""
+        from psycopg2.extras import Json, execute_values
+
+        result_ids = [uuid.uuid4().hex for _ in rows]
+        payload = [
+            (
+                result_id,
+                row["document_id"],
+                row["task_type"],
+                Json(row["result"], dumps=_json_dumps),
+                Json(row["metadata"], dumps=_json_dumps) if row.get("metadata") else None,
+            )
+            for result_id, row in zip(result_ids, rows)
+        ]
+
+        with self._connection() as conn, conn.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO extraction_results
+                (result_id, document_id, task_type, result, metadata)
+                VALUES %s
+                """,
+                payload,
+            )
+            conn.commit()
+
+        return result_ids
+
     def get_result(self, result_id: str) -> Optional[Dict[str, Any]]:
         """Get result by ID from PostgreSQL."""
-        with self._conn.cursor() as cur:
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute(
-                "SELECT * FROM extraction_results WHERE result_id = %s",
+                f"SELECT {_PG_COLUMNS} FROM extraction_results WHERE result_id = %s",
                 (result_id,),
             )
             row = cur.fetchone()
 
             if row:
-                return {
-                    "result_id": row[1],
-                    "document_id": row[2],
-                    "task_type": row[3],
-                    "result": row[4],
-                    "metadata": row[5],
-                    "created_at": row[6].isoformat() if row[6] else None,
-                }
+                return _pg_row_to_dict(row)
 
         return None
 
@@ -175,44 +319,47 @@ class PostgreSQLBackend(DatabaseBackend):
         limit: int = 100,
     ) -> List[Dict[str, Any]]:
         """Query results from PostgreSQL."""
-        query = "SELECT * FROM extraction_results WHERE 1=1"
-        params = []
-
-        if task_type:
-            query += " AND task_type = %s"
-            params.append(task_type)
+        filters = (task_type, start_date, end_date)
+        query = _PG_QUERIES[tuple(bool(f) for f in filters)]
+        params = tuple(f for f in filters if f) + (limit,)
 
-        if start_date:
-            query += " AND created_at >= %s"
-            params.append(start_date)
-
-        if end_date:
-            query += " AND created_at <= %s"
-            params.append(end_date)
-
-        query += " ORDER BY created_at DESC LIMIT %s"
-        params.append(limit)
-
-        with self._conn.cursor() as cur:
+        # Named (server-side) cursor streams rows in itersize chunks
+        with self._connection() as conn, conn.cursor(name="query_results") as cur:
+            cur.itersize = 500
             cur.execute(query, params)
-            rows = cur.fetchall()
-
-            return [
-                {
-                    "result_id": row[1],
-                    "document_id": row[2],
-                    "task_type": row[3],
-                    "result": row[4],
-                    "metadata": row[5],
-                    "created_at": row[6].isoformat() if row[6] else None,
-                }
-                for row in rows
-            ]
+            return [_pg_row_to_dict(row) for row in cur]
+
+
+# Fields returned to callers; _id is never needed
+_MONGO_PROJECTION = {
+    "_id": 0,
+    "result_id": 1,
+    "document_id": 1,
+    "task_type": 1,
+    "result": 1,
+    "metadata": 1,
+    "created_at": 1,
+}
+
+
+def _mongo_doc_to_dict(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a MongoDB document into a result dict."""
+    return {
+        "result_id": doc["result_id"],
+        "document_id": doc["document_id"],
+        "task_type": doc["task_type"],
+        "result": doc["result"],
+        "metadata": doc.get("metadata"),
+        "created_at": doc["created_at"].isoformat() if doc.get("created_at") else None,
+    }
 
 
 class MongoDBBackend(DatabaseBackend):
     """MongoDB database backend."""
 
+    # (uri, database, collection) targets already indexed in this process
+    _indexes_ready: set = set()
+
     def __init__(
         self,
         uri: str = "mongodb://localhost:27017",
@@ -237,15 +384,21 @@ class MongoDBBackend(DatabaseBackend):
     def connect(self) -> None:
         """Connect to MongoDB."""
         try:
-            from pymongo import MongoClient
+            from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient
             self._client = MongoClient(self.uri)
             self._db = self._client[self.database_name]
             self._collection = self._db[self.collection_name]
 
-            # Create indexes
-            self._collection.create_index("result_id", unique=True)
-            self._collection.create_index("task_type")
-            self._collection.create_index("created_at")
+            # Create indexes in one command, once per process
+            target = (self.uri, self.database_name, self.collection_name)
+            if target not in MongoDBBackend._indexes_ready:
+                self._collection.create_indexes([
+                    IndexModel([("result_id", ASCENDING)], unique=True),
+                    IndexModel([("task_type", ASCENDING)]),
+                    IndexModel([("created_at", DESCENDING)]),
+                    IndexModel([("task_type", ASCENDING), ("created_at", DESCENDING)]),
+                ])
+                MongoDBBackend._indexes_ready.add(target)
         except ImportError:
             raise ImportError(
                 "pymongo is required. Install with: pip install pymongo"
@@ -265,8 +418,7 @@ class MongoDBBackend(DatabaseBackend):
         metadata: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Save extraction result to MongoDB."""
-        import uuid
-        result_id = str(uuid.uuid4())
+        result_id = uuid.uuid4().hex
 
         doc = {
             "result_id": result_id,
@@ -280,19 +432,31 @@ class MongoDBBackend(DatabaseBackend):
         self._collection.insert_one(doc)
         return result_id
 
+    def save_results_bulk(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Save several extraction results with a single insert_many."""
+        created_at = datetime.utcnow()
+        docs = [
+            {
+                "result_id": uuid.uuid4().hex,
+                "document_id": row["document_id"],
+                "task_type": row["task_type"],
+                "result": row["result"],
+                "metadata": row.get("metadata"),
+                "created_at": created_at,
+            }
+            for row in rows
+        ]
+
+        # Unordered inserts let the server apply the writes as one batch
+        self._collection.insert_many(docs, ordered=False)
+        return [doc["result_id"] for doc in docs]
+
     def get_result(self, result_id: str) -> Optional[Dict[str, Any]]:
         """Get result by ID from MongoDB."""
-        doc = self._collection.find_one({"result_id": result_id})
+        doc = self._collection.find_one({"result_id": result_id}, _MONGO_PROJECTION)
 
         if doc:
-            return {
-                "result_id": doc["result_id"],
-                "document_id": doc["document_id"],
-                "task_type": doc["task_type"],
-                "result": doc["result"],
-                "metadata": doc.get("metadata"),
-                "created_at": doc["created_at"].isoformat() if doc.get("created_at") else None,
-            }
+            return _mongo_doc_to_dict(doc)
 
         return None
 
@@ -316,19 +480,14 @@ class MongoDBBackend(DatabaseBackend):
             if end_date:
                 query["created_at"]["$lte"] = end_date
 
-        cursor = self._collection.find(query).sort("created_at", -1).limit(limit)
+        cursor = (
+            self._collection.find(query, _MONGO_PROJECTION)
+            .sort("created_at", -1)
+            .limit(limit)
+            .batch_size(min(limit, 200))
+        )
 
-        return [
-            {
-                "result_id": doc["result_id"],
-                "document_id": doc["document_id"],
-                "task_type": doc["task_type"],
-                "result": doc["result"],
-                "metadata": doc.get("metadata"),
-                "created_at": doc["created_at"].isoformat() if doc.get("created_at") else None,
-            }
-            for doc in cursor
-        ]
+        return [_mongo_doc_to_dict(doc) for doc in cursor]
 
 
 def create_database(
@@ -1,13 +1,27 @@
 """FastAPI application for document processing."""
 
+import asyncio
+import hashlib
+import json
+import math
+import os
+import tempfile
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Request, Response, UploadFile, BackgroundTasks
 from PIL import Image
-import io
+from pydantic import BaseModel
+
+try:
+    from blake3 import blake3 as _content_hash
+except ImportError:
+    def _content_hash():
+        return hashlib.blake2b(digest_size=16)
 
 from .schemas import (
     ExtractionResult,
@@ -19,18 +33,129 @@ from .schemas import (
     NERResult,
     BatchJobStatus,
 )
+from .batcher import RequestBatcher
 from ..tasks import TaskType, get_handler, list_handlers
-from ..core.model_loader import ModelLoader
+from ..tasks.base import BaseTaskHandler, TaskResult
+from ..tasks.ocr import count_words
+from ..config import get_config
+from ..core.model_loader import get_model, load_model
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build handlers at startup and run the background job workers."""
+    global _job_queue
+    _warm_handlers()
+
+    _job_queue = asyncio.Queue()
+    workers = [
+        asyncio.create_task(_job_worker(_job_queue))
+        for _ in range(get_config().server.job_workers)
+    ]
+    try:
+        yield
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        _job_queue = None
 
 
 app = FastAPI(
     title="Qwen VL Document Processing API",
     description="Vision-Language model API for document extraction and analysis",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
-# In-memory job storage (replace with Redis/DB in production)
-_jobs: Dict[str, BatchJobStatus] = {}
+# In-memory job storage (replace with Redis/DB in production), oldest first
+_jobs: "OrderedDict[str, BatchJobStatus]" = OrderedDict()
+
+# Task handlers bound to the loaded model
+_handlers: Dict[TaskType, BaseTaskHandler] = {}
+
+# Raw request bodies larger than this are spooled to disk
+_SPOOL_MAX_SIZE = 1024 * 1024
+
+# Accepted upload types; octet-stream is allowed since the signature is checked
+_ALLOWED_CONTENT_TYPES = frozenset({
+    "image/jpeg",
+    "image/jpg",  # Non-standard, but still sent by some clients
+    "image/png",
+    "image/webp",
+    "image/tiff",
+    "image/bmp",
+    "image/gif",
+    "application/octet-stream",
+})
+
+# (offset, magic bytes) of supported image formats
+_IMAGE_SIGNATURES = (
+    (0, b"\xff\xd8\xff"),  # JPEG
+    (0, b"\x89PNG\r\n\x1a\n"),  # PNG
+    (8, b"WEBP"),  # WebP (after the RIFF header)
+    (0, b"II*\x00"),  # TIFF, little-endian
+    (0, b"MM\x00*"),  # TIFF, big-endian
+    (0, b"BM"),  # BMP
+    (0, b"GIF8"),  # GIF
+)
+_SIGNATURE_BYTES = 12
+
+# Queue feeding the background extraction workers, created at startup
+_job_queue: Optional[asyncio.Queue] = None
+
+# Groups concurrent extraction requests into one handler call
+_batcher = RequestBatcher(lambda task_type: _get_handler(task_type))
+
+
+async def _validated_upload(file: UploadFile = File(...)) -> UploadFile:
+    """Reject uploads that are not a supported image before any decoding."""
+    size = file.size
+    if size is None:
+        size = file.file.seek(0, os.SEEK_END)
+    await file.seek(0)
+    head = await file.read(_SIGNATURE_BYTES)
+    await file.seek(0)
+
+    max_bytes = get_config().server.max_file_size_mb << 20
+    _check_upload(file.content_type, head, size, max_bytes)
+    return file
+
+
+def _check_upload(
+    content_type: Optional[str],
+    head: Optional[bytes],
+    size: int,
+    max_bytes: int,
+) -> None:
+    """
+    Validate an upload's declared type, size and leading bytes.
+
+    Args:
+        content_type: Declared Content-Type, if any
+        head: First bytes of the file, or None to skip the signature check
+        size: Upload size in bytes
+        max_bytes: Largest accepted upload
+
+    Raises:
+        HTTPException: 415, 413 or 400 for unsupported, oversized or
+            empty/unrecognized uploads
+    """
+    if content_type and content_type.split(";")[0].strip() not in _ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type}")
+    if size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File exceeds {max_bytes >> 20} MB limit")
+    if head is None:
+        return
+    if not head:
+        raise HTTPException(status_code=400, detail="Empty file")
+    if not any(_matches_signature(head, sig) for sig in _IMAGE_SIGNATURES):
+        raise HTTPException(status_code=400, detail="File is not a supported image")
+
+
+def _matches_signature(head: bytes, signature: Tuple[int, bytes]) -> bool:
+    offset, magic = signature
+    return head[offset:offset + len(magic)] == magic
 
 
 @app.get("/health")
@@ -47,7 +172,7 @@ async def list_available_tasks():
 
 @app.post("/extract/ocr", response_model=OCRResult)
 async def extract_ocr(
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(_validated_upload),
     include_boxes: bool = Form(False),
 ):
     """
@@ -61,23 +186,51 @@ async def extract_ocr(
 
     try:
         image = await _load_image(file)
-        handler = _get_handler(TaskType.OCR)
+        result = await _batcher.submit(TaskType.OCR, image, include_boxes=include_boxes)
+
+        return _respond(OCRResult(
+            success=True,
+            text=result.text,
+            bounding_boxes=result.bounding_boxes,
+            word_count=_word_count(result),
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/extract/ocr/raw", response_model=OCRResult)
+async def extract_ocr_raw(
+    request: Request,
+    include_boxes: bool = False,
+):
+    """
+    Extract text from an image sent as the raw request body.
 
-        result = handler.process(image, include_boxes=include_boxes)
+    Skips multipart form parsing; send the image bytes directly with an
+    image Content-Type.
 
-        return OCRResult(
+    Args:
+        request: Request whose body is the image file
+        include_boxes: Whether to include bounding boxes
+    """
+    image = await _load_body_image(request)
+
+    try:
+        result = await _batcher.submit(TaskType.OCR, image, include_boxes=include_boxes)
+
+        return _respond(OCRResult(
             success=True,
             text=result.text,
             bounding_boxes=result.bounding_boxes,
-            word_count=len(result.text.split()) if result.text else 0,
-        )
+            word_count=_word_count(result),
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/extract/table", response_model=TableResult)
 async def extract_table(
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(_validated_upload),
     output_format: str = Form("json"),
 ):
     """
@@ -89,22 +242,20 @@ async def extract_table(
     """
     try:
         image = await _load_image(file)
-        handler = _get_handler(TaskType.TABLE)
-
-        result = handler.process(image, output_format=output_format)
+        result = await _batcher.submit(TaskType.TABLE, image, output_format=output_format)
 
-        return TableResult(
+        return _respond(TableResult(
             success=True,
             tables=result.data.get("tables", []) if result.data else [],
             csv_data=result.data.get("csv") if result.data else None,
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/extract/form", response_model=FormResult)
 async def extract_form(
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(_validated_upload),
     extract_signatures: bool = Form(True),
     extract_checkboxes: bool = Form(True),
 ):
@@ -118,28 +269,27 @@ async def extract_form(
     """
     try:
         image = await _load_image(file)
-        handler = _get_handler(TaskType.FORM)
-
-        result = handler.process(
+        result = await _batcher.submit(
+            TaskType.FORM,
             image,
             extract_signatures=extract_signatures,
             extract_checkboxes=extract_checkboxes,
         )
 
         data = result.data or {}
-        return FormResult(
+        return _respond(FormResult(
             success=True,
             fields=data.get("fields", []),
             checkboxes=data.get("checkboxes", []),
             signatures=data.get("signatures", []),
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/extract/invoice", response_model=InvoiceResult)
 async def extract_invoice(
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(_validated_upload),
     document_type: str = Form("invoice"),
 ):
     """
@@ -151,26 +301,24 @@ async def extract_invoice(
     """
     try:
         image = await _load_image(file)
-        handler = _get_handler(TaskType.INVOICE)
-
-        result = handler.process(image, document_type=document_type)
+        result = await _batcher.submit(TaskType.INVOICE, image, document_type=document_type)
 
         data = result.data or {}
-        return InvoiceResult(
+        return _respond(InvoiceResult(
             success=True,
             header=data.get("header", {}),
             line_items=data.get("line_items", []),
             summary=data.get("summary", {}),
             payment=data.get("payment", {}),
             validation=data.get("validation", {}),
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/extract/contract", response_model=ContractResult)
 async def extract_contract(
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(_validated_upload),
     extract_clauses: bool = Form(True),
     extract_obligations: bool = Form(True),
 ):
@@ -184,30 +332,29 @@ async def extract_contract(
     """
     try:
         image = await _load_image(file)
-        handler = _get_handler(TaskType.CONTRACT)
-
-        result = handler.process(
+        result = await _batcher.submit(
+            TaskType.CONTRACT,
             image,
             extract_clauses=extract_clauses,
             extract_obligations=extract_obligations,
         )
 
         data = result.data or {}
-        return ContractResult(
+        return _respond(ContractResult(
             success=True,
             parties=data.get("parties", []),
             dates=data.get("dates", {}),
             clauses=data.get("clauses", []),
             obligations=data.get("obligations", []),
             key_terms=data.get("key_terms", {}),
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/extract/ner", response_model=NERResult)
 async def extract_ner(
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(_validated_upload),
     entity_types: str = Form("all"),
 ):
     """
@@ -219,26 +366,24 @@ async def extract_ner(
     """
     try:
         image = await _load_image(file)
-        handler = _get_handler(TaskType.NER)
-
         # Parse entity types
         types = None if entity_types == "all" else entity_types.split(",")
 
-        result = handler.process(image, entity_types=types)
+        result = await _batcher.submit(TaskType.NER, image, entity_types=types)
 
         data = result.data or {}
-        return NERResult(
+        return _respond(NERResult(
             success=True,
             entities=data.get("entities", []),
             entity_counts=result.metadata.get("entity_counts", {}) if result.metadata else {},
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/extract/fields", response_model=ExtractionResult)
 async def extract_fields(
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(_validated_upload),
     schema: str = Form(...),
     preset: Optional[str] = Form(None),
 ):
@@ -250,42 +395,230 @@ async def extract_fields(
         schema: JSON schema string or 'preset:name'
         preset: Preset name (invoice, receipt, id_card, business_card)
     """
-    import json
-
     try:
         image = await _load_image(file)
-        handler = _get_handler(TaskType.FIELD_EXTRACTION)
-
         if preset:
-            result = handler.process(image, preset=preset)
+            result = await _batcher.submit(TaskType.FIELD_EXTRACTION, image, preset=preset)
         else:
             schema_dict = json.loads(schema)
-            result = handler.process(image, schema=schema_dict)
+            result = await _batcher.submit(
+                TaskType.FIELD_EXTRACTION, image, schema=schema_dict
+            )
 
-        return ExtractionResult(
+        return _respond(ExtractionResult(
             success=True,
             text=result.text,
             data=result.data,
             confidence=result.confidence,
-        )
+        ))
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON schema")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/jobs/extract/{task}", response_model=BatchJobStatus, status_code=202)
+async def submit_extraction_job(
+    task: TaskType,
+    file: UploadFile = Depends(_validated_upload),
+    options: str = Form("{}"),
+):
+    """
+    Queue an extraction to run in the background.
+
+    Args:
+        task: Task type to run
+        file: Image file to process
+        options: JSON object of task-specific options
+    """
+    if _job_queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+
+    try:
+        kwargs = json.loads(options)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON options")
+    if not isinstance(kwargs, dict):
+        raise HTTPException(status_code=400, detail="Options must be a JSON object")
+
+    try:
+        image = await _load_image(file)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid image: {e}")
+
+    job = BatchJobStatus(
+        job_id=uuid.uuid4().hex,
+        status="pending",
+        total_items=1,
+        processed_items=0,
+        failed_items=0,
+        created_at=datetime.utcnow(),
+    )
+    _prune_jobs()
+    _jobs[job.job_id] = job
+    _job_queue.put_nowait((job.job_id, task, image, kwargs))
+
+    return _respond(job, status_code=202)
+
+
+@app.get("/jobs/{job_id}", response_model=BatchJobStatus)
+async def get_job(job_id: str):
+    """
+    Get status and results of a background job.
+
+    Args:
+        job_id: Job ID returned on submission
+    """
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return _respond(job)
+
+
+def _prune_jobs() -> None:
+    """Forget finished jobs past their TTL, then the oldest beyond the cap."""
+    server = get_config().server
+    cutoff = datetime.utcnow() - timedelta(seconds=server.job_ttl_seconds)
+    # Submission order roughly follows completion order, so stop at the first
+    # job that is still running or within its TTL
+    while _jobs:
+        oldest = next(iter(_jobs.values()))
+        if oldest.completed_at is None or oldest.completed_at > cutoff:
+            break
+        _jobs.popitem(last=False)
+
+    while len(_jobs) >= server.max_jobs:
+        _jobs.popitem(last=False)
+
+
+async def _job_worker(queue: asyncio.Queue) -> None:
+    """Run queued extractions through the request batcher."""
+    while True:
+        job_id, task_type, image, kwargs = await queue.get()
+        job = _jobs.get(job_id)
+        if job is None:
+            # Evicted while queued; nobody can poll for it any more
+            queue.task_done()
+            continue
+        job.status = "processing"
+
+        try:
+            result = await _batcher.submit(task_type, image, **kwargs)
+        except Exception as e:
+            job.status = "failed"
+            job.failed_items = 1
+            job.results = [{"error": str(e)}]
+        else:
+            job.status = "completed"
+            job.processed_items = 1
+            job.results = [{
+                "text": result.text,
+                "data": result.data,
+                "bounding_boxes": result.bounding_boxes,
+                "confidence": result.confidence,
+                "metadata": result.metadata,
+            }]
+        finally:
+            job.completed_at = datetime.utcnow()
+            queue.task_done()
+
+
+def _word_count(result: TaskResult) -> int:
+    """Word count reported by the OCR handler, counted here if missing."""
+    metadata = result.metadata or {}
+    if "word_count" in metadata:
+        return metadata["word_count"]
+    return count_words(result.text)
+
+
+def _respond(result: BaseModel, status_code: int = 200) -> Response:
+    """Serialize a response model once, bypassing FastAPI's re-validation."""
+    return Response(
+        result.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 async def _load_image(file: UploadFile) -> Image.Image:
     """Load image from uploaded file."""
-    contents = await file.read()
-    return Image.open(io.BytesIO(contents)).convert("RGB")
+    # Decode straight from the upload's spooled file instead of copying
+    # the whole body into memory first
+    await file.seek(0)
+    # Decoding is CPU-bound; keep it off the event loop
+    max_pixels = get_config().inference.max_pixels
+    return await asyncio.to_thread(_decode_rgb, file.file, max_pixels)
+
+
+async def _load_body_image(request: Request) -> Image.Image:
+    """Validate and load image from the raw request body."""
+    content_type = request.headers.get("content-type")
+    max_bytes = get_config().server.max_file_size_mb << 20
+
+    # Spool like UploadFile does, without the multipart parser in between
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE) as fp:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            # Stop reading as soon as the limit is passed
+            _check_upload(content_type, None, size, max_bytes)
+            fp.write(chunk)
+        fp.seek(0)
+        _check_upload(content_type, fp.read(_SIGNATURE_BYTES), size, max_bytes)
+        fp.seek(0)
+
+        max_pixels = get_config().inference.max_pixels
+        try:
+            return await asyncio.to_thread(_decode_rgb, fp, max_pixels)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid image: {e}")
+
+
+def _decode_rgb(fp: BinaryIO, max_pixels: Optional[int] = None) -> Image.Image:
+    """
+    Decode an image file object to RGB, tagged with its content digest.
+
+    Args:
+        fp: Image file object
+        max_pixels: Pixel budget of the vision processor. JPEGs larger than
+            this are scaled down by the decoder itself, never below the budget.
+    """
+    digest = _content_hash()
+    for chunk in iter(lambda: fp.read(1 << 20), b""):
+        digest.update(chunk)
+    fp.seek(0)
+
+    image = Image.open(fp)
+    width, height = image.size
+    if max_pixels and width * height > max_pixels:
+        # The processor downsizes to max_pixels anyway; decoding at a
+        # reduced DCT scale skips materializing the full-resolution image.
+        # Only JPEG supports draft mode; other formats ignore it.
+        scale = math.sqrt(max_pixels / (width * height))
+        image.draft("RGB", (math.ceil(width * scale), math.ceil(height * scale)))
+    image = image.convert("RGB")
+    # Lets handlers reuse preprocessing for repeated uploads of the same file
+    image.info["digest"] = digest.hexdigest()
+    return image
+
+
+def _get_handler(task_type: TaskType) -> BaseTaskHandler:
+    """Get task handler with loaded model, reusing it across requests."""
+    loaded = get_model() or load_model()
+
+    handler = _handlers.get(task_type)
+    # Rebuild if the model was reloaded since the handler was created
+    if handler is None or handler.model is not loaded.model:
+        handler = _handlers[task_type] = get_handler(
+            task_type, loaded.model, loaded.processor
+        )
+    return handler
 
 
-def _get_handler(task_type: TaskType):
-    """Get task handler with loaded model."""
-    loader = ModelLoader()
-    if not loader.is_loaded:
-        loader.load()
-    return get_handler(task_type, loader.model, loader.processor)
+def _warm_handlers() -> None:
+    """Load the model and build every task handler."""
+    for task_type in list_handlers():
+        _get_handler(task_type)
 
 
 def create_app() -> FastAPI:
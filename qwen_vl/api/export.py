@@ -1,10 +1,23 @@
 """Export functionality for document processing results."""
 
 import csv
+import dataclasses
 import io
-import json
+import itertools
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from types import MappingProxyType
+from xml.sax.saxutils import escape as xml_escape
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.serialization import dumps as _dumps
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 
 def export_to_json(
@@ -21,9 +34,7 @@ def export_to_json(
     Returns:
         JSON string
     """
-    if pretty:
-        return json.dumps(data, indent=2, default=str)
-    return json.dumps(data, default=str)
+    return _dumps(data, indent=pretty)
 
 
 def export_to_csv(
@@ -40,28 +51,81 @@ def export_to_csv(
     Returns:
         CSV string
     """
-    if not data:
-        return ""
+    return "".join(iter_csv(data, columns))
+
+
+def iter_csv(
+    data: Iterable[Dict[str, Any]],
+    columns: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """
+    Export data to CSV one row at a time.
+
+    Suitable as the body of a streaming response, so large result sets
+    are never held in memory as a single string.
+
+    Args:
+        data: Records to export
+        columns: Column order (default: all keys from first record)
+
+    Yields:
+        CSV header, then one chunk per record
+    """
+    rows = map(_to_record, data)
+    first = next(rows, None)
+    if first is None:
+        return
 
     # Get columns
     if columns is None:
-        columns = list(data[0].keys())
+        columns = list(first.keys())
+
+    # Decide once per column whether cells need JSON encoding
+    getters = [_cell_getter(key, first.get(key)) for key in columns]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
 
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=columns, extrasaction="ignore")
-    writer.writeheader()
+    for row in itertools.chain((first,), rows):
+        writer.writerow([get(row) for get in getters])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
 
-    for row in data:
-        # Flatten nested dicts
-        flat_row = {}
-        for key in columns:
+
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+def _cell_getter(key: str, sample: Any) -> Callable[[Dict[str, Any]], Any]:
+    """Build the cell reader for a column from its first value."""
+    if type(sample) in _SCALAR_TYPES:
+        # Later rows may still hold nested values
+        def get(row: Dict[str, Any]) -> Any:
             value = row.get(key, "")
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            flat_row[key] = value
-        writer.writerow(flat_row)
+            return value if type(value) in _SCALAR_TYPES else _flatten(value)
 
-    return output.getvalue()
+        return get
+    # Nested or missing in the first row; check each value
+    return lambda row: _flatten(row.get(key, ""))
+
+
+def _to_record(record: Any) -> Mapping[str, Any]:
+    """Convert a typed record (Pydantic model, dataclass, msgspec Struct) to a mapping."""
+    if type(record) is dict or isinstance(record, Mapping):
+        return record
+    if hasattr(record, "model_dump"):
+        return record.model_dump()
+    if msgspec is not None:
+        return msgspec.to_builtins(record)
+    return dataclasses.asdict(record)
+
+
+def _flatten(value: Any) -> Any:
+    """JSON-encode nested values for a flat cell."""
+    if isinstance(value, (dict, list)):
+        return _dumps(value)
+    return value
 
 
 def export_to_excel(
@@ -79,12 +143,9 @@ def export_to_excel(
         Excel file bytes
     """
     try:
-        import openpyxl
-        from openpyxl.utils import get_column_letter
+        import xlsxwriter
     except ImportError:
-        raise ImportError("openpyxl is required. Install with: pip install openpyxl")
-
-    wb = openpyxl.Workbook()
+        raise ImportError("xlsxwriter is required. Install with: pip install xlsxwriter")
 
     # Handle dict with multiple sheets or single list
     if isinstance(data, list):
@@ -92,47 +153,55 @@ def export_to_excel(
     else:
         sheets = data
 
-    # Remove default sheet if we have named sheets
-    if len(sheets) > 0:
-        default_sheet = wb.active
-        if default_sheet.title == "Sheet":
-            wb.remove(default_sheet)
+    output = io.BytesIO()
+    # constant_memory flushes each row as it is written instead of keeping
+    # every cell object alive until save
+    wb = xlsxwriter.Workbook(output, {
+        "constant_memory": True,
+        "use_zip64": True,
+        "strings_to_urls": False,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    })
 
     for sheet_name, records in sheets.items():
         if not records:
             continue
+        records = [_to_record(record) for record in records]
 
-        ws = wb.create_sheet(title=sheet_name[:31])  # Excel limit
+        ws = wb.add_worksheet(sheet_name[:31])  # Excel limit
 
         # Get columns
         columns = list(records[0].keys())
+        ws.write_row(0, 0, columns)
 
-        # Write header
-        for col_idx, col_name in enumerate(columns, 1):
-            ws.cell(row=1, column=col_idx, value=col_name)
-
-        # Write data
-        for row_idx, record in enumerate(records, 2):
-            for col_idx, col_name in enumerate(columns, 1):
-                value = record.get(col_name, "")
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                ws.cell(row=row_idx, column=col_idx, value=value)
+        # Keep the first rows' cell lengths to size the columns
+        lengths = []
+        for row_idx, record in enumerate(records, 1):
+            values = [_flatten(record.get(col_name, "")) for col_name in columns]
+            ws.write_row(row_idx, 0, values)
+            if row_idx < _WIDTH_SAMPLE_ROWS:
+                lengths.append([len(str(value)) if value else 0 for value in values])
 
         # Auto-size columns
-        for col_idx, col_name in enumerate(columns, 1):
-            max_length = len(str(col_name))
-            for row in range(2, min(len(records) + 2, 100)):
-                cell_value = ws.cell(row=row, column=col_idx).value
-                if cell_value:
-                    max_length = max(max_length, min(len(str(cell_value)), 50))
-            ws.column_dimensions[get_column_letter(col_idx)].width = max_length + 2
+        for col_idx, width in enumerate(_column_widths(columns, lengths)):
+            ws.set_column(col_idx, col_idx, width)
 
-    output = io.BytesIO()
-    wb.save(output)
+    wb.close()
     return output.getvalue()
 
 
+_WIDTH_SAMPLE_ROWS = 100
+
+
+def _column_widths(columns: List[str], lengths: List[List[int]]) -> List[int]:
+    """Column widths from header names and sampled cell lengths (capped at 50)."""
+    widths = np.fromiter((len(str(c)) for c in columns), dtype=np.int32, count=len(columns))
+    if lengths:
+        cells = np.array(lengths, dtype=np.int32).max(axis=0)
+        widths = np.maximum(widths, np.minimum(cells, 50))
+    return (widths + 2).tolist()
+
+
 def export_to_pdf(
     data: Dict[str, Any],
     title: str = "Extraction Report",
@@ -152,7 +221,6 @@ def export_to_pdf(
     try:
         from reportlab.lib import colors
         from reportlab.lib.pagesizes import letter
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import inch
         from reportlab.platypus import (
             SimpleDocTemplate,
@@ -166,16 +234,10 @@ def export_to_pdf(
 
     output = io.BytesIO()
     doc = SimpleDocTemplate(output, pagesize=letter)
-    styles = getSampleStyleSheet()
+    styles, title_style = _pdf_styles()
     story = []
 
     # Title
-    title_style = ParagraphStyle(
-        "CustomTitle",
-        parent=styles["Heading1"],
-        fontSize=18,
-        spaceAfter=30,
-    )
     story.append(Paragraph(title, title_style))
 
     # Metadata
@@ -232,8 +294,9 @@ def export_to_pdf(
                     ]))
                     story.append(table)
                 else:
-                    for item in content[:20]:
-                        story.append(Paragraph(f"• {str(item)}", styles["Normal"]))
+                    # One paragraph for all bullets; each Paragraph runs the markup parser
+                    bullets = "<br/>".join(f"• {xml_escape(str(item))}" for item in content[:20])
+                    story.append(Paragraph(bullets, styles["Normal"]))
 
             elif isinstance(content, dict):
                 table_data = [[k, str(v)[:100]] for k, v in content.items()]
@@ -250,19 +313,52 @@ def export_to_pdf(
     return output.getvalue()
 
 
+@lru_cache(maxsize=1)
+def _pdf_styles() -> Tuple[Any, Any]:
+    """Sample stylesheet and report title style, built once."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        "CustomTitle",
+        parent=styles["Heading1"],
+        fontSize=18,
+        spaceAfter=30,
+    )
+    return styles, title_style
+
+
+def _csv_from_any(data: Any, **kwargs) -> str:
+    """Export a record list, or the first list found in a dict, to CSV."""
+    if isinstance(data, dict):
+        # Try to find a list in the data
+        for value in data.values():
+            if isinstance(value, list):
+                return export_to_csv(value, **kwargs)
+        return export_to_csv([data], **kwargs)
+    return export_to_csv(data, **kwargs)
+
+
+def _pdf_from_any(data: Any, **kwargs) -> bytes:
+    """Export a result dict, or any other data wrapped as one, to PDF."""
+    if not isinstance(data, dict):
+        data = {"data": data}
+    return export_to_pdf(data, **kwargs)
+
+
+# Format name to export function; read-only so it can be shared by all managers
+_DISPATCH = MappingProxyType({
+    "json": export_to_json,
+    "csv": _csv_from_any,
+    "excel": export_to_excel,
+    "xlsx": export_to_excel,
+    "pdf": _pdf_from_any,
+})
+
+
 class ExportManager:
     """Manage export operations."""
 
-    def __init__(self):
-        """Initialize export manager."""
-        self._formats = {
-            "json": self._export_json,
-            "csv": self._export_csv,
-            "excel": self._export_excel,
-            "xlsx": self._export_excel,
-            "pdf": self._export_pdf,
-        }
-
     def export(
         self,
         data: Any,
@@ -280,36 +376,16 @@ class ExportManager:
         Returns:
             Exported data as string or bytes
         """
-        format_lower = format.lower()
-        if format_lower not in self._formats:
-            raise ValueError(f"Unknown format: {format}. Available: {list(self._formats.keys())}")
-
-        return self._formats[format_lower](data, **kwargs)
-
-    def _export_json(self, data: Any, **kwargs) -> str:
-        return export_to_json(data, **kwargs)
-
-    def _export_csv(self, data: Any, **kwargs) -> str:
-        if isinstance(data, dict):
-            # Try to find a list in the data
-            for value in data.values():
-                if isinstance(value, list):
-                    return export_to_csv(value, **kwargs)
-            return export_to_csv([data], **kwargs)
-        return export_to_csv(data, **kwargs)
-
-    def _export_excel(self, data: Any, **kwargs) -> bytes:
-        return export_to_excel(data, **kwargs)
+        exporter = _DISPATCH.get(format.lower())
+        if exporter is None:
+            raise ValueError(f"Unknown format: {format}. Available: {list(_DISPATCH)}")
 
-    def _export_pdf(self, data: Any, **kwargs) -> bytes:
-        if not isinstance(data, dict):
-            data = {"data": data}
-        return export_to_pdf(data, **kwargs)
+        return exporter(data, **kwargs)
 
     @property
     def available_formats(self) -> List[str]:
         """List available export formats."""
-        return list(self._formats.keys())
+        return list(_DISPATCH)
 
 
 # Global export manager
@@ -1,7 +1,10 @@
 """API schema generation utilities."""
 
-from typing import Any, Dict, List, Optional, Type
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple, Type
+
 from pydantic import BaseModel, Field, create_model
 
 
@@ -19,27 +22,38 @@ def schema_to_pydantic(
     Returns:
         Generated Pydantic model class
     """
+    # Key on the parts of each field that shape the model, so repeated
+    # requests with the same schema reuse the compiled class
+    fields_key = tuple(
+        (
+            field.get("name", "unknown"),
+            field.get("type", "text"),
+            bool(field.get("required", False)),
+            field.get("description", ""),
+        )
+        for field in schema.get("fields", [])
+    )
+    return _compile_model(name, fields_key)
+
+
+@lru_cache(maxsize=256)
+def _compile_model(
+    name: str,
+    fields_key: Tuple[Tuple[str, str, bool, str], ...],
+) -> Type[BaseModel]:
+    """Create a Pydantic model from normalized field definitions."""
     field_definitions = {}
 
-    fields = schema.get("fields", [])
-    for field in fields:
-        field_name = field.get("name", "unknown")
-        field_type = field.get("type", "text")
-        required = field.get("required", False)
-        description = field.get("description", "")
-
-        # Map schema types to Python types
-        python_type = _get_python_type(field_type)
-
+    for field_name, field_type, required, description in fields_key:
         # Create field with default
         if required:
             field_definitions[field_name] = (
-                python_type,
+                _get_python_type(field_type),
                 Field(..., description=description)
             )
         else:
             field_definitions[field_name] = (
-                Optional[python_type],
+                _OPTIONAL_TYPE_MAP.get(field_type.lower(), Optional[str]),
                 Field(None, description=description)
             )
 
@@ -48,23 +62,30 @@ def schema_to_pydantic(
     return model
 
 
+# Map schema types to Python types
+_TYPE_MAP = MappingProxyType({
+    "text": str,
+    "string": str,
+    "number": float,
+    "integer": int,
+    "date": str,
+    "email": str,
+    "phone": str,
+    "currency": str,
+    "url": str,
+    "boolean": bool,
+    "list": List[str],
+    "array": List[str],
+})
+
+_OPTIONAL_TYPE_MAP = MappingProxyType({
+    name: Optional[python_type] for name, python_type in _TYPE_MAP.items()
+})
+
+
 def _get_python_type(field_type: str) -> type:
     """Map schema field type to Python type."""
-    type_mapping = {
-        "text": str,
-        "string": str,
-        "number": float,
-        "integer": int,
-        "date": str,
-        "email": str,
-        "phone": str,
-        "currency": str,
-        "url": str,
-        "boolean": bool,
-        "list": List[str],
-        "array": List[str],
-    }
-    return type_mapping.get(field_type.lower(), str)
+    return _TYPE_MAP.get(field_type.lower(), str)
 
 
 def generate_extraction_models() -> Dict[str, Type[BaseModel]]:
@@ -1,11 +1,18 @@
 """Storage integrations for document processing results."""
 
+import io
 import json
 import os
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Type, Union
+
+from ..utils.serialization import dumps_bytes as _json_bytes
 
 
 class StorageBackend(ABC):
@@ -54,36 +61,71 @@ class LocalStorage(StorageBackend):
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Directories known to exist, so repeated saves skip mkdir
+        self._mkdir_cache: Set[Path] = {self.base_path}
+        self._mkdir_lock = threading.Lock()
 
     def save(
         self,
         key: str,
         data: Union[bytes, str, Dict[str, Any]],
         metadata: Optional[Dict[str, str]] = None,
+        durable: bool = False,
     ) -> str:
-        """Save data to local filesystem."""
+        """
+        Save data to local filesystem.
+
+        Files are written to a temporary name and renamed into place, so
+        readers never see a partially written file.
+
+        Args:
+            key: Storage key
+            data: Data to save
+            metadata: Optional metadata, saved alongside as "<key>.meta"
+            durable: Flush to disk before renaming (slower)
+        """
         file_path = self.base_path / key
 
         # Create parent directories
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(file_path.parent)
 
         # Convert data to bytes
         if isinstance(data, dict):
-            content = json.dumps(data, indent=2).encode()
+            content = _json_bytes(data)
         elif isinstance(data, str):
             content = data.encode()
         else:
             content = data
 
-        file_path.write_bytes(content)
+        try:
+            _write_atomic(file_path, content, durable)
+        except FileNotFoundError:
+            # Directory was removed behind our back; forget and recreate it
+            self._ensure_dir(file_path.parent, refresh=True)
+            _write_atomic(file_path, content, durable)
 
         # Save metadata
         if metadata:
             meta_path = file_path.with_suffix(file_path.suffix + ".meta")
-            meta_path.write_text(json.dumps(metadata))
+            _write_atomic(meta_path, json.dumps(metadata).encode(), durable)
 
         return str(file_path)
 
+    def _ensure_dir(self, path: Path, refresh: bool = False) -> None:
+        """Create a directory unless it is already known to exist."""
+        if refresh:
+            with self._mkdir_lock:
+                self._mkdir_cache = {self.base_path}
+        elif path in self._mkdir_cache:
+            return
+
+        path.mkdir(parents=True, exist_ok=True)
+        with self._mkdir_lock:
+            # Ancestors up to the base path now exist too
+            while path not in self._mkdir_cache and path != path.parent:
+                self._mkdir_cache.add(path)
+                path = path.parent
+
     def load(self, key: str) -> Optional[bytes]:
         """Load data from local filesystem."""
         file_path = self.base_path / key
@@ -110,17 +152,49 @@ class LocalStorage(StorageBackend):
     def list_keys(self, prefix: str = "") -> List[str]:
         """List files with prefix."""
         search_path = self.base_path / prefix if prefix else self.base_path
-        if not search_path.exists():
+        if not search_path.is_dir():
             return []
 
+        # Walk with scandir so file type checks reuse the directory entry
+        # and keys are built from path strings, not Path objects
+        base = str(self.base_path)
         keys = []
-        for path in search_path.rglob("*"):
-            if path.is_file() and not path.suffix == ".meta":
-                keys.append(str(path.relative_to(self.base_path)))
+        pending = deque([str(search_path)])
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file() and not _is_sidecar(entry.name):
+                        keys.append(os.path.relpath(entry.path, base))
 
         return keys
 
 
+def _write_atomic(path: Path, content: bytes, durable: bool = False) -> None:
+    """Write a file via a temporary sibling and an atomic rename."""
+    # Unique per writer, so concurrent saves of one key do not collide
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _is_sidecar(name: str) -> bool:
+    """Whether a file is metadata or an in-progress write rather than a key."""
+    return name.endswith(".meta") or (name.startswith(".") and name.endswith(".tmp"))
+
+
 class S3Storage(StorageBackend):
     """AWS S3 storage backend."""
 
@@ -146,17 +220,7 @@ class S3Storage(StorageBackend):
         self.prefix = prefix.strip("/")
         self.region = region or os.getenv("AWS_REGION", "us-east-1")
 
-        # Lazy import boto3
-        try:
-            import boto3
-            self._client = boto3.client(
-                "s3",
-                region_name=self.region,
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-            )
-        except ImportError:
-            raise ImportError("boto3 is required for S3 storage. Install with: pip install boto3")
+        self._client = _get_s3_client(self.region, access_key, secret_key)
 
     def _full_key(self, key: str) -> str:
         """Get full key with prefix."""
@@ -175,7 +239,7 @@ class S3Storage(StorageBackend):
 
         # Convert data to bytes
         if isinstance(data, dict):
-            content = json.dumps(data, indent=2).encode()
+            content = _json_bytes(data)
         elif isinstance(data, str):
             content = data.encode()
         else:
@@ -185,25 +249,79 @@ class S3Storage(StorageBackend):
         if metadata:
             extra_args["Metadata"] = metadata
 
-        self._client.put_object(
-            Bucket=self.bucket,
-            Key=full_key,
-            Body=content,
-            **extra_args,
-        )
+        if len(content) >= _MULTIPART_THRESHOLD:
+            # Managed transfer uploads parts concurrently
+            self._client.upload_fileobj(
+                io.BytesIO(content),
+                Bucket=self.bucket,
+                Key=full_key,
+                ExtraArgs=extra_args or None,
+                Config=_get_transfer_config(),
+            )
+        else:
+            # A single PUT avoids the multipart create/complete round trips
+            self._client.put_object(
+                Bucket=self.bucket,
+                Key=full_key,
+                Body=content,
+                **extra_args,
+            )
 
         return f"s3://{self.bucket}/{full_key}"
 
     def load(self, key: str) -> Optional[bytes]:
-        """Load data from S3."""
+        """Load data from S3, fetching large objects in parallel ranges."""
+        full_key = self._full_key(key)
+        for attempt in range(_S3_LOAD_ATTEMPTS):
+            try:
+                return self._load(full_key)
+            except Exception as e:
+                # Overwritten mid-download; start over on the new version
+                if _error_code(e) != "PreconditionFailed" or attempt == _S3_LOAD_ATTEMPTS - 1:
+                    raise
+
+    def _load(self, full_key: str) -> Optional[bytes]:
+        """Download one version of an object."""
         try:
+            # The first range doubles as the size probe, so small objects
+            # still take a single request
             response = self._client.get_object(
                 Bucket=self.bucket,
-                Key=self._full_key(key),
+                Key=full_key,
+                Range=f"bytes=0-{_RANGE_THRESHOLD - 1}",
             )
-            return response["Body"].read()
         except self._client.exceptions.NoSuchKey:
             return None
+        except Exception as e:
+            # Empty objects cannot satisfy any range
+            if _error_code(e) != "InvalidRange":
+                raise
+            response = self._client.get_object(Bucket=self.bucket, Key=full_key)
+            return response["Body"].read()
+
+        head = response["Body"].read()
+        size = int(response.get("ContentRange", "").rpartition("/")[2] or len(head))
+        if size <= len(head):
+            return head
+
+        # Fill the rest in place; avoids joining chunk copies
+        buffer = bytearray(size)
+        buffer[:len(head)] = head
+        # Every range must come from the version the probe saw
+        pin = {"IfMatch": response["ETag"]} if response.get("ETag") else {}
+
+        def fetch(start: int) -> None:
+            end = min(start + _RANGE_CHUNK, size) - 1
+            part = self._client.get_object(
+                Bucket=self.bucket,
+                Key=full_key,
+                Range=f"bytes={start}-{end}",
+                **pin,
+            )
+            buffer[start:end + 1] = part["Body"].read()
+
+        list(_get_io_executor().map(fetch, range(len(head), size, _RANGE_CHUNK)))
+        return bytes(buffer)
 
     def delete(self, key: str) -> bool:
         """Delete object from S3."""
@@ -230,18 +348,137 @@ class S3Storage(StorageBackend):
     def list_keys(self, prefix: str = "") -> List[str]:
         """List objects with prefix in S3."""
         full_prefix = self._full_key(prefix)
+        strip = len(self.prefix) + 1 if self.prefix else 0
 
+        # List the top level with a delimiter, then fan out one listing per
+        # "subdirectory" so deep prefixes are paged concurrently
         keys = []
+        sub_prefixes = []
+        for page in self._paginate(full_prefix, Delimiter="/"):
+            keys.extend(obj["Key"][strip:] for obj in page.get("Contents", ()))
+            sub_prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", ()))
+
+        if len(sub_prefixes) == 1:
+            keys.extend(self._list_prefix(sub_prefixes[0], strip))
+        elif sub_prefixes:
+            for shard in _get_io_executor().map(
+                lambda sub_prefix: self._list_prefix(sub_prefix, strip), sub_prefixes
+            ):
+                keys.extend(shard)
+
+        # Shards are each sorted; restore S3's overall key order
+        keys.sort()
+        return keys
+
+    def _list_prefix(self, prefix: str, strip: int) -> List[str]:
+        """List every key under a prefix."""
+        return [
+            obj["Key"][strip:]
+            for page in self._paginate(prefix)
+            for obj in page.get("Contents", ())
+        ]
+
+    def _paginate(self, prefix: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Iterate list_objects_v2 pages under a prefix."""
         paginator = self._client.get_paginator("list_objects_v2")
+        return paginator.paginate(
+            Bucket=self.bucket,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": _LIST_PAGE_SIZE},
+            **kwargs,
+        )
 
-        for page in paginator.paginate(Bucket=self.bucket, Prefix=full_prefix):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                if self.prefix:
-                    key = key[len(self.prefix) + 1:]
-                keys.append(key)
 
-        return keys
+# S3 clients shared across backends, keyed by (region, access key, secret key),
+# so concurrent requests reuse one keep-alive connection pool
+_S3_MAX_POOL_CONNECTIONS = 64
+_s3_clients: Dict[tuple, Any] = {}
+_s3_clients_lock = threading.Lock()
+
+
+def _get_s3_client(
+    region: str,
+    access_key: Optional[str],
+    secret_key: Optional[str],
+) -> Any:
+    """Get or create the shared S3 client for a set of credentials."""
+    key = (region, access_key, secret_key)
+    client = _s3_clients.get(key)
+    if client is not None:
+        return client
+
+    # Lazy import boto3
+    try:
+        import boto3
+        from botocore.config import Config
+    except ImportError:
+        raise ImportError("boto3 is required for S3 storage. Install with: pip install boto3")
+
+    with _s3_clients_lock:
+        client = _s3_clients.get(key)
+        if client is None:
+            client = _s3_clients[key] = boto3.client(
+                "s3",
+                region_name=region,
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                config=Config(
+                    max_pool_connections=_S3_MAX_POOL_CONNECTIONS,
+                    retries={"max_attempts": 5, "mode": "adaptive"},
+                    tcp_keepalive=True,
+                ),
+            )
+    return client
+
+
+# Payloads at least this large are sent as multipart uploads
+_MULTIPART_THRESHOLD = 8 << 20
+
+
+@lru_cache(maxsize=1)
+def _get_transfer_config() -> Any:
+    """Multipart settings for large uploads, built once."""
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=_MULTIPART_THRESHOLD,
+        multipart_chunksize=_MULTIPART_THRESHOLD,
+        max_concurrency=10,
+    )
+
+
+# Objects larger than this are downloaded as parallel byte ranges
+_RANGE_THRESHOLD = 16 << 20
+_RANGE_CHUNK = 8 << 20
+# Tries at a download whose object is overwritten between ranges
+_S3_LOAD_ATTEMPTS = 3
+
+_LIST_PAGE_SIZE = 1000
+
+# Shared by the S3 and GCS backends for concurrent listings and ranged downloads
+_IO_WORKERS = 16
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = threading.Lock()
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Get the object storage I/O thread pool, creating it on first use."""
+    global _io_executor
+    if _io_executor is None:
+        with _io_executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=_IO_WORKERS, thread_name_prefix="storage-io"
+                )
+    return _io_executor
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    """Error code of a botocore ClientError, if it is one."""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
 
 
 class GCSStorage(StorageBackend):
@@ -263,6 +500,8 @@ class GCSStorage(StorageBackend):
         """
         self.bucket_name = bucket
         self.prefix = prefix.strip("/")
+        # Length of "prefix/" to strip from listed blob names
+        self._prefix_len = len(self.prefix) + 1 if self.prefix else 0
 
         # Lazy import google-cloud-storage
         try:
@@ -285,6 +524,11 @@ class GCSStorage(StorageBackend):
             return f"{self.prefix}/{key}"
         return key
 
+    def _blob(self, key: str) -> Any:
+        """Get a fresh blob handle for a key."""
+        # Not reused: an uploaded handle pins its generation on later requests
+        return self._bucket.blob(self._full_key(key))
+
     def save(
         self,
         key: str,
@@ -292,34 +536,33 @@ class GCSStorage(StorageBackend):
         metadata: Optional[Dict[str, str]] = None,
     ) -> str:
         """Save data to GCS."""
-        full_key = self._full_key(key)
-        blob = self._bucket.blob(full_key)
+        blob = self._blob(key)
+
+        # Sent with the upload instead of a separate patch request
+        if metadata:
+            blob.metadata = metadata
 
         # Convert data
         if isinstance(data, dict):
-            content = json.dumps(data, indent=2)
+            content = _json_bytes(data)
             blob.upload_from_string(content, content_type="application/json")
         elif isinstance(data, str):
             blob.upload_from_string(data)
         else:
             blob.upload_from_string(data)
 
-        if metadata:
-            blob.metadata = metadata
-            blob.patch()
-
-        return f"gs://{self.bucket_name}/{full_key}"
+        return f"gs://{self.bucket_name}/{blob.name}"
 
     def load(self, key: str) -> Optional[bytes]:
         """Load data from GCS."""
-        blob = self._bucket.blob(self._full_key(key))
+        blob = self._blob(key)
         if blob.exists():
             return blob.download_as_bytes()
         return None
 
     def delete(self, key: str) -> bool:
         """Delete blob from GCS."""
-        blob = self._bucket.blob(self._full_key(key))
+        blob = self._blob(key)
         if blob.exists():
             blob.delete()
             return True
@@ -327,20 +570,53 @@ class GCSStorage(StorageBackend):
 
     def exists(self, key: str) -> bool:
         """Check if blob exists in GCS."""
-        return self._bucket.blob(self._full_key(key)).exists()
+        return self._blob(key).exists()
 
     def list_keys(self, prefix: str = "") -> List[str]:
         """List blobs with prefix in GCS."""
         full_prefix = self._full_key(prefix)
+        strip = self._prefix_len
+
+        # Same fan-out as S3Storage.list_keys: one listing per "subdirectory"
+        blobs = self._list_blobs(full_prefix, delimiter="/")
+        keys = [blob.name[strip:] for blob in blobs]
+        # Only populated once the pages have been consumed
+        sub_prefixes = sorted(blobs.prefixes)
+
+        if len(sub_prefixes) == 1:
+            keys.extend(self._list_prefix(sub_prefixes[0], strip))
+        elif sub_prefixes:
+            for shard in _get_io_executor().map(
+                lambda sub_prefix: self._list_prefix(sub_prefix, strip), sub_prefixes
+            ):
+                keys.extend(shard)
+
+        keys.sort()
+        return keys
 
-        keys = []
-        for blob in self._bucket.list_blobs(prefix=full_prefix):
-            key = blob.name
-            if self.prefix:
-                key = key[len(self.prefix) + 1:]
-            keys.append(key)
+    def _list_prefix(self, prefix: str, strip: int) -> List[str]:
+        """List every blob name under a prefix."""
+        return [blob.name[strip:] for blob in self._list_blobs(prefix)]
+
+    def _list_blobs(self, prefix: str, **kwargs) -> Any:
+        """Iterate blobs under a prefix, fetching only their names."""
+        return self._client.list_blobs(
+            self._bucket,
+            prefix=prefix,
+            fields=_GCS_LIST_FIELDS,
+            **kwargs,
+        )
 
-        return keys
+
+# Partial response for listings; the default returns every blob property
+_GCS_LIST_FIELDS = "items/name,prefixes,nextPageToken"
+
+
+_BACKENDS: Dict[str, Type[StorageBackend]] = {
+    "local": LocalStorage,
+    "s3": S3Storage,
+    "gcs": GCSStorage,
+}
 
 
 def create_storage(
@@ -357,16 +633,11 @@ def create_storage(
     Returns:
         Storage backend instance
     """
-    backends = {
-        "local": LocalStorage,
-        "s3": S3Storage,
-        "gcs": GCSStorage,
-    }
-
-    if backend not in backends:
-        raise ValueError(f"Unknown backend: {backend}. Available: {list(backends.keys())}")
+    backend_cls = _BACKENDS.get(backend)
+    if backend_cls is None:
+        raise ValueError(f"Unknown backend: {backend}. Available: {tuple(_BACKENDS)}")
 
-    return backends[backend](**kwargs)
+    return backend_cls(**kwargs)
 
 
 if __name__ == "__main__":
@@ -3,14 +3,19 @@
 import asyncio
 import hashlib
 import hmac
-import json
+import importlib.util
+import random
 import time
+import uuid
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Union
 import httpx
 
+from ..utils.serialization import dumps_bytes as _json_bytes
+
 
 class EventType(str, Enum):
     """Webhook event types."""
@@ -52,14 +57,37 @@ class WebhookDelivery:
     error: Optional[str] = None
 
 
+# Delivery records kept for get_deliveries
+_MAX_DELIVERY_HISTORY = 10000
+
+# Connection pool for deliveries; HTTP/2 multiplexes requests to one host
+# over a single connection when the optional h2 package is installed
+_CLIENT_LIMITS = httpx.Limits(
+    max_connections=256,
+    max_keepalive_connections=128,
+    keepalive_expiry=30,
+)
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_CONNECT_TIMEOUT_SECONDS = 5.0
+
+# Longest sleep between delivery attempts
+_MAX_RETRY_DELAY_SECONDS = 60.0
+# Client errors that can succeed on a later attempt
+_RETRYABLE_CLIENT_ERRORS = frozenset({408, 425, 429})
+
+
 class WebhookManager:
     """Manage webhook subscriptions and deliveries."""
 
     def __init__(self):
         """Initialize webhook manager."""
         self._webhooks: Dict[str, WebhookConfig] = {}
-        self._deliveries: List[WebhookDelivery] = []
-        self._client = httpx.AsyncClient()
+        # Webhook IDs subscribed to each event, in registration order
+        self._by_event: Dict[EventType, Dict[str, None]] = defaultdict(dict)
+        # Recent delivery history; oldest records drop off once full
+        self._deliveries: Deque[WebhookDelivery] = deque(maxlen=_MAX_DELIVERY_HISTORY)
+        # Pooled keep-alive connections shared by concurrent deliveries
+        self._client = httpx.AsyncClient(limits=_CLIENT_LIMITS, http2=_HTTP2)
 
     def register_webhook(
         self,
@@ -89,7 +117,11 @@ class WebhookManager:
             secret=secret,
             **kwargs,
         )
+        # Re-registering replaces the previous subscriptions
+        self._unindex(webhook_id)
         self._webhooks[webhook_id] = config
+        for event in events:
+            self._by_event[event][webhook_id] = None
         return config
 
     def unregister_webhook(self, webhook_id: str) -> bool:
@@ -103,10 +135,21 @@ class WebhookManager:
             True if removed
         """
         if webhook_id in self._webhooks:
+            self._unindex(webhook_id)
             del self._webhooks[webhook_id]
             return True
         return False
 
+    def _unindex(self, webhook_id: str) -> None:
+        """Remove a webhook from the event index."""
+        config = self._webhooks.get(webhook_id)
+        if config is None:
+            return
+        for event in config.events:
+            subscribers = self._by_event.get(event)
+            if subscribers is not None:
+                subscribers.pop(webhook_id, None)
+
     def get_webhook(self, webhook_id: str) -> Optional[WebhookConfig]:
         """Get webhook configuration."""
         return self._webhooks.get(webhook_id)
@@ -134,9 +177,11 @@ class WebhookManager:
         Returns:
             List of delivery records
         """
+        # One timestamp per event, shared by the payload and first attempts
+        now = datetime.utcnow()
         payload = {
             "event_type": event_type.value,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now.isoformat(),
             "job_id": job_id,
             "document_id": document_id,
             "data": data,
@@ -144,16 +189,16 @@ class WebhookManager:
 
         # Find subscribed webhooks
         webhooks = [
-            w for w in self._webhooks.values()
-            if w.active and event_type in w.events
+            self._webhooks[webhook_id]
+            for webhook_id in self._by_event.get(event_type, ())
+            if self._webhooks[webhook_id].active
         ]
 
-        # Send to all subscribed webhooks
-        deliveries = []
-        for webhook in webhooks:
-            delivery = await self._send_webhook(webhook, payload)
-            deliveries.append(delivery)
-            self._deliveries.append(delivery)
+        # Send to all subscribed webhooks concurrently
+        deliveries = list(await asyncio.gather(
+            *(self._send_webhook(webhook, payload, event_type, now) for webhook in webhooks)
+        ))
+        self._deliveries.extend(deliveries)
 
         return deliveries
 
@@ -161,25 +206,29 @@ class WebhookManager:
         self,
         webhook: WebhookConfig,
         payload: Dict[str, Any],
+        event_type: EventType,
+        sent_at: Optional[datetime] = None,
     ) -> WebhookDelivery:
         """Send webhook with retry logic."""
-        import uuid
-
         delivery = WebhookDelivery(
             delivery_id=str(uuid.uuid4()),
             webhook_id=webhook.webhook_id,
-            event_type=EventType(payload["event_type"]),
+            event_type=event_type,
             payload=payload,
             status="pending",
         )
 
-        body = json.dumps(payload)
+        # A down receiver should fail fast rather than hold the full timeout
+        timeout = httpx.Timeout(webhook.timeout_seconds, connect=_CONNECT_TIMEOUT_SECONDS)
+
+        # Encoded once; the same bytes are signed and sent on every attempt
+        body = _json_bytes(payload)
         headers = {
             "Content-Type": "application/json",
             **webhook.headers,
         }
 
-        # Add signature if secret is configured
+        # Add signature if secret is configured; read per delivery so rotation applies
         if webhook.secret:
             signature = self._generate_signature(body, webhook.secret)
             headers["X-Webhook-Signature"] = signature
@@ -187,14 +236,15 @@ class WebhookManager:
         # Retry loop
         for attempt in range(webhook.retry_count):
             delivery.attempts = attempt + 1
-            delivery.last_attempt = datetime.utcnow()
+            # Retries follow a backoff sleep, so only they need a fresh clock read
+            delivery.last_attempt = sent_at if attempt == 0 and sent_at else datetime.utcnow()
 
             try:
                 response = await self._client.post(
                     webhook.url,
                     content=body,
                     headers=headers,
-                    timeout=webhook.timeout_seconds,
+                    timeout=timeout,
                 )
 
                 delivery.response_code = response.status_code
@@ -204,23 +254,38 @@ class WebhookManager:
                     delivery.status = "success"
                     return delivery
 
+                # The receiver rejected the request; resending will not help
+                if (
+                    response.is_client_error
+                    and response.status_code not in _RETRYABLE_CLIENT_ERRORS
+                ):
+                    break
+
             except Exception as e:
                 delivery.error = str(e)
 
-            # Wait before retry
+            # Full-jitter exponential backoff, so deliveries failing together
+            # do not all retry a struggling receiver at the same moment
             if attempt < webhook.retry_count - 1:
-                await asyncio.sleep(webhook.retry_delay_seconds * (attempt + 1))
+                await asyncio.sleep(random.uniform(0, min(
+                    webhook.retry_delay_seconds * 2 ** attempt,
+                    _MAX_RETRY_DELAY_SECONDS,
+                )))
 
         delivery.status = "failed"
         return delivery
 
-    def _generate_signature(self, payload: str, secret: str) -> str:
+    def _generate_signature(
+        self,
+        payload: Union[str, bytes],
+        secret: Union[str, bytes],
+    ) -> str:
         """Generate HMAC signature for payload."""
-        return hmac.new(
-            secret.encode(),
-            payload.encode(),
-            hashlib.sha256,
-        ).hexdigest()
+        if isinstance(payload, str):
+            payload = payload.encode()
+        if isinstance(secret, str):
+            secret = secret.encode()
+        return hmac.new(secret, payload, hashlib.sha256).hexdigest()
 
     def get_deliveries(
         self,
@@ -239,15 +304,22 @@ class WebhookManager:
         Returns:
             List of deliveries
         """
-        deliveries = self._deliveries
-
-        if webhook_id:
-            deliveries = [d for d in deliveries if d.webhook_id == webhook_id]
-
-        if status:
-            deliveries = [d for d in deliveries if d.status == status]
-
-        return deliveries[-limit:]
+        if limit <= 0:
+            return []
+
+        # Scan from the newest record and stop once enough match
+        matches = []
+        for delivery in reversed(self._deliveries):
+            if webhook_id and delivery.webhook_id != webhook_id:
+                continue
+            if status and delivery.status != status:
+                continue
+            matches.append(delivery)
+            if len(matches) == limit:
+                break
+
+        matches.reverse()
+        return matches
 
     async def close(self):
         """Close HTTP client."""
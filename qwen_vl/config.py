@@ -2,10 +2,18 @@
 
 import os
 from dataclasses import dataclass, field
-from typing import Literal, Optional
+from functools import cached_property
+from typing import Any, Callable, Dict, Final, Literal, Mapping, Optional, Tuple
 
+# Approximate VRAM (GB) per model size at 4-bit, and scaling per quantization
+_BASE_VRAM_GB: Final[Dict[str, float]] = {
+    "2B": 4.0, "3B": 6.0, "4B": 8.0, "7B": 14.0, "8B": 16.0, "72B": 144.0
+}
+_QUANT_MULTIPLIER: Final[Dict[str, float]] = {"none": 2.0, "4bit": 1.0, "8bit": 1.5}
 
-@dataclass
+
+# Configs are immutable once loaded, so derived values are computed once
+@dataclass(frozen=True)
 class ModelConfig:
     """Model configuration settings."""
 
@@ -16,7 +24,7 @@ class ModelConfig:
     device_map: str = "auto"
     local_path: Optional[str] = None  # Local model directory path
 
-    @property
+    @cached_property
     def model_id(self) -> str:
         """Get the Hugging Face model ID or local path."""
         if self.local_path:
@@ -31,22 +39,18 @@ class ModelConfig:
             variant_name = "Instruct" if self.variant == "instruct" else "Thinking"
             return f"Qwen/Qwen3-VL-{self.size}-{variant_name}"
 
-    @property
+    @cached_property
     def is_local(self) -> bool:
         """Check if using local model path."""
         return self.local_path is not None
 
-    @property
+    @cached_property
     def estimated_vram_gb(self) -> float:
         """Estimate VRAM usage based on model size and quantization."""
-        base_vram = {
-            "2B": 4.0, "3B": 6.0, "4B": 8.0, "7B": 14.0, "8B": 16.0, "72B": 144.0
-        }
-        quant_multiplier = {"none": 2.0, "4bit": 1.0, "8bit": 1.5}
-        return base_vram.get(self.size, 8.0) * quant_multiplier[self.quantization]
+        return _BASE_VRAM_GB.get(self.size, 8.0) * _QUANT_MULTIPLIER[self.quantization]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class InferenceConfig:
     """Inference configuration settings."""
 
@@ -59,7 +63,7 @@ class InferenceConfig:
     do_sample: bool = True
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """Server configuration settings."""
 
@@ -68,9 +72,12 @@ class ServerConfig:
     share: bool = False
     max_file_size_mb: int = 20
     max_video_size_mb: int = 100
+    job_workers: int = 2
+    job_ttl_seconds: int = 3600  # How long finished jobs can be polled
+    max_jobs: int = 10000
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LoggingConfig:
     """Logging configuration settings."""
 
@@ -79,7 +86,7 @@ class LoggingConfig:
     file_path: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     """Main configuration container."""
 
@@ -89,41 +96,70 @@ class Config:
     logging: LoggingConfig = field(default_factory=LoggingConfig)
 
 
+def _env_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _env_path(value: str) -> Optional[str]:
+    # Treat an empty path as unset
+    return value or None
+
+
+# (field, environment variable, default, cast applied to set values)
+_EnvField = Tuple[str, str, Any, Callable[[str], Any]]
+
+_MODEL_ENV: Final[Tuple[_EnvField, ...]] = (
+    ("family", "QWEN_MODEL_FAMILY", "qwen2.5", str),
+    ("size", "QWEN_MODEL_SIZE", "7B", str),
+    ("variant", "QWEN_MODEL_VARIANT", "instruct", str),
+    ("quantization", "QWEN_QUANTIZATION", "4bit", str),
+    ("device_map", "QWEN_DEVICE_MAP", "auto", str),
+    ("local_path", "QWEN_MODEL_PATH", None, _env_path),
+)
+
+_INFERENCE_ENV: Final[Tuple[_EnvField, ...]] = (
+    ("max_new_tokens", "QWEN_MAX_NEW_TOKENS", 4096, int),
+    ("min_pixels", "QWEN_MIN_PIXELS", 512 * 28 * 28, int),
+    ("max_pixels", "QWEN_MAX_PIXELS", 2048 * 28 * 28, int),
+    ("temperature", "QWEN_TEMPERATURE", 0.7, float),
+    ("top_p", "QWEN_TOP_P", 0.9, float),
+)
+
+_SERVER_ENV: Final[Tuple[_EnvField, ...]] = (
+    ("host", "GRADIO_SERVER_NAME", "0.0.0.0", str),
+    ("port", "GRADIO_SERVER_PORT", 7860, int),
+    ("share", "GRADIO_SHARE", False, _env_bool),
+    ("max_file_size_mb", "MAX_FILE_SIZE_MB", 20, int),
+    ("max_video_size_mb", "MAX_VIDEO_SIZE_MB", 100, int),
+    ("job_workers", "JOB_WORKER_CONCURRENCY", 2, int),
+    ("job_ttl_seconds", "JOB_TTL_SECONDS", 3600, int),
+    ("max_jobs", "MAX_JOBS", 10000, int),
+)
+
+_LOGGING_ENV: Final[Tuple[_EnvField, ...]] = (
+    ("level", "LOG_LEVEL", "INFO", str),
+    ("format", "LOG_FORMAT", "json", str),
+    ("file_path", "LOG_FILE_PATH", None, str),
+)
+
+
+def _from_env(env: Mapping[str, str], fields: Tuple[_EnvField, ...]) -> Dict[str, Any]:
+    """Build config kwargs from environment variables, casting set values."""
+    kwargs = {}
+    for name, key, default, cast in fields:
+        value = env.get(key)
+        kwargs[name] = default if value is None else cast(value)
+    return kwargs
+
+
 def load_config() -> Config:
     """Load configuration from environment variables."""
-    # Get local path (None if not set or empty)
-    local_path = os.getenv("QWEN_MODEL_PATH")
-    if local_path == "":
-        local_path = None
-
+    env = os.environ
     return Config(
-        model=ModelConfig(
-            family=os.getenv("QWEN_MODEL_FAMILY", "qwen2.5"),
-            size=os.getenv("QWEN_MODEL_SIZE", "7B"),
-            variant=os.getenv("QWEN_MODEL_VARIANT", "instruct"),
-            quantization=os.getenv("QWEN_QUANTIZATION", "4bit"),
-            device_map=os.getenv("QWEN_DEVICE_MAP", "auto"),
-            local_path=local_path,
-        ),
-        inference=InferenceConfig(
-            max_new_tokens=int(os.getenv("QWEN_MAX_NEW_TOKENS", "4096")),
-            min_pixels=int(os.getenv("QWEN_MIN_PIXELS", str(512 * 28 * 28))),
-            max_pixels=int(os.getenv("QWEN_MAX_PIXELS", str(2048 * 28 * 28))),
-            temperature=float(os.getenv("QWEN_TEMPERATURE", "0.7")),
-            top_p=float(os.getenv("QWEN_TOP_P", "0.9")),
-        ),
-        server=ServerConfig(
-            host=os.getenv("GRADIO_SERVER_NAME", "0.0.0.0"),
-            port=int(os.getenv("GRADIO_SERVER_PORT", "7860")),
-            share=os.getenv("GRADIO_SHARE", "false").lower() == "true",
-            max_file_size_mb=int(os.getenv("MAX_FILE_SIZE_MB", "20")),
-            max_video_size_mb=int(os.getenv("MAX_VIDEO_SIZE_MB", "100")),
-        ),
-        logging=LoggingConfig(
-            level=os.getenv("LOG_LEVEL", "INFO"),
-            format=os.getenv("LOG_FORMAT", "json"),
-            file_path=os.getenv("LOG_FILE_PATH"),
-        ),
+        model=ModelConfig(**_from_env(env, _MODEL_ENV)),
+        inference=InferenceConfig(**_from_env(env, _INFERENCE_ENV)),
+        server=ServerConfig(**_from_env(env, _SERVER_ENV)),
+        logging=LoggingConfig(**_from_env(env, _LOGGING_ENV)),
     )
 
 
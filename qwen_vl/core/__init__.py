@@ -1,16 +1,23 @@
 """Core inference components."""
 
+import importlib
+
+_LAZY = {
+    "ModelLoader": (".model_loader", "ModelLoader"),
+    "load_model": (".model_loader", "load_model"),
+    "HardwareDetector": (".hardware_detection", "HardwareDetector"),
+}
+
+
 def __getattr__(name):
     """Lazy import for heavy modules."""
-    if name == "ModelLoader":
-        from .model_loader import ModelLoader
-        return ModelLoader
-    if name == "load_model":
-        from .model_loader import load_model
-        return load_model
-    if name == "HardwareDetector":
-        from .hardware_detection import HardwareDetector
-        return HardwareDetector
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    spec = _LAZY.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(spec[0], __name__)
+    value = getattr(module, spec[1])
+    globals()[name] = value
+    return value
 
 __all__ = ["ModelLoader", "load_model", "HardwareDetector"]
@@ -1,13 +1,66 @@
 """Hardware detection and GPU resource management."""
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Final, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Free VRAM (GB) needed per model size
+_VRAM_REQUIRED_GB: Final[Dict[str, float]] = {"2B": 4.0, "4B": 8.0, "8B": 16.0}
+# Largest model first, for picking the biggest one that fits
+_VRAM_TIERS: Final[Tuple[Tuple[float, str], ...]] = tuple(
+    sorted(((gb, size) for size, gb in _VRAM_REQUIRED_GB.items()), reverse=True)
+)
+_MIN_VRAM_GB: Final[float] = _VRAM_TIERS[-1][0]
 
-@dataclass
+
+# CUDA availability cannot change within a process, so it is queried once.
+# Raises ImportError (not cached) when PyTorch is missing.
+@lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    import torch
+
+    return torch.cuda.is_available()
+
+
+@lru_cache(maxsize=1)
+def _cuda_version() -> Optional[str]:
+    import torch
+
+    return torch.version.cuda
+
+
+# Nodes with at least this many GPUs poll them concurrently
+_PARALLEL_POLL_MIN_GPUS = 4
+
+# Guards one-time hardware detection and the global detector
+_lock = threading.Lock()
+
+# Static per-device properties: index -> (name, total memory in bytes).
+# get_device_properties is a heavyweight driver call, so it runs once per GPU.
+_device_props: Dict[int, Tuple[str, int]] = {}
+_device_props_lock = threading.Lock()
+
+
+def _get_device_props(index: int) -> Tuple[str, int]:
+    """Get the name and total memory of a GPU."""
+    props = _device_props.get(index)
+    if props is None:
+        import torch
+
+        with _device_props_lock:
+            props = _device_props.get(index)
+            if props is None:
+                device = torch.cuda.get_device_properties(index)
+                props = _device_props[index] = (device.name, device.total_memory)
+    return props
+
+
+@dataclass(slots=True)
 class GPUInfo:
     """Information about a single GPU."""
 
@@ -25,7 +78,7 @@ class GPUInfo:
         return (self.used_memory_gb / self.total_memory_gb) * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class HardwareInfo:
     """Complete hardware information."""
 
@@ -38,19 +91,13 @@ class HardwareInfo:
 
     @property
     def has_sufficient_vram(self) -> bool:
-        """Check if there's at least 4GB free VRAM for smallest model."""
-        return self.free_vram_gb >= 4.0
+        """Check if there's enough free VRAM for the smallest model."""
+        return self.free_vram_gb >= _MIN_VRAM_GB
 
     def get_recommended_model(self) -> str:
         """Get recommended model size based on available VRAM."""
-        if self.free_vram_gb >= 16:
-            return "8B"
-        elif self.free_vram_gb >= 8:
-            return "4B"
-        elif self.free_vram_gb >= 4:
-            return "2B"
-        else:
-            return "none"
+        free = self.free_vram_gb
+        return next((size for required, size in _VRAM_TIERS if free >= required), "none")
 
 
 class HardwareDetector:
@@ -66,16 +113,20 @@ class HardwareDetector:
         Returns:
             HardwareInfo with GPU details
         """
-        if self._hardware_info is not None:
-            return self._hardware_info
+        if self._hardware_info is None:
+            # Enumerate once even when several threads ask on first use
+            with _lock:
+                if self._hardware_info is None:
+                    self._hardware_info = self._detect()
+        return self._hardware_info
 
+    def _detect(self) -> HardwareInfo:
+        """Query PyTorch for CUDA devices."""
         try:
             import torch
 
-            cuda_available = torch.cuda.is_available()
-
-            if not cuda_available:
-                self._hardware_info = HardwareInfo(
+            if not _cuda_available():
+                return HardwareInfo(
                     cuda_available=False,
                     cuda_version=None,
                     gpu_count=0,
@@ -83,26 +134,33 @@ class HardwareDetector:
                     total_vram_gb=0.0,
                     free_vram_gb=0.0,
                 )
-                return self._hardware_info
 
-            cuda_version = torch.version.cuda
+            cuda_version = _cuda_version()
             gpu_count = torch.cuda.device_count()
             gpus = []
             total_vram = 0.0
             free_vram = 0.0
 
-            for i in range(gpu_count):
-                props = torch.cuda.get_device_properties(i)
-                total_mem = props.total_memory / (1024**3)  # Convert to GB
-
-                # Get current memory usage
-                torch.cuda.set_device(i)
-                free_mem = torch.cuda.mem_get_info()[0] / (1024**3)
+            def poll(index: int) -> Tuple[str, int, int]:
+                name, total_bytes = _get_device_props(index)
+                # Query by index; leaves the caller's current device untouched
+                return name, total_bytes, torch.cuda.mem_get_info(index)[0]
+
+            if gpu_count >= _PARALLEL_POLL_MIN_GPUS:
+                # Overlap the per-device driver round trips on large nodes
+                with ThreadPoolExecutor(max_workers=gpu_count) as executor:
+                    polled = list(executor.map(poll, range(gpu_count)))
+            else:
+                polled = [poll(i) for i in range(gpu_count)]
+
+            for i, (name, total_bytes, free_bytes) in enumerate(polled):
+                total_mem = total_bytes / (1024**3)  # Convert to GB
+                free_mem = free_bytes / (1024**3)
                 used_mem = total_mem - free_mem
 
                 gpu_info = GPUInfo(
                     index=i,
-                    name=props.name,
+                    name=name,
                     total_memory_gb=round(total_mem, 2),
                     free_memory_gb=round(free_mem, 2),
                     used_memory_gb=round(used_mem, 2),
@@ -111,7 +169,7 @@ class HardwareDetector:
                 total_vram += total_mem
                 free_vram += free_mem
 
-            self._hardware_info = HardwareInfo(
+            return HardwareInfo(
                 cuda_available=True,
                 cuda_version=cuda_version,
                 gpu_count=gpu_count,
@@ -122,7 +180,7 @@ class HardwareDetector:
 
         except ImportError:
             logger.warning("PyTorch not installed, cannot detect GPU")
-            self._hardware_info = HardwareInfo(
+            return HardwareInfo(
                 cuda_available=False,
                 cuda_version=None,
                 gpu_count=0,
@@ -131,11 +189,13 @@ class HardwareDetector:
                 free_vram_gb=0.0,
             )
 
-        return self._hardware_info
-
     def reset(self) -> None:
         """Reset cached hardware info (useful for testing)."""
         self._hardware_info = None
+        _cuda_available.cache_clear()
+        _cuda_version.cache_clear()
+        with _device_props_lock:
+            _device_props.clear()
 
     def get_device_map(self, model_size: str) -> str:
         """
@@ -152,8 +212,7 @@ class HardwareDetector:
         if not info.cuda_available:
             return "cpu"
 
-        vram_required = {"2B": 4.0, "4B": 8.0, "8B": 16.0}
-        required = vram_required.get(model_size, 8.0)
+        required = _VRAM_REQUIRED_GB.get(model_size, 8.0)
 
         if info.free_vram_gb >= required:
             return "auto"
@@ -171,30 +230,38 @@ class HardwareDetector:
         """Print a summary of detected hardware."""
         info = self.detect()
 
-        print("=" * 60)
-        print("HARDWARE SUMMARY")
-        print("=" * 60)
-        print(f"  CUDA Available: {info.cuda_available}")
+        # Built up front and written in one call
+        lines = [
+            "=" * 60,
+            "HARDWARE SUMMARY",
+            "=" * 60,
+            f"  CUDA Available: {info.cuda_available}",
+        ]
 
         if info.cuda_available:
-            print(f"  CUDA Version: {info.cuda_version}")
-            print(f"  GPU Count: {info.gpu_count}")
-            print(f"  Total VRAM: {info.total_vram_gb} GB")
-            print(f"  Free VRAM: {info.free_vram_gb} GB")
-            print()
+            lines += [
+                f"  CUDA Version: {info.cuda_version}",
+                f"  GPU Count: {info.gpu_count}",
+                f"  Total VRAM: {info.total_vram_gb} GB",
+                f"  Free VRAM: {info.free_vram_gb} GB",
+                "",
+            ]
 
             for gpu in info.gpus:
-                print(f"  GPU {gpu.index}: {gpu.name}")
-                print(f"    Total: {gpu.total_memory_gb} GB")
-                print(f"    Free: {gpu.free_memory_gb} GB")
-                print(f"    Used: {gpu.used_memory_gb} GB ({gpu.utilization_percent:.1f}%)")
-                print()
-
-            print(f"  Recommended Model: {info.get_recommended_model()}")
+                lines += [
+                    f"  GPU {gpu.index}: {gpu.name}",
+                    f"    Total: {gpu.total_memory_gb} GB",
+                    f"    Free: {gpu.free_memory_gb} GB",
+                    f"    Used: {gpu.used_memory_gb} GB ({gpu.utilization_percent:.1f}%)",
+                    "",
+                ]
+
+            lines.append(f"  Recommended Model: {info.get_recommended_model()}")
         else:
-            print("  No CUDA-capable GPU detected")
+            lines.append("  No CUDA-capable GPU detected")
 
-        print("=" * 60)
+        lines.append("=" * 60)
+        print("\n".join(lines))
 
 
 # Global instance
@@ -205,7 +272,9 @@ def get_hardware_detector() -> HardwareDetector:
     """Get the global hardware detector instance."""
     global _detector
     if _detector is None:
-        _detector = HardwareDetector()
+        with _lock:
+            if _detector is None:
+                _detector = HardwareDetector()
     return _detector
 
 
@@ -1,16 +1,19 @@
 """Model loading with singleton pattern and quantization support."""
 
+import importlib
 import logging
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Optional, Tuple
 
 from ..config import Config, get_config
-from .hardware_detection import get_hardware_detector
+from .hardware_detection import _cuda_available, get_hardware_detector
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadedModel:
     """Container for loaded model and processor."""
 
@@ -20,6 +23,65 @@ class LoadedModel:
     device: str
 
 
+# (torch, model class, BitsAndBytesConfig, AutoProcessor), resolved on the
+# first load so importing this module stays cheap and reloads skip the lookup
+_impls: Optional[Tuple[Any, Any, Any, Any]] = None
+_impls_lock = threading.Lock()
+
+
+def _resolve_impls() -> Tuple[Any, Any, Any, Any]:
+    """Import torch and the transformers classes used for loading, once."""
+    global _impls
+    if _impls is None:
+        with _impls_lock:
+            if _impls is None:
+                torch = importlib.import_module("torch")
+                transformers = importlib.import_module("transformers")
+
+                # Try to use the Qwen model class
+                try:
+                    model_cls = transformers.Qwen2_5_VLForConditionalGeneration
+                except (AttributeError, ImportError):
+                    model_cls = transformers.AutoModelForCausalLM
+                    logger.warning("Using AutoModelForCausalLM as fallback")
+
+                _impls = (
+                    torch,
+                    model_cls,
+                    transformers.BitsAndBytesConfig,
+                    transformers.AutoProcessor,
+                )
+    return _impls
+
+
+@lru_cache(maxsize=4)
+def _bnb_config(quantization: str, compute_dtype: str) -> Optional[Any]:
+    """
+    Get the bitsandbytes config for a quantization mode, built once.
+
+    Args:
+        quantization: Quantization mode (none, 4bit, 8bit)
+        compute_dtype: torch dtype name for 4-bit compute
+
+    Returns:
+        BitsAndBytesConfig, or None when not quantizing
+    """
+    torch, _, BitsAndBytesConfig, _ = _resolve_impls()
+
+    if quantization == "4bit":
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=getattr(torch, compute_dtype),
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_use_double_quant=True,
+        )
+    if quantization == "8bit":
+        return BitsAndBytesConfig(
+            load_in_8bit=True,
+        )
+    return None
+
+
 class ModelLoader:
     """Singleton model loader with caching."""
 
@@ -93,32 +155,13 @@ class ModelLoader:
         Returns:
             Tuple of (model, processor)
         """
-        # Import here to avoid slow startup when not loading model
-        import torch
-        from transformers import AutoProcessor, BitsAndBytesConfig
-
-        # Try to import Qwen model class
-        try:
-            from transformers import Qwen2_5_VLForConditionalGeneration as QwenModel
-        except ImportError:
-            from transformers import AutoModelForCausalLM as QwenModel
-            logger.warning("Using AutoModelForCausalLM as fallback")
+        # Imported on first load to avoid slow startup when not loading model
+        torch, QwenModel, _, AutoProcessor = _resolve_impls()
 
         model_id = config.model.model_id
 
         # Configure quantization
-        quantization_config = None
-        if config.model.quantization == "4bit":
-            quantization_config = BitsAndBytesConfig(
-                load_in_4bit=True,
-                bnb_4bit_compute_dtype=torch.float16,
-                bnb_4bit_quant_type="nf4",
-                bnb_4bit_use_double_quant=True,
-            )
-        elif config.model.quantization == "8bit":
-            quantization_config = BitsAndBytesConfig(
-                load_in_8bit=True,
-            )
+        quantization_config = _bnb_config(config.model.quantization, "float16")
 
         # Load processor
         logger.info("Loading processor...")
@@ -160,9 +203,9 @@ class ModelLoader:
 
             # Clear CUDA cache if available
             try:
-                import torch
+                if _cuda_available():
+                    import torch
 
-                if torch.cuda.is_available():
                     torch.cuda.empty_cache()
             except ImportError:
                 pass
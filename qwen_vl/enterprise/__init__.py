@@ -1,20 +1,43 @@
 """Enterprise features module."""
 
-# Lazy imports
+import importlib
+
+_LAZY = {
+    # Multitenancy
+    "TenantManager": (".multitenancy", "TenantManager"),
+    "get_tenant_manager": (".multitenancy", "get_tenant_manager"),
+    "Tenant": (".multitenancy", "Tenant"),
+    "TenantTier": (".multitenancy", "TenantTier"),
+    "ResourceQuota": (".multitenancy", "ResourceQuota"),
+    # Monitoring
+    "MetricsCollector": (".monitoring", "MetricsCollector"),
+    "get_metrics_collector": (".monitoring", "get_metrics_collector"),
+    "RequestTimer": (".monitoring", "RequestTimer"),
+    # Audit
+    "AuditLogger": (".audit", "AuditLogger"),
+    "get_audit_logger": (".audit", "get_audit_logger"),
+    "AuditAction": (".audit", "AuditAction"),
+    "AuditEntry": (".audit", "AuditEntry"),
+    # Auth
+    "AuthManager": (".auth", "AuthManager"),
+    "get_auth_manager": (".auth", "get_auth_manager"),
+    "Role": (".auth", "Role"),
+    "Permission": (".auth", "Permission"),
+    "APIKey": (".auth", "APIKey"),
+    "User": (".auth", "User"),
+}
+
+
 def __getattr__(name):
-    if name in ("TenantManager", "get_tenant_manager", "Tenant", "TenantTier", "ResourceQuota"):
-        from .multitenancy import TenantManager, get_tenant_manager, Tenant, TenantTier, ResourceQuota
-        return locals()[name]
-    elif name in ("MetricsCollector", "get_metrics_collector", "RequestTimer"):
-        from .monitoring import MetricsCollector, get_metrics_collector, RequestTimer
-        return locals()[name]
-    elif name in ("AuditLogger", "get_audit_logger", "AuditAction", "AuditEntry"):
-        from .audit import AuditLogger, get_audit_logger, AuditAction, AuditEntry
-        return locals()[name]
-    elif name in ("AuthManager", "get_auth_manager", "Role", "Permission", "APIKey", "User"):
-        from .auth import AuthManager, get_auth_manager, Role, Permission, APIKey, User
-        return locals()[name]
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    """Lazy import for enterprise modules."""
+    spec = _LAZY.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(spec[0], __name__)
+    value = getattr(module, spec[1])
+    globals()[name] = value
+    return value
 
 
 __all__ = [
@@ -1,11 +1,22 @@
 """Audit logging for compliance and tracking."""
 
-import json
-import uuid
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
+import copy
+import csv
+import io
+import itertools
+import os
+import socket
+import threading
+import time
+from array import array
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from ..utils.serialization import dumps
 
 
 class AuditAction(str, Enum):
@@ -34,11 +45,47 @@ class AuditAction(str, Enum):
     TENANT_UPDATED = "admin.tenant_updated"
 
 
-@dataclass
+# Dense per-action indexes, so reports can count into a flat array
+_ACTION_INDEX: Dict[AuditAction, int] = {action: i for i, action in enumerate(AuditAction)}
+_ACTION_VALUES: Tuple[str, ...] = tuple(action.value for action in AuditAction)
+
+
+# Audit times are timezone-aware UTC, so isoformat() carries the offset
+_UTC = timezone.utc
+_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+
+# Shared, read-only details of entries logged without any
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Entry IDs are a per-process prefix plus a counter, which is unique without
+# drawing random bytes on every log call
+_id_prefix = f"{socket.gethostname()}-{os.getpid()}"
+_id_counter = itertools.count(1)
+
+
+def _reset_entry_ids() -> None:
+    """Give a forked child its own ID sequence."""
+    global _id_prefix, _id_counter
+    _id_prefix = f"{socket.gethostname()}-{os.getpid()}"
+    _id_counter = itertools.count(1)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_entry_ids)
+
+
+def _to_ns(value: datetime) -> int:
+    """Convert a datetime to nanoseconds since the epoch; naive means UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=_UTC)
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+@dataclass(frozen=True, slots=True)
 class AuditEntry:
-    """Single audit log entry."""
+    """Single audit log entry (immutable once logged)."""
     entry_id: str
-    timestamp: datetime
+    timestamp_ns: int  # Nanoseconds since the Unix epoch
     action: AuditAction
     tenant_id: Optional[str]
     user_id: Optional[str]
@@ -46,20 +93,58 @@ class AuditEntry:
     resource_id: Optional[str]
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
-    details: Dict[str, Any] = field(default_factory=dict)
+    details: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
     success: bool = True
     error_message: Optional[str] = None
+    # Serialized form, built on first to_dict() and reused by later exports
+    _dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # action.value bound once; enum member value access is comparatively slow
+    _action_value: str = field(default="", init=False, repr=False, compare=False)
+    _action_index: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_action_value", self.action.value)
+        object.__setattr__(self, "_action_index", _ACTION_INDEX[self.action])
+
+    @property
+    def timestamp(self) -> datetime:
+        """When the action was logged, in UTC."""
+        return _EPOCH + timedelta(microseconds=self.timestamp_ns // 1000)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        data = asdict(self)
-        data["timestamp"] = self.timestamp.isoformat()
-        data["action"] = self.action.value
-        return data
+        data = self._dict
+        if data is None:
+            data = {
+                "entry_id": self.entry_id,
+                "timestamp": self.timestamp.isoformat(),
+                "action": self._action_value,
+                "tenant_id": self.tenant_id,
+                "user_id": self.user_id,
+                "resource_type": self.resource_type,
+                "resource_id": self.resource_id,
+                "ip_address": self.ip_address,
+                "user_agent": self.user_agent,
+                "details": self.details,
+                "success": self.success,
+                "error_message": self.error_message,
+            }
+            object.__setattr__(self, "_dict", data)
+        # Callers get their own copy, details included, so the entry stays intact
+        result = dict(data)
+        result["details"] = copy.deepcopy(dict(self.details)) if self.details else {}
+        return result
 
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return json.dumps(self.to_dict())
+        return dumps(self.to_dict(), ensure_ascii=False)
+
+
+_CSV_COLUMNS = (
+    "timestamp", "action", "tenant_id", "user_id", "resource_type", "resource_id", "success",
+)
 
 
 class AuditLogger:
@@ -72,9 +157,17 @@ class AuditLogger:
         Args:
             max_entries: Maximum entries to keep in memory
         """
-        self._entries: List[AuditEntry] = []
+        # Oldest entries drop off once full
+        self._entries: Deque[AuditEntry] = deque(maxlen=max_entries)
+        # Retained entries per tenant and per action, oldest first
+        self._by_tenant: Dict[str, Deque[AuditEntry]] = defaultdict(deque)
+        self._by_action: Dict[AuditAction, Deque[AuditEntry]] = defaultdict(deque)
         self._max_entries = max_entries
-        self._handlers: List[callable] = []
+        # Guards the stored entries; deques cannot be iterated while appended to
+        self._lock = threading.Lock()
+        # Replaced, never mutated, so log() can iterate without a lock
+        self._handlers: Tuple[Callable[[AuditEntry], None], ...] = ()
+        self._handlers_lock = threading.Lock()
 
     def log(
         self,
@@ -108,8 +201,8 @@ class AuditLogger:
             Created audit entry
         """
         entry = AuditEntry(
-            entry_id=str(uuid.uuid4()),
-            timestamp=datetime.utcnow(),
+            entry_id=f"{_id_prefix}-{next(_id_counter)}",
+            timestamp_ns=time.time_ns(),
             action=action,
             tenant_id=tenant_id,
             user_id=user_id,
@@ -117,16 +210,19 @@ class AuditLogger:
             resource_id=resource_id,
             ip_address=ip_address,
             user_agent=user_agent,
-            details=details or {},
+            details=details if details else _EMPTY,
             success=success,
             error_message=error_message,
         )
 
-        self._entries.append(entry)
-
-        # Trim if over limit
-        if len(self._entries) > self._max_entries:
-            self._entries = self._entries[-self._max_entries:]
+        # The indexes change with the entries, so they never diverge
+        with self._lock:
+            if len(self._entries) == self._entries.maxlen:
+                self._unindex(self._entries[0])
+            self._entries.append(entry)
+            if tenant_id:
+                self._by_tenant[tenant_id].append(entry)
+            self._by_action[action].append(entry)
 
         # Notify handlers
         for handler in self._handlers:
@@ -137,9 +233,20 @@ class AuditLogger:
 
         return entry
 
-    def add_handler(self, handler: callable) -> None:
+    def _unindex(self, entry: AuditEntry) -> None:
+        """Drop the oldest entry, about to be evicted, from the indexes (lock held)."""
+        # Eviction is oldest-first, so it is also the oldest in each index
+        if entry.tenant_id:
+            tenant_entries = self._by_tenant[entry.tenant_id]
+            tenant_entries.popleft()
+            if not tenant_entries:
+                del self._by_tenant[entry.tenant_id]
+        self._by_action[entry.action].popleft()
+
+    def add_handler(self, handler: Callable[[AuditEntry], None]) -> None:
         """Add a handler to be called for each audit entry."""
-        self._handlers.append(handler)
+        with self._handlers_lock:
+            self._handlers = self._handlers + (handler,)
 
     def query(
         self,
@@ -168,9 +275,23 @@ class AuditLogger:
         Returns:
             List of matching entries
         """
+        # Scan the smallest index that covers the filters
+        with self._lock:
+            candidates = self._entries
+            if tenant_id:
+                candidates = self._by_tenant.get(tenant_id, ())
+            if action:
+                action_entries = self._by_action.get(action, ())
+                if len(action_entries) < len(candidates):
+                    candidates = action_entries
+            candidates = list(candidates)
+
+        start_ns = _to_ns(start_time) if start_time else None
+        end_ns = _to_ns(end_time) if end_time else None
+
         results = []
 
-        for entry in reversed(self._entries):
+        for entry in reversed(candidates):
             if tenant_id and entry.tenant_id != tenant_id:
                 continue
             if user_id and entry.user_id != user_id:
@@ -179,9 +300,9 @@ class AuditLogger:
                 continue
             if resource_type and entry.resource_type != resource_type:
                 continue
-            if start_time and entry.timestamp < start_time:
+            if start_ns is not None and entry.timestamp_ns < start_ns:
                 continue
-            if end_time and entry.timestamp > end_time:
+            if end_ns is not None and entry.timestamp_ns > end_ns:
                 continue
             if success_only and not entry.success:
                 continue
@@ -217,16 +338,16 @@ class AuditLogger:
             limit=10000,
         )
 
-        # Aggregate by action
-        action_counts: Dict[str, int] = {}
+        # Aggregate by action, users and failures in one pass
+        action_counts = array("Q", bytes(8 * len(_ACTION_VALUES)))
+        users = set()
+        failures = 0
         for entry in entries:
-            action_counts[entry.action.value] = action_counts.get(entry.action.value, 0) + 1
-
-        # Count users
-        users = set(e.user_id for e in entries if e.user_id)
-
-        # Count failures
-        failures = sum(1 for e in entries if not e.success)
+            action_counts[entry._action_index] += 1
+            if entry.user_id:
+                users.add(entry.user_id)
+            if not entry.success:
+                failures += 1
 
         return {
             "tenant_id": tenant_id,
@@ -237,8 +358,10 @@ class AuditLogger:
             "total_events": len(entries),
             "unique_users": len(users),
             "failed_actions": failures,
-            "action_breakdown": action_counts,
-            "generated_at": datetime.utcnow().isoformat(),
+            "action_breakdown": {
+                _ACTION_VALUES[i]: count for i, count in enumerate(action_counts) if count
+            },
+            "generated_at": datetime.now(_UTC).isoformat(),
         }
 
     def export_entries(
@@ -256,30 +379,66 @@ class AuditLogger:
         Returns:
             Exported data string
         """
-        entries = entries or self._entries
+        entries = entries or self._snapshot()
 
         if format == "json":
-            return json.dumps([e.to_dict() for e in entries], indent=2)
+            return dumps([e.to_dict() for e in entries], indent=True, ensure_ascii=False)
 
         elif format == "csv":
-            if not entries:
-                return ""
-
-            lines = ["timestamp,action,tenant_id,user_id,resource_type,resource_id,success"]
-            for entry in entries:
-                lines.append(
-                    f"{entry.timestamp.isoformat()},{entry.action.value},"
-                    f"{entry.tenant_id or ''},{entry.user_id or ''},"
-                    f"{entry.resource_type or ''},{entry.resource_id or ''},"
-                    f"{entry.success}"
-                )
-            return "\n".join(lines)
+            return "".join(self.export_entries_stream(entries))
 
         raise ValueError(f"Unknown format: {format}")
 
+    def export_entries_stream(
+        self,
+        entries: Optional[Iterable[AuditEntry]] = None,
+    ) -> Iterator[str]:
+        """
+        Export audit entries as CSV, one chunk per entry.
+
+        Suitable for streaming responses; nothing is yielded without entries.
+
+        Args:
+            entries: Entries to export (default: all)
+
+        Yields:
+            CSV text; the first chunk starts with the header
+        """
+        if entries is None:
+            entries = self._snapshot()
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        header_written = False
+
+        for entry in entries:
+            if not header_written:
+                writer.writerow(_CSV_COLUMNS)
+                header_written = True
+            writer.writerow((
+                entry.timestamp.isoformat(),
+                entry._action_value,
+                entry.tenant_id,
+                entry.user_id,
+                entry.resource_type,
+                entry.resource_id,
+                entry.success,
+            ))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
     def clear(self) -> None:
         """Clear all audit entries."""
-        self._entries.clear()
+        with self._lock:
+            self._entries.clear()
+            self._by_tenant.clear()
+            self._by_action.clear()
+
+    def _snapshot(self) -> List[AuditEntry]:
+        """Copy the retained entries, oldest first."""
+        with self._lock:
+            return list(self._entries)
 
 
 # Global audit logger
@@ -1,12 +1,31 @@
 """Authentication and authorization for document processing service."""
 
 import hashlib
+import hmac
 import secrets
+import time
 import uuid
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHash, VerificationError
+
+    _password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=2)
+except ImportError:
+    _password_hasher = None
+
+# scrypt cost parameters, used when argon2-cffi is not installed
+_SCRYPT_N = 2**14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+
+# Hash of a random password, checked for unknown emails; built on first use
+_dummy_password_hash: Optional[str] = None
 
 
 class Role(str, Enum):
@@ -81,6 +100,14 @@ class APIKey:
     rate_limit_per_minute: int = 60
 
 
+# Bumped whenever any user's role or permissions change, so cached
+# authorization decisions can tell they are stale
+_permissions_generation = 0
+
+# Cached (user, permission) decisions per AuthManager
+_PERMISSION_CACHE_SIZE = 4096
+
+
 @dataclass
 class User:
     """User entity."""
@@ -91,23 +118,35 @@ class User:
     role: Role = Role.USER
     created_at: datetime = field(default_factory=datetime.utcnow)
     is_active: bool = True
-    permissions: Set[Permission] = field(default_factory=set)
+    # Stored as a frozenset; assign a new set to change explicit permissions
+    permissions: FrozenSet[Permission] = field(default_factory=frozenset)
+    # Union of explicit and role permissions, reset when either is reassigned
+    _effective: Optional[FrozenSet[Permission]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "permissions":
+            # Immutable, so in-place changes cannot bypass cache invalidation
+            value = frozenset(value)
+        # Only reassignments; the first assignment in __init__ changes nothing
+        if name in ("role", "permissions") and name in self.__dict__:
+            global _permissions_generation
+            _permissions_generation += 1
+            object.__setattr__(self, "_effective", None)
+        object.__setattr__(self, name, value)
+
+    def effective_permissions(self) -> FrozenSet[Permission]:
+        """Get all permissions granted explicitly or by role."""
+        effective = self._effective
+        if effective is None:
+            effective = self.permissions | ROLE_PERMISSIONS.get(self.role, frozenset())
+            object.__setattr__(self, "_effective", effective)
+        return effective
 
     def has_permission(self, permission: Permission) -> bool:
         """Check if user has a permission."""
-        # Check explicit permissions
-        if permission in self.permissions:
-            return True
-        # Check role permissions
-        return permission in ROLE_PERMISSIONS.get(self.role, set())
-
-
-@dataclass
-class RateLimitInfo:
-    """Rate limit tracking info."""
-    key: str
-    window_start: datetime
-    request_count: int
+        return permission in self.effective_permissions()
 
 
 class AuthManager:
@@ -116,8 +155,15 @@ class AuthManager:
     def __init__(self):
         """Initialize auth manager."""
         self._api_keys: Dict[str, APIKey] = {}
+        # Secondary indexes for the authentication lookups
+        self._keys_by_hash: Dict[str, APIKey] = {}
         self._users: Dict[str, User] = {}
-        self._rate_limits: Dict[str, RateLimitInfo] = {}
+        self._users_by_email: Dict[str, List[User]] = {}
+        # (user ID, permission) -> allowed, least recently used first
+        self._perm_cache: "OrderedDict[Tuple[str, Permission], bool]" = OrderedDict()
+        self._perm_cache_gen = _permissions_generation
+        # Monotonic times of admitted requests per key, oldest first
+        self._rl_windows: Dict[str, Deque[float]] = {}
 
     # API Key Management
 
@@ -165,6 +211,7 @@ class AuthManager:
         )
 
         self._api_keys[key_id] = api_key
+        self._keys_by_hash[key_hash] = api_key
 
         return raw_key, api_key
 
@@ -179,23 +226,24 @@ class AuthManager:
             APIKey if valid, None otherwise
         """
         key_hash = self._hash_key(raw_key)
+        api_key = self._keys_by_hash.get(key_hash)
+        # Secret comparisons are constant-time
+        if api_key is None or not hmac.compare_digest(api_key.key_hash, key_hash):
+            return None
 
-        for api_key in self._api_keys.values():
-            if api_key.key_hash == key_hash:
-                # Check active
-                if not api_key.is_active:
-                    return None
-
-                # Check expiration
-                if api_key.expires_at and datetime.utcnow() > api_key.expires_at:
-                    return None
+        # Check active
+        if not api_key.is_active:
+            return None
 
-                # Update last used
-                api_key.last_used = datetime.utcnow()
+        # Check expiration
+        now = datetime.utcnow()
+        if api_key.expires_at and now > api_key.expires_at:
+            return None
 
-                return api_key
+        # Update last used
+        api_key.last_used = now
 
-        return None
+        return api_key
 
     def revoke_api_key(self, key_id: str) -> bool:
         """Revoke an API key."""
@@ -241,6 +289,7 @@ class AuthManager:
         )
 
         self._users[user_id] = user
+        self._users_by_email.setdefault(email, []).append(user)
         return user
 
     def authenticate_user(
@@ -258,10 +307,14 @@ class AuthManager:
         Returns:
             User if authenticated, None otherwise
         """
-        password_hash = self._hash_password(password)
-
-        for user in self._users.values():
-            if user.email == email and user.password_hash == password_hash:
+        users = self._users_by_email.get(email)
+        if not users:
+            # Still run the KDF once, so unknown emails take as long as wrong passwords
+            self._verify_password(self._dummy_password_hash(), password)
+            return None
+
+        for user in users:
+            if self._verify_password(user.password_hash, password):
                 if not user.is_active:
                     return None
                 return user
@@ -287,10 +340,25 @@ class AuthManager:
         Returns:
             True if permitted
         """
+        if self._perm_cache_gen != _permissions_generation:
+            self._perm_cache.clear()
+            self._perm_cache_gen = _permissions_generation
+
+        key = (user_id, permission)
+        allowed = self._perm_cache.get(key)
+        if allowed is not None:
+            self._perm_cache.move_to_end(key)
+            return allowed
+
         user = self.get_user(user_id)
         if not user:
             return False
-        return user.has_permission(permission)
+
+        allowed = permission in user.effective_permissions()
+        self._perm_cache[key] = allowed
+        if len(self._perm_cache) > _PERMISSION_CACHE_SIZE:
+            self._perm_cache.popitem(last=False)
+        return allowed
 
     # Rate Limiting
 
@@ -311,39 +379,28 @@ class AuthManager:
         Returns:
             Dict with allowed, remaining, reset_at
         """
-        now = datetime.utcnow()
+        # Sliding window: only requests admitted in the last window_seconds count
+        now = time.monotonic()
+        window = self._rl_windows.get(key)
+        if window is None:
+            window = self._rl_windows[key] = deque()
 
-        if key not in self._rate_limits:
-            self._rate_limits[key] = RateLimitInfo(
-                key=key,
-                window_start=now,
-                request_count=0,
-            )
-
-        info = self._rate_limits[key]
+        cutoff = now - window_seconds
+        while window and window[0] <= cutoff:
+            window.popleft()
 
-        # Check if window expired
-        window_end = info.window_start + timedelta(seconds=window_seconds)
-        if now > window_end:
-            info.window_start = now
-            info.request_count = 0
+        allowed = len(window) < limit
+        if allowed:
+            window.append(now)
 
-        # Check limit
-        if info.request_count >= limit:
-            reset_at = info.window_start + timedelta(seconds=window_seconds)
-            return {
-                "allowed": False,
-                "remaining": 0,
-                "reset_at": reset_at.isoformat(),
-            }
-
-        # Increment
-        info.request_count += 1
+        # Capacity frees up when the oldest counted request leaves the window
+        reset_in = window[0] + window_seconds - now if window else window_seconds
+        reset_at = datetime.utcnow() + timedelta(seconds=reset_in)
 
         return {
-            "allowed": True,
-            "remaining": limit - info.request_count,
-            "reset_at": (info.window_start + timedelta(seconds=window_seconds)).isoformat(),
+            "allowed": allowed,
+            "remaining": max(limit - len(window), 0),
+            "reset_at": reset_at.isoformat(),
         }
 
     # Helper methods
@@ -353,9 +410,41 @@ class AuthManager:
         return hashlib.sha256(key.encode()).hexdigest()
 
     def _hash_password(self, password: str) -> str:
-        """Hash a password."""
-        # In production, use bcrypt or argon2
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash a password with a salted, memory-hard KDF (argon2id or scrypt)."""
+        if _password_hasher is not None:
+            return _password_hasher.hash(password)
+
+        salt = secrets.token_bytes(16)
+        digest = hashlib.scrypt(
+            password.encode(), salt=salt, n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P
+        )
+        return f"scrypt${_SCRYPT_N}${_SCRYPT_R}${_SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+    def _dummy_password_hash(self) -> str:
+        """Get the hash verified against when no user has the email."""
+        global _dummy_password_hash
+        if _dummy_password_hash is None:
+            _dummy_password_hash = self._hash_password(secrets.token_urlsafe(16))
+        return _dummy_password_hash
+
+    def _verify_password(self, password_hash: str, password: str) -> bool:
+        """Check a password against a hash from _hash_password."""
+        if password_hash.startswith("$argon2"):
+            if _password_hasher is None:
+                return False
+            try:
+                return _password_hasher.verify(password_hash, password)
+            except (InvalidHash, VerificationError):
+                return False
+
+        if password_hash.startswith("scrypt$"):
+            _, n, r, p, salt, expected = password_hash.split("$")
+            digest = hashlib.scrypt(
+                password.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p)
+            )
+            return hmac.compare_digest(digest.hex(), expected)
+
+        return False
 
 
 # Global auth manager
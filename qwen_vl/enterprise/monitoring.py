@@ -1,12 +1,14 @@
 """Monitoring and metrics for document processing service."""
 
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Optional
 from threading import Lock
 
+import numpy as np
+
 
 @dataclass
 class MetricPoint:
@@ -16,6 +18,13 @@ class MetricPoint:
     labels: Dict[str, str] = field(default_factory=dict)
 
 
+# Observations kept per histogram
+_HISTOGRAM_WINDOW = 1000
+
+# Number of lock stripes; a power of two so the shard is a bit mask
+_LOCK_STRIPES = 64
+
+
 class MetricsCollector:
     """Collect and expose metrics for monitoring."""
 
@@ -23,8 +32,15 @@ class MetricsCollector:
         """Initialize metrics collector."""
         self._counters: Dict[str, float] = defaultdict(float)
         self._gauges: Dict[str, float] = {}
-        self._histograms: Dict[str, List[float]] = defaultdict(list)
-        self._lock = Lock()
+        # Most recent observations per histogram; older ones drop off
+        self._histograms: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=_HISTOGRAM_WINDOW)
+        )
+        # Running totals over every observation, for cheap scrapes
+        self._hist_count: Dict[str, int] = defaultdict(int)
+        self._hist_sum: Dict[str, float] = defaultdict(float)
+        # Striped locks: updates to different metrics rarely contend
+        self._locks = [Lock() for _ in range(_LOCK_STRIPES)]
 
     # Counters (monotonically increasing)
 
@@ -43,7 +59,7 @@ class MetricsCollector:
             labels: Optional labels
         """
         key = self._make_key(name, labels)
-        with self._lock:
+        with self._shard(key):
             self._counters[key] += value
 
     def get_counter(
@@ -72,7 +88,7 @@ class MetricsCollector:
             labels: Optional labels
         """
         key = self._make_key(name, labels)
-        with self._lock:
+        with self._shard(key):
             self._gauges[key] = value
 
     def get_gauge(
@@ -101,11 +117,10 @@ class MetricsCollector:
             labels: Optional labels
         """
         key = self._make_key(name, labels)
-        with self._lock:
+        with self._shard(key):
             self._histograms[key].append(value)
-            # Keep last 1000 observations
-            if len(self._histograms[key]) > 1000:
-                self._histograms[key] = self._histograms[key][-1000:]
+            self._hist_count[key] += 1
+            self._hist_sum[key] += value
 
     def get_histogram_stats(
         self,
@@ -119,7 +134,9 @@ class MetricsCollector:
             Dict with count, sum, avg, min, max, p50, p95, p99
         """
         key = self._make_key(name, labels)
-        values = self._histograms.get(key, [])
+        # Snapshot under the lock; a deque cannot be read while it is appended to
+        with self._shard(key):
+            values = tuple(self._histograms.get(key, ()))
 
         if not values:
             return {
@@ -133,20 +150,29 @@ class MetricsCollector:
                 "p99": 0,
             }
 
-        sorted_values = sorted(values)
         count = len(values)
+        arr = np.fromiter(values, dtype=np.float64, count=count)
+        total = float(arr.sum())
+
+        # Nearest-rank percentiles; one partial sort instead of a full sort
+        ranks = [int(count * 0.50), int(count * 0.95), int(count * 0.99)]
+        p50, p95, p99 = np.partition(arr, ranks)[ranks].tolist()
 
         return {
             "count": count,
-            "sum": sum(values),
-            "avg": sum(values) / count,
-            "min": min(values),
-            "max": max(values),
-            "p50": sorted_values[int(count * 0.50)],
-            "p95": sorted_values[int(count * 0.95)] if count > 1 else sorted_values[0],
-            "p99": sorted_values[int(count * 0.99)] if count > 1 else sorted_values[0],
+            "sum": total,
+            "avg": total / count,
+            "min": float(arr.min()),
+            "max": float(arr.max()),
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
         }
 
+    def _shard(self, key: str) -> Lock:
+        """Get the lock guarding a metric key."""
+        return self._locks[hash(key) & (_LOCK_STRIPES - 1)]
+
     def _make_key(
         self,
         name: str,
@@ -181,13 +207,15 @@ class MetricsCollector:
             lines.append(f"# TYPE {name} gauge")
             lines.append(f"{key} {value}")
 
-        # Histograms
-        for key, values in self._histograms.items():
+        # Histograms; Prometheus counts every observation, not just the window
+        for key in list(self._hist_count):
+            with self._shard(key):
+                count = self._hist_count[key]
+                total = self._hist_sum[key]
             name = key.split("{")[0]
-            if values:
-                lines.append(f"# TYPE {name} histogram")
-                lines.append(f"{name}_count{key[len(name):]} {len(values)}")
-                lines.append(f"{name}_sum{key[len(name):]} {sum(values)}")
+            lines.append(f"# TYPE {name} histogram")
+            lines.append(f"{name}_count{key[len(name):]} {count}")
+            lines.append(f"{name}_sum{key[len(name):]} {total}")
 
         return "\n".join(lines)
 
@@ -209,10 +237,17 @@ class MetricsCollector:
 
     def reset(self) -> None:
         """Reset all metrics."""
-        with self._lock:
+        for lock in self._locks:
+            lock.acquire()
+        try:
             self._counters.clear()
             self._gauges.clear()
             self._histograms.clear()
+            self._hist_count.clear()
+            self._hist_sum.clear()
+        finally:
+            for lock in self._locks:
+                lock.release()
 
 
 class RequestTimer:
@@ -1,9 +1,11 @@
 """Base task handler abstract class."""
 
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from PIL import Image
 
@@ -33,6 +35,31 @@ class TaskResult:
     metadata: Optional[Dict[str, Any]] = None
 
 
+# Preprocessed vision inputs keyed by image digest. Shared by all handlers
+# so running several tasks on one upload only preprocesses it once.
+_VISION_CACHE_SIZE = 32
+_vision_cache: "OrderedDict[Tuple[str, ...], Tuple[Any, Any]]" = OrderedDict()
+_vision_cache_lock = threading.Lock()
+
+
+def _image_digests(messages: List[Dict[str, Any]]) -> Optional[Tuple[str, ...]]:
+    """Get the content digests of all images in messages, if every image has one."""
+    digests = []
+    for message in messages:
+        content = message["content"]
+        if not isinstance(content, list):
+            continue
+        for part in content:
+            if part.get("type") != "image":
+                continue
+            image = part.get("image")
+            digest = getattr(image, "info", {}).get("digest")
+            if digest is None:
+                return None
+            digests.append(digest)
+    return tuple(digests) or None
+
+
 class BaseTaskHandler(ABC):
     """Abstract base class for all task handlers."""
 
@@ -79,6 +106,28 @@ class BaseTaskHandler(ABC):
         """
         pass
 
+    def process_batch(
+        self,
+        images: List[Union[str, Image.Image]],
+        prompt: Optional[str] = None,
+        **kwargs,
+    ) -> List[TaskResult]:
+        """
+        Process several images with this task.
+
+        Handlers that can fuse inputs into a single forward pass should
+        override this; the default processes images one at a time.
+
+        Args:
+            images: Image paths or PIL Images
+            prompt: Optional user prompt applied to every image
+            **kwargs: Additional task-specific arguments
+
+        Returns:
+            List of TaskResults in the same order as images
+        """
+        return [self.process(image, prompt=prompt, **kwargs) for image in images]
+
     def _load_image(self, image: Union[str, Image.Image]) -> Image.Image:
         """Load image from path or return if already PIL Image."""
         if isinstance(image, str):
@@ -152,7 +201,7 @@ class BaseTaskHandler(ABC):
 
         # Process inputs using official pattern
         if use_vision_utils:
-            image_inputs, video_inputs = process_vision_info(messages)
+            image_inputs, video_inputs = self._vision_inputs(messages, process_vision_info)
             inputs = self.processor(
                 text=[text],
                 images=image_inputs,
@@ -189,6 +238,43 @@ class BaseTaskHandler(ABC):
 
         return response
 
+    def _vision_inputs(
+        self,
+        messages: List[Dict[str, Any]],
+        process_vision_info: Any,
+    ) -> Tuple[Any, Any]:
+        """
+        Run process_vision_info, reusing results for images seen before.
+
+        Only images carrying a "digest" entry in their info dict (set when
+        uploads are decoded) are cached.
+
+        Args:
+            messages: Chat messages
+            process_vision_info: qwen_vl_utils preprocessing function
+
+        Returns:
+            Tuple of (image_inputs, video_inputs)
+        """
+        key = _image_digests(messages)
+        if key is None:
+            return process_vision_info(messages)
+
+        with _vision_cache_lock:
+            cached = _vision_cache.get(key)
+            if cached is not None:
+                _vision_cache.move_to_end(key)
+                return cached
+
+        inputs = process_vision_info(messages)
+
+        with _vision_cache_lock:
+            _vision_cache[key] = inputs
+            if len(_vision_cache) > _VISION_CACHE_SIZE:
+                _vision_cache.popitem(last=False)
+
+        return inputs
+
 
 # Task handler registry
 _handlers: Dict[TaskType, type] = {}
@@ -9,6 +9,13 @@ from ..utils.visualization import draw_bounding_boxes
 from .base import BaseTaskHandler, TaskResult, TaskType, register_handler
 
 
+def count_words(text: Optional[str]) -> int:
+    """Count whitespace-separated words."""
+    if not text:
+        return 0
+    return len(text.split())
+
+
 @register_handler(TaskType.OCR)
 class OCRHandler(BaseTaskHandler):
     """Handler for OCR (Optical Character Recognition) tasks."""
@@ -64,7 +71,7 @@ class OCRHandler(BaseTaskHandler):
 
         return TaskResult(
             text=response,
-            metadata={"mode": "text_only"},
+            metadata={"mode": "text_only", "word_count": count_words(response)},
         )
 
     def _process_with_boxes(
@@ -98,7 +105,11 @@ class OCRHandler(BaseTaskHandler):
             text=response,
             bounding_boxes=boxes,
             visualization=vis_image,
-            metadata={"mode": "with_boxes", "box_count": len(boxes)},
+            metadata={
+                "mode": "with_boxes",
+                "box_count": len(boxes),
+                "word_count": count_words(response),
+            },
         )
 
     def extract_lines(
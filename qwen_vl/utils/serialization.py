@@ -0,0 +1,72 @@
+"""JSON serialization, using orjson when it is installed."""
+
+import json
+import re
+from typing import Any
+
+try:
+    import orjson
+
+    # Datetimes go through default=str like json.dumps, not orjson's RFC 3339
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = False, ensure_ascii: bool = True) -> str:
+    """
+    Serialize to JSON text, as json.dumps(obj, default=str) would.
+
+    Args:
+        obj: Value to serialize
+        indent: Indent nested values by two spaces
+        ensure_ascii: Escape non-ASCII characters
+
+    Returns:
+        JSON string
+    """
+    if orjson is None:
+        return json.dumps(
+            obj, indent=2 if indent else None, ensure_ascii=ensure_ascii, default=str
+        )
+
+    text = _orjson_dumps(obj, indent).decode()
+    # orjson always writes UTF-8
+    if not ensure_ascii or text.isascii():
+        return text
+    return _NON_ASCII.sub(_escape_non_ascii, text)
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, as dumps() without ASCII escaping.
+
+    Args:
+        obj: Value to serialize
+        indent: Indent nested values by two spaces
+
+    Returns:
+        JSON bytes
+    """
+    if orjson is None:
+        return json.dumps(
+            obj, indent=2 if indent else None, ensure_ascii=False, default=str
+        ).encode()
+    return _orjson_dumps(obj, indent)
+
+
+def _orjson_dumps(obj: Any, indent: bool) -> bytes:
+    option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+    return orjson.dumps(obj, option=option, default=str)
+
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_non_ascii(match: "re.Match[str]") -> str:
+    """Escape a character as json.dumps does, with surrogate pairs above the BMP."""
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
@@ -39,6 +39,9 @@ def clean_env(monkeypatch):
         "GRADIO_SHARE",
         "MAX_FILE_SIZE_MB",
         "MAX_VIDEO_SIZE_MB",
+        "JOB_WORKER_CONCURRENCY",
+        "JOB_TTL_SECONDS",
+        "MAX_JOBS",
         "LOG_LEVEL",
         "LOG_FORMAT",
         "LOG_FILE_PATH",
@@ -95,6 +95,16 @@ class TestSchemaToPydantic:
         instance = Model()
         assert instance is not None
 
+    def test_same_schema_reuses_model(self):
+        """Test identical schemas return the cached model class."""
+        schema = {"fields": [{"name": "total", "type": "number", "required": True}]}
+        changed = {"fields": [{"name": "total", "type": "number", "required": False}]}
+
+        first = schema_to_pydantic("CachedModel", schema)
+
+        assert schema_to_pydantic("CachedModel", dict(schema)) is first
+        assert schema_to_pydantic("CachedModel", changed) is not first
+
 
 @pytest.mark.unit
 class TestGenerateExtractionModels:
@@ -1,7 +1,10 @@
 """Unit tests for batch processing system."""
 
+import asyncio
+
 import pytest
 from datetime import datetime
+from PIL import Image
 
 from qwen_vl.api.batch import (
     BatchProcessor,
@@ -64,6 +67,18 @@ class TestBatchJob:
         assert job.processed_items == 2
         assert job.progress == 50.0
 
+    def test_get_item(self):
+        """Test looking up an item by ID."""
+        items = [
+            BatchItem(item_id="1", file_path="/tmp/1.png"),
+            BatchItem(item_id="2", file_path="/tmp/2.png"),
+        ]
+
+        job = BatchJob(job_id="job", task_type="ocr", items=items)
+
+        assert job.get_item("2") is items[1]
+        assert job.get_item("missing") is None
+
     def test_failed_items_count(self):
         """Test failed items counting."""
         items = [
@@ -97,6 +112,25 @@ class TestBatchProcessor:
         assert job.total_items == 2
         assert job.options == {"include_boxes": True}
 
+    def test_create_job_from_folder(self, tmp_path):
+        """Test folder jobs include only files matching the patterns."""
+        for name in ("a.png", "b.jpg", "c.txt"):
+            (tmp_path / name).write_bytes(b"")
+        (tmp_path / "sub.png").mkdir()
+
+        processor = BatchProcessor()
+        job = processor.create_job_from_folder("ocr", str(tmp_path))
+
+        paths = sorted(item.file_path for item in job.items)
+        assert paths == [str(tmp_path / "a.png"), str(tmp_path / "b.jpg")]
+
+    def test_create_job_from_empty_folder(self, tmp_path):
+        """Test folder with no matching files raises error."""
+        processor = BatchProcessor()
+
+        with pytest.raises(ValueError):
+            processor.create_job_from_folder("ocr", str(tmp_path))
+
     def test_get_job(self):
         """Test retrieving a job by ID."""
         processor = BatchProcessor()
@@ -167,6 +201,13 @@ class TestBatchProcessor:
         assert results[0]["status"] == "completed"
         assert results[0]["result"] == {"text": "Hello"}
 
+    def test_warm_up_starts_all_workers(self):
+        """Test warm_up spawns every worker thread."""
+        processor = BatchProcessor(max_workers=3)
+        processor.warm_up()
+
+        assert len(processor._executor._threads) == 3
+
     def test_add_callback(self):
         """Test adding completion callback."""
         processor = BatchProcessor()
@@ -180,6 +221,222 @@ class TestBatchProcessor:
         assert len(processor._callbacks) == 1
 
 
+class _FakeResult:
+    def __init__(self, text):
+        self.text = text
+        self.data = None
+        self.metadata = None
+
+
+class _FakeHandler:
+    """Handler that records how many images each call received."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def process(self, image, **kwargs):
+        self.calls.append(1)
+        return _FakeResult("single")
+
+    def process_batch(self, images, **kwargs):
+        self.calls.append(len(images))
+        return [_FakeResult("batched") for _ in images]
+
+
+@pytest.mark.unit
+class TestBatchProcessing:
+    """Tests for processing jobs end to end."""
+
+    def _make_images(self, tmp_path, count):
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"{i}.png"
+            Image.new("RGB", (8, 8)).save(path)
+            paths.append(str(path))
+        return paths
+
+    def test_process_job_micro_batches(self, tmp_path):
+        """Test items are grouped into batches of at most batch_size."""
+        processor = BatchProcessor(max_workers=1, batch_size=4)
+        job = processor.create_job("ocr", self._make_images(tmp_path, 9))
+        calls = []
+
+        asyncio.run(processor.process_job(job.job_id, lambda: _FakeHandler(calls)))
+
+        assert calls == [4, 4, 1]
+        assert job.status == JobStatus.COMPLETED
+        assert job.processed_items == 9
+        assert all(item.result is not None for item in job.items)
+
+    def test_short_batch_result_fails_leftover_items(self, tmp_path):
+        """Test items without a result from process_batch are marked failed."""
+        class ShortHandler(_FakeHandler):
+            def process_batch(self, images, **kwargs):
+                return super().process_batch(images[:-1], **kwargs)
+
+        processor = BatchProcessor(max_workers=1, batch_size=3)
+        job = processor.create_job("ocr", self._make_images(tmp_path, 3))
+
+        asyncio.run(processor.process_job(job.job_id, lambda: ShortHandler([])))
+
+        assert [item.status for item in job.items] == [
+            JobStatus.COMPLETED, JobStatus.COMPLETED, JobStatus.FAILED,
+        ]
+        assert "2 results for 3 images" in job.items[2].error
+        assert job.processed == 3
+        assert job.failed == 1
+
+    def test_handler_created_once_per_worker(self, tmp_path):
+        """Test the handler factory runs once per worker thread."""
+        processor = BatchProcessor(max_workers=1, batch_size=1)
+        calls = []
+        created = []
+
+        def factory():
+            created.append(1)
+            return _FakeHandler(calls)
+
+        for _ in range(2):
+            job = processor.create_job("ocr", self._make_images(tmp_path, 3))
+            asyncio.run(processor.process_job(job.job_id, factory))
+
+        assert len(calls) == 6
+        assert len(created) == 1
+
+    def test_sync_handler_class_built_in_worker(self, tmp_path):
+        """Test a sync handler class is only instantiated on worker threads."""
+        import threading
+
+        threads = []
+
+        class SyncHandler(_FakeHandler):
+            def __init__(self):
+                super().__init__([])
+                threads.append(threading.current_thread())
+
+        processor = BatchProcessor(max_workers=1)
+        job = processor.create_job("ocr", self._make_images(tmp_path, 2))
+
+        asyncio.run(processor.process_job(job.job_id, SyncHandler))
+
+        assert job.processed_items == 2
+        assert threads and threading.main_thread() not in threads
+
+    def test_async_handler_skips_thread_pool(self, tmp_path):
+        """Test that async handlers are awaited without an executor."""
+        class AsyncHandler:
+            async def process(self, image, **kwargs):
+                return _FakeResult("async")
+
+        processor = BatchProcessor(max_workers=2)
+        job = processor.create_job("ocr", self._make_images(tmp_path, 3))
+
+        asyncio.run(processor.process_job(job.job_id, AsyncHandler))
+
+        assert processor._executor is None
+        assert job.processed_items == 3
+        assert all(item.result["text"] == "async" for item in job.items)
+
+    def test_max_side_drafts_jpeg_and_is_not_passed_to_handler(self, tmp_path):
+        """Test max_side downscales JPEG decode and stays out of handler kwargs."""
+        path = tmp_path / "big.jpg"
+        Image.new("RGB", (800, 800)).save(path)
+        seen = {}
+
+        class RecordingHandler:
+            def process(self, image, **kwargs):
+                seen["size"] = image.size
+                seen["kwargs"] = kwargs
+                return _FakeResult("ok")
+
+        processor = BatchProcessor(max_workers=1)
+        job = processor.create_job(
+            "ocr", [str(path)], options={"max_side": 200, "include_boxes": True}
+        )
+
+        asyncio.run(processor.process_job(job.job_id, RecordingHandler))
+
+        assert max(seen["size"]) < 800
+        assert seen["kwargs"] == {"include_boxes": True}
+
+    def test_callbacks_run_and_failures_are_isolated(self, tmp_path):
+        """Test sync and async callbacks both run even if one raises."""
+        processor = BatchProcessor(max_workers=1)
+        called = []
+
+        def failing(job):
+            raise RuntimeError("boom")
+
+        def sync_callback(job):
+            called.append("sync")
+
+        async def async_callback(job):
+            called.append("async")
+
+        for callback in (failing, sync_callback, async_callback):
+            processor.add_callback(callback)
+
+        job = processor.create_job("ocr", self._make_images(tmp_path, 1))
+        asyncio.run(processor.process_job(job.job_id, lambda: _FakeHandler([])))
+
+        assert sorted(called) == ["async", "sync"]
+
+    def test_job_results_cached_until_progress_changes(self, tmp_path):
+        """Test results are reused between polls and rebuilt after processing."""
+        processor = BatchProcessor(max_workers=1)
+        job = processor.create_job("ocr", self._make_images(tmp_path, 2))
+
+        pending = processor.get_job_results(job.job_id)
+        cached = job._results_cache
+        processor.get_job_results(job.job_id)
+        assert job._results_cache is cached
+
+        asyncio.run(processor.process_job(job.job_id, lambda: _FakeHandler([])))
+
+        done = processor.get_job_results(job.job_id)
+        assert job._results_cache is not cached
+        assert all(r["status"] == "completed" for r in done)
+        assert pending[0]["status"] == "pending"
+
+    def test_job_results_are_copies(self, tmp_path):
+        """Test editing returned results does not change later responses."""
+        processor = BatchProcessor(max_workers=1)
+        job = processor.create_job("ocr", self._make_images(tmp_path, 2))
+
+        results = processor.get_job_results(job.job_id)
+        results[0]["status"] = "edited"
+        results.pop()
+
+        again = processor.get_job_results(job.job_id)
+        assert len(again) == 2
+        assert again[0]["status"] == "pending"
+
+    def test_job_equality_ignores_caches(self, tmp_path):
+        """Test building the results cache does not change job equality."""
+        import dataclasses
+
+        processor = BatchProcessor(max_workers=1)
+        job = processor.create_job("ocr", self._make_images(tmp_path, 1))
+        copy = dataclasses.replace(job)
+
+        processor.get_job_results(job.job_id)
+
+        assert job == copy
+
+    def test_process_job_unreadable_item_fails_alone(self, tmp_path):
+        """Test that a bad file fails without failing its batch."""
+        processor = BatchProcessor(max_workers=1, batch_size=4)
+        paths = self._make_images(tmp_path, 2) + [str(tmp_path / "missing.png")]
+        job = processor.create_job("ocr", paths)
+        calls = []
+
+        asyncio.run(processor.process_job(job.job_id, lambda: _FakeHandler(calls)))
+
+        assert calls == [2]
+        assert job.failed_items == 1
+        assert job.items[2].error is not None
+
+
 @pytest.mark.unit
 class TestGlobalProcessor:
     """Tests for global processor instance."""
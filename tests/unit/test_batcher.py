@@ -0,0 +1,169 @@
+"""Unit tests for request micro-batching."""
+
+import asyncio
+
+import pytest
+
+from qwen_vl.api.batcher import RequestBatcher
+from qwen_vl.tasks.base import TaskResult, TaskType
+
+
+class _FakeHandler:
+    """Handler recording how images were grouped."""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+
+    def process(self, image, **kwargs):
+        if image == self.fail_on:
+            raise ValueError(f"bad image {image}")
+        return TaskResult(text=f"{image}:{kwargs.get('mode')}")
+
+    def process_batch(self, images, **kwargs):
+        self.batches.append(list(images))
+        return [self.process(image, **kwargs) for image in images]
+
+
+@pytest.mark.unit
+class TestRequestBatcher:
+    """Tests for RequestBatcher."""
+
+    def test_concurrent_requests_share_a_batch(self):
+        handler = _FakeHandler()
+        batcher = RequestBatcher(lambda task_type: handler, max_wait_ms=20)
+
+        async def run():
+            return await asyncio.gather(
+                *(batcher.submit(TaskType.OCR, i, mode="a") for i in range(3))
+            )
+
+        results = asyncio.run(run())
+
+        assert [r.text for r in results] == ["0:a", "1:a", "2:a"]
+        assert handler.batches == [[0, 1, 2]]
+
+    def test_different_options_are_not_mixed(self):
+        handler = _FakeHandler()
+        batcher = RequestBatcher(lambda task_type: handler, max_wait_ms=20)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.submit(TaskType.OCR, 1, mode="a"),
+                batcher.submit(TaskType.OCR, 2, mode="b"),
+            )
+
+        results = asyncio.run(run())
+
+        assert [r.text for r in results] == ["1:a", "2:b"]
+        assert sorted(handler.batches) == [[1], [2]]
+
+    def test_max_batch_size_flushes_early(self):
+        handler = _FakeHandler()
+        batcher = RequestBatcher(
+            lambda task_type: handler, max_batch_size=2, max_wait_ms=1000
+        )
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(TaskType.OCR, i) for i in range(4))),
+                timeout=0.5,
+            )
+
+        asyncio.run(run())
+
+        assert handler.batches == [[0, 1], [2, 3]]
+
+    def test_failure_only_affects_its_request(self):
+        handler = _FakeHandler(fail_on=1)
+        batcher = RequestBatcher(lambda task_type: handler, max_wait_ms=20)
+
+        async def run():
+            return await asyncio.gather(
+                *(batcher.submit(TaskType.OCR, i) for i in range(3)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+
+        assert results[0].text == "0:None"
+        assert isinstance(results[1], ValueError)
+        assert results[2].text == "2:None"
+
+    def test_short_batch_result_fails_leftover_requests(self):
+        """Test requests without a result from process_batch get an error."""
+        class ShortHandler(_FakeHandler):
+            def process_batch(self, images, **kwargs):
+                return super().process_batch(images[:-1], **kwargs)
+
+        batcher = RequestBatcher(lambda task_type: ShortHandler(), max_wait_ms=20)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(
+                    *(batcher.submit(TaskType.OCR, i) for i in range(3)),
+                    return_exceptions=True,
+                ),
+                timeout=0.5,
+            )
+
+        results = asyncio.run(run())
+
+        assert [r.text for r in results[:2]] == ["0:None", "1:None"]
+        assert isinstance(results[2], RuntimeError)
+
+    def test_running_batches_are_referenced(self):
+        """Test dispatched batches are held until they finish."""
+        handler = _FakeHandler()
+        batcher = RequestBatcher(lambda task_type: handler, max_batch_size=1)
+
+        async def run():
+            pending = asyncio.ensure_future(batcher.submit(TaskType.OCR, 0))
+            await asyncio.sleep(0)
+            running = set(batcher._tasks)
+            await pending
+            await asyncio.sleep(0)
+            return running
+
+        running = asyncio.run(run())
+
+        assert len(running) == 1
+        assert not batcher._tasks
+
+    def test_repeated_upload_served_from_cache(self):
+        """Test images with the same digest and options reuse the result."""
+        from types import SimpleNamespace
+
+        handler = _FakeHandler()
+        batcher = RequestBatcher(lambda task_type: handler, max_wait_ms=1)
+
+        def upload(name):
+            return SimpleNamespace(info={"digest": "abc"}, name=name)
+
+        async def run():
+            first = await batcher.submit(TaskType.OCR, upload("a"), mode="x")
+            second = await batcher.submit(TaskType.OCR, upload("b"), mode="x")
+            other = await batcher.submit(TaskType.OCR, upload("c"), mode="y")
+            return first, second, other
+
+        first, second, other = asyncio.run(run())
+
+        assert second is first
+        assert other is not first
+        assert len(handler.batches) == 2
+
+    def test_expired_result_recomputed(self):
+        """Test cached results are dropped after their TTL."""
+        from types import SimpleNamespace
+
+        handler = _FakeHandler()
+        batcher = RequestBatcher(lambda task_type: handler, max_wait_ms=1, result_ttl=0)
+        image = SimpleNamespace(info={"digest": "abc"})
+
+        async def run():
+            await batcher.submit(TaskType.OCR, image)
+            await batcher.submit(TaskType.OCR, image)
+
+        asyncio.run(run())
+
+        assert len(handler.batches) == 2
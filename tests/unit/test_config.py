@@ -78,6 +78,16 @@ class TestModelConfig:
         config = ModelConfig(size="4B", quantization="8bit")
         assert config.estimated_vram_gb == 12.0
 
+    def test_config_is_immutable(self):
+        """Test derived values can be cached because fields cannot change."""
+        from dataclasses import FrozenInstanceError
+
+        config = ModelConfig(size="4B")
+        assert config.model_id == "Qwen/Qwen2.5-VL-4B-Instruct"
+
+        with pytest.raises(FrozenInstanceError):
+            config.size = "7B"
+
 
 @pytest.mark.unit
 class TestInferenceConfig:
@@ -105,6 +115,8 @@ class TestServerConfig:
         assert config.share is False
         assert config.max_file_size_mb == 20
         assert config.max_video_size_mb == 100
+        assert config.job_workers == 2
+        assert config.max_jobs == 10000
 
 
 @pytest.mark.unit
@@ -144,6 +156,7 @@ class TestLoadConfig:
         monkeypatch.setenv("GRADIO_SERVER_PORT", "8080")
         monkeypatch.setenv("LOG_LEVEL", "DEBUG")
         monkeypatch.setenv("GRADIO_SHARE", "true")
+        monkeypatch.setenv("JOB_WORKER_CONCURRENCY", "4")
 
         reset_config()
         config = load_config()
@@ -154,6 +167,7 @@ class TestLoadConfig:
         assert config.inference.max_new_tokens == 2048
         assert config.server.port == 8080
         assert config.server.share is True
+        assert config.server.job_workers == 4
         assert config.logging.level == "DEBUG"
 
     def test_partial_override(self, clean_env, monkeypatch):
@@ -2,7 +2,7 @@
 
 import pytest
 
-from qwen_vl.api.database import create_database
+from qwen_vl.api.database import DatabaseBackend, create_database
 
 
 @pytest.mark.unit
@@ -41,3 +41,81 @@ class TestCreateDatabase:
 
         assert isinstance(backend, MongoDBBackend)
         assert backend.database_name == "test"
+
+
+class _MemoryBackend(DatabaseBackend):
+    """In-memory backend exercising the base class helpers."""
+
+    def __init__(self):
+        self.saved = []
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def save_result(self, document_id, task_type, result, metadata=None):
+        self.saved.append((document_id, task_type, result, metadata))
+        return f"r{len(self.saved)}"
+
+    def get_result(self, result_id):
+        return None
+
+    def query_results(self, task_type=None, start_date=None, end_date=None, limit=100):
+        return []
+
+
+@pytest.mark.unit
+class TestBulkSave:
+    """Tests for bulk saving helpers."""
+
+    def test_save_results_bulk_default(self):
+        """Test default bulk save falls back to save_result."""
+        backend = _MemoryBackend()
+
+        ids = backend.save_results_bulk([
+            {"document_id": "doc-1", "task_type": "ocr", "result": {"text": "a"}},
+            {"document_id": "doc-2", "task_type": "ocr", "result": {"text": "b"}},
+        ])
+
+        assert ids == ["r1", "r2"]
+        assert backend.saved[1] == ("doc-2", "ocr", {"text": "b"}, None)
+
+    def test_save_batch_job_skips_failed_items(self):
+        """Test only items with results are saved from a batch job."""
+        from qwen_vl.api.batch import BatchProcessor, JobStatus
+
+        processor = BatchProcessor()
+        job = processor.create_job("ocr", ["/tmp/1.png", "/tmp/2.png"])
+        job.items[0].status = JobStatus.COMPLETED
+        job.items[0].result = {"text": "Hello"}
+        job.items[1].status = JobStatus.FAILED
+
+        backend = _MemoryBackend()
+        ids = backend.save_batch_job(job)
+
+        assert ids == ["r1"]
+        assert backend.saved[0][0] == "/tmp/1.png"
+        assert backend.saved[0][3]["job_id"] == job.job_id
+
+
+@pytest.mark.unit
+class TestPostgreSQLQueries:
+    """Tests for prebuilt PostgreSQL query statements."""
+
+    def test_all_filter_combinations_built(self):
+        """Test a statement exists for every filter combination."""
+        from qwen_vl.api.database import _PG_QUERIES
+
+        assert len(_PG_QUERIES) == 8
+        assert "WHERE" not in _PG_QUERIES[(False, False, False)]
+
+    def test_filters_match_placeholders(self):
+        """Test each statement has one placeholder per filter plus limit."""
+        from qwen_vl.api.database import _PG_QUERIES
+
+        for key, query in _PG_QUERIES.items():
+            assert query.count("%s") == sum(key) + 1
+
+        assert "task_type = %s AND created_at <= %s" in _PG_QUERIES[(True, False, True)]
@@ -0,0 +1,274 @@
+"""Unit tests for API endpoints."""
+
+import io
+
+import pytest
+from PIL import Image
+
+fastapi = pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from qwen_vl.api import endpoints
+from qwen_vl.api.batcher import RequestBatcher
+from qwen_vl.tasks.base import TaskResult
+
+
+class _FakeHandler:
+    """Handler returning a fixed OCR result and recording the image."""
+
+    def __init__(self):
+        self.images = []
+
+    def process(self, image, **kwargs):
+        self.images.append(image)
+        return TaskResult(text="hello world", bounding_boxes=None)
+
+    def process_batch(self, images, **kwargs):
+        return [self.process(image, **kwargs) for image in images]
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    fake = _FakeHandler()
+    monkeypatch.setattr(endpoints, "_get_handler", lambda task_type: fake)
+    # Fresh batcher so cached results from other tests are not reused
+    monkeypatch.setattr(
+        endpoints, "_batcher", RequestBatcher(lambda task_type: endpoints._get_handler(task_type))
+    )
+    return fake
+
+
+@pytest.fixture
+def client():
+    return TestClient(endpoints.app)
+
+
+def _png_bytes(size=(16, 8), mode="RGBA"):
+    buf = io.BytesIO()
+    Image.new(mode, size).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.mark.unit
+class TestExtractOCR:
+    """Tests for the OCR endpoint."""
+
+    def test_extract_ocr(self, client, handler):
+        """Test OCR endpoint decodes the upload and returns text."""
+        response = client.post(
+            "/extract/ocr",
+            files={"file": ("doc.png", _png_bytes(), "image/png")},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["text"] == "hello world"
+        assert body["word_count"] == 2
+        assert handler.images[0].mode == "RGB"
+        assert handler.images[0].size == (16, 8)
+
+    def test_extract_ocr_raw_body(self, client, handler):
+        """Test raw-body OCR endpoint decodes the request body directly."""
+        response = client.post(
+            "/extract/ocr/raw",
+            content=_png_bytes(),
+            headers={"Content-Type": "image/png"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["text"] == "hello world"
+        assert handler.images[0].size == (16, 8)
+
+
+@pytest.mark.unit
+class TestHandlerCache:
+    """Tests for reusing task handlers across requests."""
+
+    def test_handler_reused_until_model_reloaded(self, monkeypatch):
+        """Test handlers are cached and rebuilt after a model reload."""
+        from types import SimpleNamespace
+        from qwen_vl.tasks import TaskType
+
+        loaded = SimpleNamespace(model=object(), processor=object())
+        monkeypatch.setattr(endpoints, "get_model", lambda: loaded)
+        monkeypatch.setattr(endpoints, "_handlers", {})
+
+        first = endpoints._get_handler(TaskType.OCR)
+        assert endpoints._get_handler(TaskType.OCR) is first
+
+        loaded.model = object()
+        second = endpoints._get_handler(TaskType.OCR)
+        assert second is not first
+        assert second.model is loaded.model
+
+
+@pytest.mark.unit
+class TestLoadImage:
+    """Tests for upload decoding."""
+
+    def test_decoded_image_tagged_with_digest(self):
+        """Test identical uploads get identical digests."""
+        data = _png_bytes()
+
+        first = endpoints._decode_rgb(io.BytesIO(data))
+        second = endpoints._decode_rgb(io.BytesIO(data))
+
+        assert first.info["digest"] == second.info["digest"]
+        assert first.mode == "RGB"
+
+    def test_large_jpeg_decoded_within_pixel_budget(self):
+        """Test oversized JPEGs are downscaled during decode, not below budget."""
+        buf = io.BytesIO()
+        Image.new("RGB", (1600, 1200)).save(buf, format="JPEG")
+        buf.seek(0)
+
+        image = endpoints._decode_rgb(buf, max_pixels=250 * 190)
+
+        assert image.size == (400, 300)
+        assert image.info["digest"]
+
+
+@pytest.mark.unit
+class TestJobs:
+    """Tests for background extraction jobs."""
+
+    def test_submit_and_poll_job(self, monkeypatch, handler):
+        """Test a queued job completes and its result can be polled."""
+        import time
+
+        monkeypatch.setattr(endpoints, "_warm_handlers", lambda: None)
+
+        with TestClient(endpoints.app) as client:
+            response = client.post(
+                "/jobs/extract/ocr",
+                files={"file": ("doc.png", _png_bytes(), "image/png")},
+                data={"options": '{"include_boxes": true}'},
+            )
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+
+            for _ in range(50):
+                body = client.get(f"/jobs/{job_id}").json()
+                if body["status"] == "completed":
+                    break
+                time.sleep(0.01)
+
+        assert body["status"] == "completed"
+        assert body["results"][0]["text"] == "hello world"
+        assert len(handler.images) == 1
+
+    def test_invalid_options(self, monkeypatch, handler):
+        """Test non-JSON options are rejected."""
+        monkeypatch.setattr(endpoints, "_warm_handlers", lambda: None)
+
+        with TestClient(endpoints.app) as client:
+            response = client.post(
+                "/jobs/extract/ocr",
+                files={"file": ("doc.png", _png_bytes(), "image/png")},
+                data={"options": "not json"},
+            )
+
+        assert response.status_code == 400
+
+    def test_unknown_job(self, client):
+        """Test polling an unknown job returns 404."""
+        assert client.get("/jobs/missing").status_code == 404
+
+    def test_finished_jobs_pruned(self, monkeypatch):
+        """Test expired jobs and the oldest beyond the cap are forgotten."""
+        from collections import OrderedDict
+        from datetime import datetime, timedelta
+
+        from qwen_vl.api.schemas import BatchJobStatus
+        from qwen_vl.config import Config, ServerConfig
+
+        config = Config(server=ServerConfig(job_ttl_seconds=60, max_jobs=3))
+        monkeypatch.setattr(endpoints, "get_config", lambda: config)
+        now = datetime.utcnow()
+
+        def job(job_id, completed_ago=None):
+            return BatchJobStatus(
+                job_id=job_id,
+                status="completed" if completed_ago is not None else "pending",
+                total_items=1,
+                processed_items=0,
+                failed_items=0,
+                created_at=now,
+                completed_at=now - timedelta(seconds=completed_ago)
+                if completed_ago is not None else None,
+            )
+
+        jobs = OrderedDict((j.job_id, j) for j in (
+            job("expired", 120), job("recent", 10), job("running"), job("newest"),
+        ))
+        monkeypatch.setattr(endpoints, "_jobs", jobs)
+
+        endpoints._prune_jobs()
+
+        # "expired" is past its TTL; "recent" is the oldest once at the cap
+        assert list(jobs) == ["running", "newest"]
+
+
+@pytest.mark.unit
+class TestUploadValidation:
+    """Tests for rejecting bad uploads before the model runs."""
+
+    def test_pdf_with_image_content_type_rejected(self, client, handler):
+        """Test the file signature is checked, not just the declared type."""
+        response = client.post(
+            "/extract/ocr",
+            files={"file": ("doc.png", b"%PDF-1.7 fake", "image/png")},
+        )
+
+        assert response.status_code == 400
+        assert handler.images == []
+
+    def test_image_jpg_content_type_accepted(self, client, handler):
+        """Test the non-standard image/jpg type is still accepted."""
+        buf = io.BytesIO()
+        Image.new("RGB", (16, 8)).save(buf, format="JPEG")
+
+        response = client.post(
+            "/extract/ocr",
+            files={"file": ("doc.jpg", buf.getvalue(), "image/jpg")},
+        )
+
+        assert response.status_code == 200
+        assert len(handler.images) == 1
+
+    def test_unsupported_content_type_rejected(self, client, handler):
+        """Test non-image content types are rejected."""
+        response = client.post(
+            "/extract/ocr",
+            files={"file": ("doc.pdf", _png_bytes(), "application/pdf")},
+        )
+
+        assert response.status_code == 415
+
+    def test_empty_file_rejected(self, client, handler):
+        """Test empty uploads are rejected."""
+        response = client.post(
+            "/extract/ocr/raw",
+            content=b"",
+            headers={"Content-Type": "image/png"},
+        )
+
+        assert response.status_code == 400
+        assert handler.images == []
+
+    def test_oversized_file_rejected(self, client, handler, monkeypatch):
+        """Test uploads over the configured limit are rejected."""
+        from types import SimpleNamespace
+
+        config = SimpleNamespace(
+            server=SimpleNamespace(max_file_size_mb=0),
+            inference=SimpleNamespace(max_pixels=None),
+        )
+        monkeypatch.setattr(endpoints, "get_config", lambda: config)
+
+        response = client.post(
+            "/extract/ocr",
+            files={"file": ("doc.png", _png_bytes(), "image/png")},
+        )
+
+        assert response.status_code == 413
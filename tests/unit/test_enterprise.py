@@ -164,6 +164,69 @@ class TestMonitoring:
         assert stats["min"] == 10
         assert stats["max"] == 50
 
+    def test_histogram_percentiles(self):
+        """Test percentiles use the nearest-rank observation."""
+        import random
+
+        collector = MetricsCollector()
+        values = list(range(1, 201))
+        random.Random(0).shuffle(values)
+        for value in values:
+            collector.observe_histogram("latency", value)
+
+        stats = collector.get_histogram_stats("latency")
+        assert (stats["p50"], stats["p95"], stats["p99"]) == (101, 191, 199)
+
+        collector.observe_histogram("single", 7)
+        single = collector.get_histogram_stats("single")
+        assert single["p50"] == single["p99"] == 7
+
+    def test_histogram_keeps_recent_window(self):
+        """Test histograms keep only the most recent 1000 observations."""
+        collector = MetricsCollector()
+
+        for value in range(1500):
+            collector.observe_histogram("latency", value)
+
+        stats = collector.get_histogram_stats("latency")
+        assert stats["count"] == 1000
+        assert stats["min"] == 500
+        assert stats["max"] == 1499
+
+    def test_prometheus_histogram_counts_all_observations(self):
+        """Test exported histogram totals include evicted observations."""
+        collector = MetricsCollector()
+
+        for value in range(1500):
+            collector.observe_histogram("latency", value, {"task": "ocr"})
+
+        output = collector.export_prometheus()
+        assert 'latency_count{task="ocr"} 1500' in output
+        assert f'latency_sum{{task="ocr"}} {float(sum(range(1500)))}' in output
+
+        collector.reset()
+        assert "latency" not in collector.export_prometheus()
+
+    def test_concurrent_updates(self):
+        """Test updates from many threads on several metrics are not lost."""
+        import threading
+
+        collector = MetricsCollector()
+
+        def work():
+            for i in range(1000):
+                collector.increment_counter("requests", labels={"task": str(i % 4)})
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(
+            collector.get_counter("requests", {"task": str(t)}) for t in range(4)
+        ) == 8000
+
     def test_prometheus_export(self):
         """Test Prometheus format export."""
         collector = MetricsCollector()
@@ -207,6 +270,56 @@ class TestAuditLogging:
         assert entry.action == AuditAction.DOCUMENT_UPLOADED
         assert entry.tenant_id == "tenant-1"
 
+    def test_entry_ids_and_timestamps(self):
+        """Test entries get unique IDs and UTC timestamps usable in queries."""
+        from datetime import timedelta, timezone
+
+        logger = AuditLogger()
+        first = logger.log(AuditAction.LOGIN)
+        second = logger.log(AuditAction.LOGOUT)
+
+        assert first.entry_id != second.entry_id
+        assert first.timestamp.tzinfo is timezone.utc
+        assert first.timestamp <= second.timestamp
+
+        # Naive bounds are read as UTC
+        since = second.timestamp.replace(tzinfo=None) - timedelta(seconds=1)
+        assert len(logger.query(start_time=since)) == 2
+        assert logger.query(end_time=since) == []
+
+    def test_handlers(self):
+        """Test handlers see each entry; ones added mid-dispatch start next time."""
+        logger = AuditLogger()
+        seen = []
+
+        def late(entry):
+            seen.append(("late", entry.action))
+
+        def first(entry):
+            seen.append(("first", entry.action))
+            if len(seen) == 1:
+                logger.add_handler(late)
+
+        logger.add_handler(first)
+        logger.log(AuditAction.LOGIN)
+        logger.log(AuditAction.LOGOUT)
+
+        assert seen == [
+            ("first", AuditAction.LOGIN),
+            ("first", AuditAction.LOGOUT),
+            ("late", AuditAction.LOGOUT),
+        ]
+
+    def test_max_entries(self):
+        """Test only the most recent entries are kept."""
+        logger = AuditLogger(max_entries=3)
+
+        for i in range(5):
+            logger.log(AuditAction.DOCUMENT_UPLOADED, resource_id=f"doc-{i}")
+
+        entries = logger.query()
+        assert [e.resource_id for e in entries] == ["doc-4", "doc-3", "doc-2"]
+
     def test_query_by_tenant(self):
         """Test querying entries by tenant."""
         logger = AuditLogger()
@@ -229,6 +342,70 @@ class TestAuditLogging:
         entries = logger.query(action=AuditAction.DOCUMENT_UPLOADED)
         assert len(entries) == 2
 
+    def test_query_indexes_follow_eviction(self):
+        """Test tenant and action queries only return retained entries."""
+        logger = AuditLogger(max_entries=3)
+
+        logger.log(AuditAction.LOGIN, tenant_id="tenant-1", resource_id="old")
+        logger.log(AuditAction.DOCUMENT_UPLOADED, tenant_id="tenant-2")
+        logger.log(AuditAction.LOGIN, tenant_id="tenant-1", resource_id="new")
+        logger.log(AuditAction.DOCUMENT_UPLOADED, tenant_id="tenant-2")
+
+        assert [e.resource_id for e in logger.query(tenant_id="tenant-1")] == ["new"]
+        assert [
+            e.resource_id
+            for e in logger.query(tenant_id="tenant-1", action=AuditAction.LOGIN)
+        ] == ["new"]
+        assert len(logger.query(action=AuditAction.DOCUMENT_UPLOADED)) == 2
+        assert logger.query(tenant_id="tenant-3") == []
+
+    def test_query_while_logging(self):
+        """Test queries from one thread while others log do not fail."""
+        import threading
+
+        logger = AuditLogger(max_entries=500)
+        stop = threading.Event()
+
+        def work():
+            while not stop.is_set():
+                logger.log(AuditAction.LOGIN, user_id="user-1")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(200):
+                logger.query(user_id="user-2", limit=1)
+                logger.export_entries(format="csv")
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def test_indexes_consistent_under_concurrent_logging(self):
+        """Test tenant and action indexes match the retained entries."""
+        import threading
+
+        logger = AuditLogger(max_entries=100)
+        actions = [AuditAction.LOGIN, AuditAction.LOGOUT]
+
+        def work(n):
+            for i in range(2000):
+                logger.log(actions[i % 2], tenant_id=f"tenant-{(n + i) % 3}")
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        retained = set(map(id, logger._entries))
+        assert sum(len(e) for e in logger._by_tenant.values()) == 100
+        assert sum(len(e) for e in logger._by_action.values()) == 100
+        for index in (logger._by_tenant, logger._by_action):
+            for entries in index.values():
+                assert set(map(id, entries)) <= retained
+
     def test_compliance_report(self):
         """Test generating compliance report."""
         logger = AuditLogger()
@@ -246,6 +423,87 @@ class TestAuditLogging:
         assert report["total_events"] == 3
         assert report["unique_users"] == 2
 
+    def test_compliance_report_breakdown(self):
+        """Test report action counts and failures."""
+        logger = AuditLogger()
+
+        logger.log(AuditAction.LOGIN, tenant_id="tenant-1", user_id="user-1")
+        logger.log(AuditAction.LOGIN, tenant_id="tenant-1", success=False)
+        logger.log(AuditAction.LOGOUT, tenant_id="tenant-1", user_id="user-1")
+        logger.log(AuditAction.LOGIN, tenant_id="tenant-2", user_id="user-2")
+
+        report = logger.get_compliance_report(
+            tenant_id="tenant-1",
+            start_time=datetime(2000, 1, 1),
+            end_time=datetime(9999, 12, 31),
+        )
+
+        assert report["action_breakdown"] == {"auth.login": 2, "auth.logout": 1}
+        assert report["generated_at"].endswith("+00:00")
+        assert report["unique_users"] == 1
+        assert report["failed_actions"] == 1
+
+    def test_entry_to_dict(self):
+        """Test serialized entries are cached and unaffected by callers."""
+        logger = AuditLogger()
+        entry = logger.log(
+            AuditAction.DOCUMENT_UPLOADED, tenant_id="tenant-1", details={"pages": 2}
+        )
+
+        data = entry.to_dict()
+        assert data["action"] == "document.uploaded"
+        assert data["timestamp"] == entry.timestamp.isoformat()
+        assert data["details"] == {"pages": 2}
+        assert "_dict" not in data
+
+        data["action"] = "changed"
+        assert entry.to_dict()["action"] == "document.uploaded"
+        assert entry._dict is not None
+
+    def test_entry_to_dict_details_are_copies(self):
+        """Test mutating exported details leaves the logged entry unchanged."""
+        logger = AuditLogger()
+        entry = logger.log(AuditAction.CONFIG_CHANGED, details={"diff": {"a": 1}})
+        bare = logger.log(AuditAction.LOGIN)
+
+        data = entry.to_dict()
+        data["details"]["user"] = "x"
+        data["details"]["diff"]["a"] = 2
+        bare.to_dict()["details"]["user"] = "x"
+
+        assert entry.to_dict()["details"] == {"diff": {"a": 1}}
+        assert bare.to_dict()["details"] == {}
+
+    def test_export_csv(self):
+        """Test CSV export quotes values and streams one chunk per entry."""
+        import csv
+        import io
+
+        logger = AuditLogger()
+        logger.log(AuditAction.DOCUMENT_UPLOADED, tenant_id="tenant-1", resource_id="a,b")
+        logger.log(AuditAction.DOCUMENT_DELETED, success=False)
+
+        lines = list(logger.export_entries_stream())
+        rows = list(csv.reader(io.StringIO(logger.export_entries(format="csv"))))
+
+        assert len(lines) == 2
+        assert rows[0][0] == "timestamp"
+        assert rows[1][1:] == ["document.uploaded", "tenant-1", "", "", "a,b", "True"]
+        assert rows[2][-1] == "False"
+        assert AuditLogger().export_entries(format="csv") == ""
+
+    def test_entries_without_details_share_empty_mapping(self):
+        """Test omitted details use one read-only mapping and export as {}."""
+        logger = AuditLogger()
+        first = logger.log(AuditAction.LOGIN)
+        second = logger.log(AuditAction.LOGOUT)
+
+        assert first.details is second.details
+        with pytest.raises(TypeError):
+            first.details["key"] = "value"
+        assert first.to_dict()["details"] == {}
+        assert '"details": {}' in logger.export_entries(format="json")
+
     def test_export_json(self):
         """Test exporting to JSON."""
         logger = AuditLogger()
@@ -255,6 +513,21 @@ class TestAuditLogging:
         output = logger.export_entries(format="json")
         assert "document.uploaded" in output
 
+    def test_export_json_details(self):
+        """Test JSON output keeps non-ASCII text and stringifies other types."""
+        import json
+
+        logger = AuditLogger()
+        entry = logger.log(
+            AuditAction.DOCUMENT_UPLOADED,
+            details={"filename": "fakturé.pdf", "at": datetime(2024, 1, 1)},
+        )
+
+        details = json.loads(entry.to_json())["details"]
+        assert details["filename"] == "fakturé.pdf"
+        assert details["at"] == "2024-01-01 00:00:00"
+        assert json.loads(logger.export_entries(format="json"))[0]["details"] == details
+
 
 @pytest.mark.unit
 class TestAuth:
@@ -295,6 +568,16 @@ class TestAuth:
         validated = manager.validate_api_key(raw_key)
         assert validated is None
 
+    def test_validate_api_key_among_many(self):
+        """Test each key validates to itself and unknown keys are rejected."""
+        manager = AuthManager()
+        keys = [manager.create_api_key("tenant-1", f"key-{i}") for i in range(5)]
+
+        for raw_key, api_key in keys:
+            assert manager.validate_api_key(raw_key) is api_key
+            assert api_key.last_used is not None
+        assert manager.validate_api_key("qwvl_unknown") is None
+
     def test_create_user(self):
         """Test creating a user."""
         manager = AuthManager()
@@ -321,6 +604,36 @@ class TestAuth:
         invalid = manager.authenticate_user("test@example.com", "wrong")
         assert invalid is None
 
+    def test_password_hash_is_salted(self):
+        """Test passwords are stored as salted KDF hashes and verified."""
+        manager = AuthManager()
+
+        first = manager.create_user("tenant-1", "a@example.com", "secret")
+        second = manager.create_user("tenant-1", "b@example.com", "secret")
+
+        assert "secret" not in first.password_hash
+        assert first.password_hash != second.password_hash
+        assert manager.authenticate_user("a@example.com", "secret") is first
+        assert manager.authenticate_user("a@example.com", "wrong") is None
+        assert manager.authenticate_user("c@example.com", "secret") is None
+
+    def test_unknown_email_still_verifies_password(self):
+        """Test unknown emails cost a password check, like wrong passwords."""
+        manager = AuthManager()
+        manager.create_user("tenant-1", "a@example.com", "secret")
+        checked = []
+        verify = manager._verify_password
+
+        def counting_verify(password_hash, password):
+            checked.append(password_hash)
+            return verify(password_hash, password)
+
+        manager._verify_password = counting_verify
+
+        assert manager.authenticate_user("nobody@example.com", "secret") is None
+        assert manager.authenticate_user("a@example.com", "wrong") is None
+        assert len(checked) == 2
+
     def test_role_permissions(self):
         """Test role-based permissions."""
         manager = AuthManager()
@@ -340,6 +653,52 @@ class TestAuth:
         assert manager.check_permission(readonly.user_id, Permission.DOCUMENT_READ)
         assert not manager.check_permission(readonly.user_id, Permission.DOCUMENT_WRITE)
 
+    def test_permission_changes_invalidate_cache(self):
+        """Test reassigning role or permissions updates permission checks."""
+        manager = AuthManager()
+        user = manager.create_user("tenant-1", "a@example.com", "secret", Role.READONLY)
+
+        assert not user.has_permission(Permission.DOCUMENT_WRITE)
+
+        user.permissions = {Permission.DOCUMENT_WRITE}
+        assert user.has_permission(Permission.DOCUMENT_WRITE)
+        assert not user.has_permission(Permission.AUDIT_READ)
+
+        user.role = Role.MANAGER
+        assert user.has_permission(Permission.AUDIT_READ)
+
+        with pytest.raises(AttributeError):
+            user.permissions.add(Permission.TENANT_MANAGE)
+
+    def test_check_permission_follows_user_changes(self):
+        """Test cached authorization decisions are dropped when a user changes."""
+        manager = AuthManager()
+        user = manager.create_user("tenant-1", "a@example.com", "secret", Role.USER)
+
+        assert not manager.check_permission(user.user_id, Permission.AUDIT_READ)
+        assert manager.check_permission(user.user_id, Permission.DOCUMENT_READ)
+
+        user.role = Role.MANAGER
+        assert manager.check_permission(user.user_id, Permission.AUDIT_READ)
+
+        user.permissions = {Permission.TENANT_MANAGE}
+        assert manager.check_permission(user.user_id, Permission.TENANT_MANAGE)
+        assert not manager.check_permission("unknown", Permission.DOCUMENT_READ)
+
+    def test_creating_users_keeps_permission_cache(self):
+        """Test new users do not invalidate cached authorization decisions."""
+        from qwen_vl.enterprise import auth
+
+        manager = AuthManager()
+        user = manager.create_user("tenant-1", "a@example.com", "secret", Role.USER)
+        generation = auth._permissions_generation
+
+        manager.check_permission(user.user_id, Permission.DOCUMENT_READ)
+        manager.create_user("tenant-1", "b@example.com", "secret", Role.ADMIN)
+
+        assert auth._permissions_generation == generation
+        assert (user.user_id, Permission.DOCUMENT_READ) in manager._perm_cache
+
     def test_rate_limiting(self):
         """Test rate limiting."""
         manager = AuthManager()
@@ -358,6 +717,27 @@ class TestAuth:
         result = manager.check_rate_limit("key", limit=2)
         assert not result["allowed"]
 
+    def test_rate_limit_sliding_window(self, monkeypatch):
+        """Test requests free up one at a time as they age out of the window."""
+        import types
+        from qwen_vl.enterprise import auth
+
+        now = [1000.0]
+        monkeypatch.setattr(auth, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+        manager = AuthManager()
+
+        assert manager.check_rate_limit("key", limit=2, window_seconds=60)["allowed"]
+        now[0] += 30
+        assert manager.check_rate_limit("key", limit=2, window_seconds=60)["allowed"]
+        now[0] += 29
+        assert not manager.check_rate_limit("key", limit=2, window_seconds=60)["allowed"]
+
+        # Only the first request has left the window; no burst at a boundary
+        now[0] += 2
+        result = manager.check_rate_limit("key", limit=2, window_seconds=60)
+        assert result["allowed"] and result["remaining"] == 0
+        assert not manager.check_rate_limit("key", limit=2, window_seconds=60)["allowed"]
+
     def test_expired_api_key(self):
         """Test expired API key validation."""
         manager = AuthManager()
@@ -6,6 +6,7 @@ import pytest
 from qwen_vl.api.export import (
     export_to_json,
     export_to_csv,
+    iter_csv,
     ExportManager,
     get_export_manager,
 )
@@ -42,6 +43,35 @@ class TestExportToJson:
         assert "\n" in pretty
         assert "\n" not in compact
 
+    def test_export_non_json_types(self):
+        """Test datetimes and unknown objects are serialized."""
+        from datetime import datetime
+        from pathlib import Path
+
+        data = {"created": datetime(2024, 1, 15, 12, 0), "path": Path("a.png"), 1: "x"}
+        parsed = json.loads(export_to_json(data))
+
+        assert parsed["created"].startswith("2024-01-15")
+        assert parsed["path"] == "a.png"
+        assert parsed["1"] == "x"
+
+    def test_matches_stdlib_output(self):
+        """Test values are written as json.dumps with default=str writes them."""
+        from datetime import date, datetime
+
+        data = {
+            "created": datetime(2024, 1, 1, 12),
+            "day": date(2024, 1, 1),
+            "text": "caf\u00e9 \u6587\u5b57 \U0001f600",
+            "items": [1, 2.5, None, True],
+        }
+
+        assert export_to_json(data) == json.dumps(data, indent=2, default=str)
+        # Compact output only drops the spaces after separators
+        assert export_to_json(data, pretty=False) == json.dumps(
+            data, separators=(",", ":"), default=str
+        )
+
 
 @pytest.mark.unit
 class TestExportToCsv:
@@ -88,6 +118,134 @@ class TestExportToCsv:
         assert "nested" in result
         assert "value" in result
 
+    def test_nested_value_after_empty_first_row(self):
+        """Test columns empty in the first row still encode later nested values."""
+        data = [{"a": None}, {"a": {"x": 1}}]
+
+        import csv
+        import io
+
+        rows = list(csv.reader(io.StringIO(export_to_csv(data))))
+
+        assert rows[1] == [""]
+        assert json.loads(rows[2][0]) == {"x": 1}
+
+    def test_nested_value_after_scalar_first_row(self):
+        """Test columns scalar in the first row still encode later nested values."""
+        data = [{"a": "x"}, {"a": {"k": 1}}, {"a": [1, 2]}]
+
+        import csv
+        import io
+
+        rows = list(csv.reader(io.StringIO(export_to_csv(data))))
+
+        assert rows[1] == ["x"]
+        assert json.loads(rows[2][0]) == {"k": 1}
+        assert json.loads(rows[3][0]) == [1, 2]
+
+    def test_typed_records(self):
+        """Test Pydantic models and dataclasses export like dicts."""
+        from dataclasses import dataclass
+        from pydantic import BaseModel
+
+        class Item(BaseModel):
+            name: str
+            qty: int
+
+        @dataclass
+        class Row:
+            name: str
+            qty: int
+
+        expected = export_to_csv([{"name": "a", "qty": 1}])
+
+        assert export_to_csv([Item(name="a", qty=1)]) == expected
+        assert export_to_csv([Row(name="a", qty=1)]) == expected
+
+    def test_mapping_records_without_msgspec(self, monkeypatch):
+        """Test non-dict mappings and dataclasses export without msgspec."""
+        from collections import OrderedDict, defaultdict
+        from dataclasses import dataclass
+
+        import qwen_vl.api.export as export_module
+
+        monkeypatch.setattr(export_module, "msgspec", None)
+
+        @dataclass
+        class Row:
+            name: str
+            qty: int
+
+        counts = defaultdict(int, name="a", qty=1)
+        expected = export_to_csv([{"name": "a", "qty": 1}])
+
+        assert export_to_csv([OrderedDict(name="a", qty=1)]) == expected
+        assert export_to_csv([counts]) == expected
+        assert export_to_csv([Row(name="a", qty=1)]) == expected
+
+    def test_iter_csv_yields_per_row(self):
+        """Test streaming CSV yields header with first row, then one chunk per row."""
+        data = ({"n": i} for i in range(3))
+
+        chunks = list(iter_csv(data))
+
+        assert len(chunks) == 3
+        assert chunks[0].replace("\r", "") == "n\n0\n"
+        assert "".join(chunks) == export_to_csv([{"n": i} for i in range(3)])
+
+
+@pytest.mark.unit
+class TestExportToExcel:
+    """Tests for Excel export."""
+
+    def test_export_sheets(self):
+        """Test each non-empty list becomes a worksheet."""
+        import io
+        import zipfile
+
+        pytest.importorskip("xlsxwriter")
+        from qwen_vl.api.export import export_to_excel
+
+        data = {
+            "Items": [{"name": "Widget", "meta": {"sku": "W-1"}}],
+            "Empty": [],
+        }
+
+        result = export_to_excel(data)
+
+        with zipfile.ZipFile(io.BytesIO(result)) as archive:
+            workbook = archive.read("xl/workbook.xml").decode()
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+
+        assert 'name="Items"' in workbook
+        assert 'name="Empty"' not in workbook
+        assert "Widget" in sheet
+
+    def test_column_widths(self):
+        """Test widths fit the header or longest cell, capped at 50."""
+        from qwen_vl.api.export import _column_widths
+
+        widths = _column_widths(["id", "description"], [[3, 80], [12, 5]])
+
+        assert widths == [14, 52]
+        assert _column_widths(["name"], []) == [6]
+
+
+@pytest.mark.unit
+class TestExportToPdf:
+    """Tests for PDF export."""
+
+    def test_list_items_with_markup_characters(self):
+        """Test bullet items are escaped before reportlab parses them."""
+        pytest.importorskip("reportlab")
+        from qwen_vl.api.export import export_to_pdf
+
+        data = {"data": {"notes": ["a < b", "c & d", "<unclosed"]}}
+
+        result = export_to_pdf(data, include_metadata=False)
+
+        assert result.startswith(b"%PDF")
+
 
 @pytest.mark.unit
 class TestExportManager:
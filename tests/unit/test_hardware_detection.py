@@ -1,5 +1,7 @@
 """Unit tests for hardware detection module."""
 
+import sys
+import types
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -105,6 +107,19 @@ class TestHardwareInfo:
         assert info.get_recommended_model() == "none"
 
 
+@pytest.fixture
+def fake_torch(monkeypatch):
+    """Install a CPU-only stand-in for torch that counts CUDA queries."""
+    torch = types.ModuleType("torch")
+    torch.cuda = MagicMock()
+    torch.cuda.is_available.return_value = False
+    torch.version = types.SimpleNamespace(cuda=None)
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    HardwareDetector().reset()
+    yield torch
+    HardwareDetector().reset()
+
+
 @pytest.mark.unit
 class TestHardwareDetector:
     """Tests for HardwareDetector class."""
@@ -150,6 +165,115 @@ class TestHardwareDetector:
         info2 = detector.detect()
         assert info1 is info2
 
+    def test_cuda_availability_queried_once(self, fake_torch):
+        """Test CUDA availability is cached across detections until reset."""
+        detector = HardwareDetector()
+
+        assert detector.detect().cuda_available is False
+        detector._hardware_info = None
+        detector.detect()
+        assert fake_torch.cuda.is_available.call_count == 1
+
+        detector.reset()
+        detector.detect()
+        assert fake_torch.cuda.is_available.call_count == 2
+
+    def test_device_properties_queried_once(self, fake_torch):
+        """Test static GPU properties are fetched once per device."""
+        fake_torch.cuda.is_available.return_value = True
+        fake_torch.version.cuda = "12.1"
+        fake_torch.cuda.device_count.return_value = 2
+        fake_torch.cuda.get_device_properties.side_effect = lambda i: types.SimpleNamespace(
+            name=f"GPU{i}", total_memory=16 * 1024**3
+        )
+        fake_torch.cuda.mem_get_info.return_value = (8 * 1024**3, 16 * 1024**3)
+        detector = HardwareDetector()
+
+        info = detector.detect()
+        detector._hardware_info = None
+        detector.detect()
+
+        assert [gpu.name for gpu in info.gpus] == ["GPU0", "GPU1"]
+        assert info.total_vram_gb == 32.0
+        assert info.free_vram_gb == 16.0
+        assert fake_torch.cuda.get_device_properties.call_count == 2
+
+    def test_detection_keeps_current_device(self, fake_torch):
+        """Test free memory is queried per index without switching devices."""
+        fake_torch.cuda.is_available.return_value = True
+        fake_torch.cuda.device_count.return_value = 2
+        fake_torch.cuda.get_device_properties.return_value = types.SimpleNamespace(
+            name="GPU", total_memory=16 * 1024**3
+        )
+        fake_torch.cuda.mem_get_info.return_value = (8 * 1024**3, 16 * 1024**3)
+
+        HardwareDetector().detect()
+
+        fake_torch.cuda.set_device.assert_not_called()
+        assert [c.args for c in fake_torch.cuda.mem_get_info.call_args_list] == [(0,), (1,)]
+
+    def test_many_gpus_polled_in_order(self, fake_torch):
+        """Test concurrent polling on large nodes keeps device order."""
+        fake_torch.cuda.is_available.return_value = True
+        fake_torch.cuda.device_count.return_value = 8
+        fake_torch.cuda.get_device_properties.side_effect = lambda i: types.SimpleNamespace(
+            name=f"GPU{i}", total_memory=16 * 1024**3
+        )
+        fake_torch.cuda.mem_get_info.side_effect = lambda i: (i * 1024**3, 16 * 1024**3)
+
+        info = HardwareDetector().detect()
+
+        assert [gpu.name for gpu in info.gpus] == [f"GPU{i}" for i in range(8)]
+        assert [gpu.free_memory_gb for gpu in info.gpus] == [float(i) for i in range(8)]
+        assert info.free_vram_gb == 28.0
+
+    def test_concurrent_detection_runs_once(self, fake_torch):
+        """Test threads racing on first use share a single enumeration."""
+        import threading
+        import time
+
+        def slow_count():
+            time.sleep(0.05)
+            return 0
+
+        fake_torch.cuda.is_available.return_value = True
+        fake_torch.cuda.device_count.side_effect = slow_count
+        detector = HardwareDetector()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(detector.detect()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert fake_torch.cuda.device_count.call_count == 1
+        assert all(info is results[0] for info in results)
+
+    def test_print_summary(self, capsys):
+        """Test the summary lists each GPU and the recommendation."""
+        detector = HardwareDetector()
+        detector._hardware_info = HardwareInfo(
+            cuda_available=True,
+            cuda_version="12.1",
+            gpu_count=1,
+            gpus=[GPUInfo(0, "Test GPU", 16.0, 12.0, 4.0)],
+            total_vram_gb=16.0,
+            free_vram_gb=12.0,
+        )
+
+        detector.print_summary()
+        lines = capsys.readouterr().out.splitlines()
+
+        assert lines[1] == "HARDWARE SUMMARY"
+        assert "  GPU 0: Test GPU" in lines
+        assert "    Used: 4.0 GB (25.0%)" in lines
+        assert lines[-2] == "  Recommended Model: 4B"
+        assert lines[-1] == "=" * 60
+
     def test_reset(self):
         """Test reset clears cache."""
         detector = HardwareDetector()
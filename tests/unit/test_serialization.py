@@ -0,0 +1,50 @@
+"""Unit tests for JSON serialization helpers."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+import qwen_vl.utils.serialization as serialization
+from qwen_vl.utils.serialization import dumps, dumps_bytes
+
+_DATA = {
+    "created": datetime(2024, 1, 1, 12),
+    "text": "café \U0001f600",
+    "items": [1, 2.5, None, True],
+    "nested": {"k": "v"},
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run a test with orjson, if installed, and with the stdlib fallback."""
+    if request.param == "json":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+@pytest.mark.unit
+class TestDumps:
+    """Tests for dumps and dumps_bytes."""
+
+    def test_matches_stdlib(self, backend):
+        """Test indented output matches json.dumps with default=str."""
+        assert dumps(_DATA, indent=True) == json.dumps(_DATA, indent=2, default=str)
+        assert dumps(_DATA, indent=True, ensure_ascii=False) == json.dumps(
+            _DATA, indent=2, ensure_ascii=False, default=str
+        )
+
+    def test_compact_round_trip(self, backend):
+        """Test compact text and bytes parse to the same values."""
+        expected = json.loads(json.dumps(_DATA, default=str))
+
+        assert json.loads(dumps(_DATA)) == expected
+        assert json.loads(dumps_bytes(_DATA)) == expected
+        assert "\U0001f600".encode() in dumps_bytes(_DATA)
+
+    def test_non_string_keys(self, backend):
+        """Test integer keys are written as strings."""
+        assert json.loads(dumps({1: "x"})) == {"1": "x"}
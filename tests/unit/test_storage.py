@@ -1,16 +1,190 @@
 """Unit tests for storage backends."""
 
+import io
 import json
 import os
 import tempfile
+
 import pytest
 
 from qwen_vl.api.storage import (
+    GCSStorage,
     LocalStorage,
+    S3Storage,
     create_storage,
 )
 
 
+class _FakePaginator:
+    """list_objects_v2 paginator over an in-memory key list."""
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+
+    def paginate(self, Bucket, Prefix, PaginationConfig, Delimiter=None):
+        contents, common = [], []
+        for key in self.keys:
+            if not key.startswith(Prefix):
+                continue
+            rest = key[len(Prefix):]
+            if Delimiter and Delimiter in rest:
+                sub_prefix = Prefix + rest.split(Delimiter)[0] + Delimiter
+                if {"Prefix": sub_prefix} not in common:
+                    common.append({"Prefix": sub_prefix})
+            else:
+                contents.append({"Key": key})
+        yield {"Contents": contents, "CommonPrefixes": common}
+
+
+class _NoSuchKey(Exception):
+    pass
+
+
+class _InvalidRange(Exception):
+    response = {"Error": {"Code": "InvalidRange"}}
+
+
+class _PreconditionFailed(Exception):
+    response = {"Error": {"Code": "PreconditionFailed"}}
+
+
+class _FakeS3Client:
+    exceptions = type("exceptions", (), {"NoSuchKey": _NoSuchKey})
+
+    def __init__(self, keys=(), objects=None):
+        self.keys = keys
+        self.objects = objects or {}
+        self.calls = []
+        # Called before each request; lets tests overwrite objects mid-download
+        self.before_get = None
+
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
+        if self.before_get:
+            self.before_get(self, Range)
+        self.calls.append(("get_object", Range))
+        if Key not in self.objects:
+            raise _NoSuchKey(Key)
+        body = self.objects[Key]
+        etag = f'"{hash(body)}"'
+        if IfMatch is not None and IfMatch != etag:
+            raise _PreconditionFailed()
+        response = {"ETag": etag}
+        if Range:
+            if not body:
+                raise _InvalidRange()
+            start, end = map(int, Range[len("bytes="):].split("-"))
+            end = min(end, len(body) - 1)
+            response["ContentRange"] = f"bytes {start}-{end}/{len(body)}"
+            body = body[start:end + 1]
+        response["Body"] = io.BytesIO(body)
+        return response
+
+    def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs))
+
+    def upload_fileobj(self, fileobj, **kwargs):
+        self.calls.append(("upload_fileobj", dict(kwargs, size=len(fileobj.read()))))
+
+    def get_paginator(self, name):
+        return _FakePaginator(self.keys)
+
+
+def _s3_storage(keys, prefix="", objects=None):
+    """S3Storage wired to a fake client, without needing boto3."""
+    storage = S3Storage.__new__(S3Storage)
+    storage.bucket = "bucket"
+    storage.prefix = prefix
+    storage._client = _FakeS3Client(keys, objects)
+    return storage
+
+
+class _FakeBlobIterator:
+    """list_blobs iterator; prefixes fill in as pages are consumed."""
+
+    def __init__(self, names, prefixes):
+        self._names = names
+        self._prefixes = prefixes
+        self.prefixes = set()
+
+    def __iter__(self):
+        for name in self._names:
+            yield type("Blob", (), {"name": name})()
+        self.prefixes = set(self._prefixes)
+
+
+class _FakeGCSClient:
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.calls = []
+
+    def list_blobs(self, bucket, prefix, fields, delimiter=None):
+        self.calls.append((prefix, fields, delimiter))
+        names, prefixes = [], set()
+        for name in self.names:
+            if not name.startswith(prefix):
+                continue
+            rest = name[len(prefix):]
+            if delimiter and delimiter in rest:
+                prefixes.add(prefix + rest.split(delimiter)[0] + delimiter)
+            else:
+                names.append(name)
+        return _FakeBlobIterator(names, prefixes)
+
+
+class _FakeBlob:
+    """Blob handle that, like the real one, pins its generation after upload."""
+
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.metadata = None
+        self.generation = None
+
+    def upload_from_string(self, data, content_type=None):
+        if isinstance(data, str):
+            data = data.encode()
+        self.bucket.generations += 1
+        self.generation = self.bucket.generations
+        self.bucket.objects[self.name] = (self.generation, data, self.metadata)
+
+    def _current(self):
+        obj = self.bucket.objects.get(self.name)
+        if obj is None or self.generation not in (None, obj[0]):
+            return None
+        return obj
+
+    def exists(self):
+        return self._current() is not None
+
+    def download_as_bytes(self):
+        return self._current()[1]
+
+    def delete(self):
+        if self._current() is None:
+            raise KeyError(self.name)
+        del self.bucket.objects[self.name]
+
+
+class _FakeBucket:
+    def __init__(self):
+        self.objects = {}
+        self.generations = 0
+
+    def blob(self, name):
+        return _FakeBlob(self, name)
+
+
+def _gcs_storage(names=(), prefix="", bucket=None):
+    """GCSStorage wired to a fake client, without google-cloud-storage."""
+    storage = GCSStorage.__new__(GCSStorage)
+    storage.bucket_name = "bucket"
+    storage.prefix = prefix
+    storage._prefix_len = len(prefix) + 1 if prefix else 0
+    storage._client = _FakeGCSClient(names)
+    storage._bucket = bucket or _FakeBucket()
+    return storage
+
+
 @pytest.mark.unit
 class TestLocalStorage:
     """Tests for LocalStorage backend."""
@@ -71,6 +245,48 @@ class TestLocalStorage:
 
             assert storage.exists("a/b/c/test.txt")
 
+    def test_save_after_directory_removed(self):
+        """Test saves recreate a cached directory that was deleted."""
+        import shutil
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = LocalStorage(tmpdir)
+            storage.save("a/b/first.txt", "1")
+
+            shutil.rmtree(os.path.join(tmpdir, "a"))
+            storage.save("a/b/second.txt", "2")
+
+            assert storage.load("a/b/second.txt") == b"2"
+
+    def test_save_leaves_no_temp_files(self):
+        """Test atomic saves rename their temporary file into place."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = LocalStorage(tmpdir)
+            storage.save("doc.json", {"a": 1}, metadata={"task": "ocr"}, durable=True)
+            storage.save("doc.json", {"a": 2})
+
+            assert sorted(os.listdir(tmpdir)) == ["doc.json", "doc.json.meta"]
+            assert json.loads(storage.load("doc.json")) == {"a": 2}
+
+    def test_list_keys_skips_in_progress_writes(self):
+        """Test temporary files of unfinished saves are not listed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = LocalStorage(tmpdir)
+            storage.save("done.txt", "1")
+            with open(os.path.join(tmpdir, ".next.txt.1.2.tmp"), "w") as f:
+                f.write("partial")
+
+            assert storage.list_keys() == ["done.txt"]
+
+    def test_list_keys_relative_base_path(self, tmp_path, monkeypatch):
+        """Test listed keys can be loaded when the base path is relative."""
+        monkeypatch.chdir(tmp_path)
+        storage = LocalStorage(".")
+        storage.save("results/a.json", {"k": "v"})
+
+        assert storage.list_keys("results") == [os.path.join("results", "a.json")]
+        assert storage.load(storage.list_keys()[0]) is not None
+
     def test_load_nonexistent(self):
         """Test loading non-existent file returns None."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -144,3 +360,206 @@ class TestCreateStorage:
             create_storage("unknown")
 
         assert "Unknown backend" in str(exc_info.value)
+
+
+@pytest.mark.unit
+class TestS3ListKeys:
+    """Tests for S3 key listing."""
+
+    def test_lists_nested_keys_in_order(self):
+        """Test sub-prefix fan-out returns every key, sorted, prefix stripped."""
+        keys = [
+            "base/top.json",
+            "base/b/2.json",
+            "base/a/1.json",
+            "base/a/deep/3.json",
+            "other/x.json",
+        ]
+        storage = _s3_storage(keys, prefix="base")
+
+        assert storage.list_keys() == [
+            "a/1.json",
+            "a/deep/3.json",
+            "b/2.json",
+            "top.json",
+        ]
+        assert storage.list_keys("a/") == ["a/1.json", "a/deep/3.json"]
+
+
+@pytest.mark.unit
+class TestGCSListKeys:
+    """Tests for GCS blob listing."""
+
+    def test_lists_nested_keys_in_order(self):
+        """Test sub-prefix fan-out returns every blob, sorted, prefix stripped."""
+        names = [
+            "base/top.json",
+            "base/b/2.json",
+            "base/a/1.json",
+            "base/a/deep/3.json",
+            "other/x.json",
+        ]
+        storage = _gcs_storage(names, prefix="base")
+
+        assert storage.list_keys() == [
+            "a/1.json",
+            "a/deep/3.json",
+            "b/2.json",
+            "top.json",
+        ]
+
+    def test_requests_names_only(self):
+        """Test listings ask GCS for blob names rather than full resources."""
+        storage = _gcs_storage(["a/1.json", "b/2.json"])
+        storage.list_keys()
+
+        assert {fields for _, fields, _ in storage._client.calls} == {
+            "items/name,prefixes,nextPageToken"
+        }
+
+
+@pytest.mark.unit
+class TestGCSBlobs:
+    """Tests for GCS blob operations."""
+
+    def test_metadata_sent_with_upload(self):
+        """Test metadata is uploaded with the content and not carried over."""
+        storage = _gcs_storage(prefix="base")
+
+        assert storage.save("a.txt", "one", metadata={"task": "ocr"}) == "gs://bucket/base/a.txt"
+        assert storage._bucket.objects["base/a.txt"][2] == {"task": "ocr"}
+
+        storage.save("a.txt", "two")
+        assert storage._bucket.objects["base/a.txt"][2] is None
+
+    def test_overwrite_from_another_instance(self):
+        """Test a key overwritten elsewhere is seen after a local save."""
+        bucket = _FakeBucket()
+        first = _gcs_storage(bucket=bucket)
+        second = _gcs_storage(bucket=bucket)
+
+        first.save("a.txt", "one")
+        second.save("a.txt", "two")
+
+        assert first.exists("a.txt")
+        assert first.load("a.txt") == b"two"
+        assert first.delete("a.txt")
+        assert first.load("a.txt") is None
+
+
+@pytest.mark.unit
+class TestS3Client:
+    """Tests for the shared S3 client."""
+
+    def test_client_shared_per_credentials(self, monkeypatch):
+        """Test backends with the same credentials share one client."""
+        boto3 = pytest.importorskip("boto3")
+        import qwen_vl.api.storage as storage_module
+
+        monkeypatch.setattr(storage_module, "_s3_clients", {})
+
+        first = S3Storage("bucket-a", region="us-east-1", access_key="a", secret_key="s")
+        second = S3Storage("bucket-b", region="us-east-1", access_key="a", secret_key="s")
+        other = S3Storage("bucket-a", region="eu-west-1", access_key="a", secret_key="s")
+
+        assert first._client is second._client
+        assert other._client is not first._client
+        assert first._client.meta.config.max_pool_connections == 64
+
+
+@pytest.mark.unit
+class TestS3Save:
+    """Tests for S3 uploads."""
+
+    def test_small_payload_uses_single_put(self):
+        """Test small payloads are sent with put_object."""
+        storage = _s3_storage([])
+
+        uri = storage.save("a.json", {"k": "v"}, metadata={"task": "ocr"})
+
+        name, kwargs = storage._client.calls[0]
+        assert uri == "s3://bucket/a.json"
+        assert name == "put_object"
+        assert kwargs["Metadata"] == {"task": "ocr"}
+
+    def test_large_payload_uses_multipart(self):
+        """Test payloads over the threshold use the managed transfer."""
+        pytest.importorskip("boto3")
+        from qwen_vl.api.storage import _MULTIPART_THRESHOLD
+
+        storage = _s3_storage([])
+
+        storage.save("big.bin", b"x" * _MULTIPART_THRESHOLD, metadata={"task": "ocr"})
+
+        name, kwargs = storage._client.calls[0]
+        assert name == "upload_fileobj"
+        assert kwargs["size"] == _MULTIPART_THRESHOLD
+        assert kwargs["ExtraArgs"] == {"Metadata": {"task": "ocr"}}
+
+
+@pytest.mark.unit
+class TestS3Load:
+    """Tests for S3 downloads."""
+
+    def test_small_object_single_request(self):
+        """Test objects within the first range take one request."""
+        storage = _s3_storage([], objects={"a": b"hello"})
+
+        assert storage.load("a") == b"hello"
+        assert len(storage._client.calls) == 1
+
+    def test_large_object_fetched_in_ranges(self, monkeypatch):
+        """Test large objects are reassembled from parallel ranges."""
+        import qwen_vl.api.storage as storage_module
+
+        monkeypatch.setattr(storage_module, "_RANGE_THRESHOLD", 8)
+        monkeypatch.setattr(storage_module, "_RANGE_CHUNK", 4)
+        body = bytes(range(23))
+        storage = _s3_storage([], objects={"big": body})
+
+        assert storage.load("big") == body
+        ranges = sorted(r for _, r in storage._client.calls)
+        assert ranges == [
+            "bytes=0-7", "bytes=12-15", "bytes=16-19", "bytes=20-22", "bytes=8-11",
+        ]
+
+    def test_overwrite_during_ranged_download(self, monkeypatch):
+        """Test an overwrite between ranges restarts on the new version."""
+        import qwen_vl.api.storage as storage_module
+
+        monkeypatch.setattr(storage_module, "_RANGE_THRESHOLD", 8)
+        monkeypatch.setattr(storage_module, "_RANGE_CHUNK", 4)
+        old, new = bytes(23), bytes(range(1, 24))
+        storage = _s3_storage([], objects={"big": old})
+
+        def overwrite(client, byte_range):
+            if byte_range == "bytes=8-11" and client.objects["big"] is old:
+                client.objects["big"] = new
+
+        storage._client.before_get = overwrite
+
+        assert storage.load("big") == new
+
+    def test_overwrite_on_every_attempt_raises(self, monkeypatch):
+        """Test a download that never sees a stable version gives up."""
+        import qwen_vl.api.storage as storage_module
+
+        monkeypatch.setattr(storage_module, "_RANGE_THRESHOLD", 8)
+        monkeypatch.setattr(storage_module, "_RANGE_CHUNK", 4)
+        storage = _s3_storage([], objects={"big": bytes(23)})
+
+        def overwrite(client, byte_range):
+            if byte_range != "bytes=0-7":
+                client.objects["big"] = os.urandom(23)
+
+        storage._client.before_get = overwrite
+
+        with pytest.raises(_PreconditionFailed):
+            storage.load("big")
+
+    def test_empty_and_missing_objects(self):
+        """Test empty objects load and missing keys return None."""
+        storage = _s3_storage([], objects={"empty": b""})
+
+        assert storage.load("empty") == b""
+        assert storage.load("missing") is None
@@ -176,3 +176,59 @@ class TestBaseTaskHandler:
         assert messages[0]["content"] == "System prompt"
         assert messages[1]["role"] == "user"
         assert messages[1]["content"][1]["text"] == "User prompt"
+
+    def test_vision_inputs_cached_by_digest(self, monkeypatch):
+        """Test vision preprocessing is reused for images with the same digest."""
+        from collections import OrderedDict
+        from PIL import Image
+        import qwen_vl.tasks.base as base
+
+        monkeypatch.setattr(base, "_vision_cache", OrderedDict())
+
+        class MockHandler(BaseTaskHandler):
+            @property
+            def task_type(self):
+                return TaskType.OCR
+
+            @property
+            def system_prompt(self):
+                return "System prompt"
+
+            def process(self, image, prompt=None, **kwargs):
+                return TaskResult(text="test")
+
+        calls = []
+
+        def fake_process_vision_info(messages):
+            calls.append(1)
+            return (["image"], None)
+
+        handler = MockHandler(model=None, processor=None)
+        tagged = Image.new("RGB", (10, 10))
+        tagged.info["digest"] = "abc"
+        untagged = Image.new("RGB", (10, 10))
+
+        for _ in range(2):
+            handler._vision_inputs(
+                handler._build_messages(tagged, "a"), fake_process_vision_info
+            )
+        handler._vision_inputs(
+            handler._build_messages(untagged, "a"), fake_process_vision_info
+        )
+
+        assert len(calls) == 2
+
+
+@pytest.mark.unit
+class TestCountWords:
+    """Tests for OCR word counting."""
+
+    def test_count_words(self):
+        """Test counting matches str.split on mixed whitespace."""
+        from qwen_vl.tasks.ocr import count_words
+
+        text = "  Invoice  #123\n\tTotal: $45 \n"
+
+        assert count_words(text) == len(text.split())
+        assert count_words("") == 0
+        assert count_words(None) == 0
@@ -103,6 +103,25 @@ class TestWebhookManager:
         assert len(signature) == 64  # SHA256 hex
         assert signature.isalnum()
 
+    def test_get_deliveries_filters_newest(self):
+        """Test filtered history returns the newest matches in order."""
+        from qwen_vl.api.webhooks import WebhookDelivery
+
+        manager = WebhookManager()
+        for i in range(6):
+            manager._deliveries.append(WebhookDelivery(
+                delivery_id=str(i),
+                webhook_id="a" if i % 2 else "b",
+                event_type=EventType.BATCH_COMPLETED,
+                payload={},
+                status="success",
+            ))
+
+        deliveries = manager.get_deliveries(webhook_id="a", limit=2)
+
+        assert [d.delivery_id for d in deliveries] == ["3", "5"]
+        assert manager.get_deliveries(limit=0) == []
+
     def test_get_deliveries_empty(self):
         """Test getting deliveries when empty."""
         manager = WebhookManager()
@@ -110,6 +129,142 @@ class TestWebhookManager:
         assert deliveries == []
 
 
+def _mock_manager(responder):
+    """WebhookManager whose HTTP client calls responder(request) instead of the network."""
+    import httpx
+
+    manager = WebhookManager()
+    manager._client = httpx.AsyncClient(transport=httpx.MockTransport(responder))
+    return manager
+
+
+@pytest.mark.unit
+class TestWebhookDelivery:
+    """Tests for sending webhooks."""
+
+    def test_signed_delivery(self):
+        """Test the sent body is signed with the configured secret."""
+        import asyncio
+        import httpx
+
+        requests = []
+
+        def responder(request):
+            requests.append(request)
+            return httpx.Response(200, text="ok")
+
+        manager = _mock_manager(responder)
+        manager.register_webhook(
+            "hook", "https://example.com/hook", [EventType.EXTRACTION_COMPLETED],
+            secret="secret-key",
+        )
+
+        deliveries = asyncio.run(
+            manager.trigger_event(EventType.EXTRACTION_COMPLETED, {"pages": 2})
+        )
+
+        assert deliveries[0].status == "success"
+        request = requests[0]
+        expected = manager._generate_signature(request.content, "secret-key")
+        assert request.headers["X-Webhook-Signature"] == expected
+
+    def test_rotated_secret_used(self):
+        """Test a secret set after registration signs later deliveries."""
+        import asyncio
+        import httpx
+
+        requests = []
+
+        def responder(request):
+            requests.append(request)
+            return httpx.Response(200, text="ok")
+
+        manager = _mock_manager(responder)
+        webhook = manager.register_webhook(
+            "hook", "https://example.com/hook", [EventType.EXTRACTION_COMPLETED],
+        )
+        webhook.secret = "rotated-key"
+
+        asyncio.run(manager.trigger_event(EventType.EXTRACTION_COMPLETED, {"pages": 2}))
+
+        request = requests[0]
+        expected = manager._generate_signature(request.content, "rotated-key")
+        assert request.headers["X-Webhook-Signature"] == expected
+
+    def test_subscribers_notified_concurrently(self):
+        """Test a slow subscriber does not delay the others."""
+        import asyncio
+        import httpx
+
+        in_flight = []
+        peak = []
+
+        async def responder(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.05)
+            in_flight.remove(request)
+            return httpx.Response(200)
+
+        manager = _mock_manager(responder)
+        for i in range(3):
+            manager.register_webhook(
+                f"hook-{i}", f"https://example.com/{i}", [EventType.BATCH_COMPLETED]
+            )
+
+        deliveries = asyncio.run(manager.trigger_event(EventType.BATCH_COMPLETED, {}))
+
+        assert [d.status for d in deliveries] == ["success"] * 3
+        assert max(peak) == 3
+        assert len(manager.get_deliveries()) == 3
+
+    def test_only_current_subscribers_notified(self):
+        """Test unregistered, re-registered and inactive webhooks are skipped."""
+        import asyncio
+        import httpx
+
+        urls = []
+
+        def responder(request):
+            urls.append(str(request.url))
+            return httpx.Response(200)
+
+        manager = _mock_manager(responder)
+        manager.register_webhook("a", "https://example.com/a", [EventType.BATCH_FAILED])
+        manager.register_webhook("b", "https://example.com/b", [EventType.BATCH_FAILED])
+        manager.register_webhook("c", "https://example.com/c", [EventType.BATCH_FAILED])
+        manager.register_webhook("d", "https://example.com/d", [EventType.BATCH_FAILED])
+        manager.unregister_webhook("a")
+        manager.register_webhook("b", "https://example.com/b", [EventType.BATCH_STARTED])
+        manager.get_webhook("c").active = False
+
+        asyncio.run(manager.trigger_event(EventType.BATCH_FAILED, {}))
+
+        assert urls == ["https://example.com/d"]
+
+    def test_client_error_not_retried(self):
+        """Test a 4xx rejection ends the delivery while 429 and 5xx are retried."""
+        import asyncio
+        import httpx
+
+        statuses = {"/gone": [404, 200], "/busy": [429, 503, 200]}
+
+        def responder(request):
+            return httpx.Response(statuses[request.url.path].pop(0))
+
+        manager = _mock_manager(responder)
+        for path in statuses:
+            manager.register_webhook(
+                path, f"https://example.com{path}", [EventType.BATCH_COMPLETED],
+                retry_delay_seconds=0,
+            )
+
+        gone, busy = asyncio.run(manager.trigger_event(EventType.BATCH_COMPLETED, {}))
+
+        assert (gone.status, gone.attempts, gone.response_code) == ("failed", 1, 404)
+        assert (busy.status, busy.attempts) == ("success", 3)
+
+
 @pytest.mark.unit
 class TestEventTypes:
     """Tests for EventType enum."""